@@ -1,8 +1,34 @@
-'''
-A Python module for random function I have created for myself
-Tyler Acorn
-Started October 2016
-'''
-from .latex import latex_table
-from .scriptnotifier import ScriptNotifier
-from .statistics import postsim
+'''
+A Python module for random function I have created for myself
+Tyler Acorn
+Started October 2016
+
+The submodules are only imported the first time something from them is used, so scripts that
+only need e.g. the ScriptNotifier do not pay for importing numpy, pandas or matplotlib.
+'''
+from importlib import import_module as _import_module
+
+_SUBMODULES = ('latex', 'plotting', 'scriptnotifier', 'statistics')
+# public names and the submodule they are loaded from
+_ATTRIBUTES = {'latex_table': ('.latex', 'latex_table'),
+               'render_latex_table': ('.latex', 'render_latex_table'),
+               'export_latex_tables': ('.latex', 'export_latex_tables'),
+               'ScriptNotifier': ('.scriptnotifier', 'ScriptNotifier'),
+               'postsim': ('.statistics', 'postsim')}
+
+
+def __getattr__(name):
+    if name in _ATTRIBUTES:
+        module, attribute = _ATTRIBUTES[name]
+        value = getattr(_import_module(module, __name__), attribute)
+    elif name in _SUBMODULES:
+        value = _import_module('.' + name, __name__)
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    # cache it so __getattr__ is only called once for each name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ATTRIBUTES) | set(_SUBMODULES))
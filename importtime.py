@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Import time regression check. Runs a few import statements in fresh interpreters with
+``python -X importtime`` and fails if one pulls in a heavy dependency or goes over its time
+budget. Run with ``python -m pyacorn.importtime``, use ``--help`` for the options.
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import os
+import subprocess
+import sys
+
+_PACKAGE = (__package__ or __name__).split('.')[0]
+# import statements that should stay light, and the milliseconds each may add to startup
+CASES = (('import {}'.format(_PACKAGE), 50),
+         ('from {} import ScriptNotifier'.format(_PACKAGE), 50),
+         ('from {}.scriptnotifier.utils import printerr'.format(_PACKAGE), 50))
+HEAVY_MODULES = ('numpy', 'pandas', 'matplotlib', 'pygeostat', 'scipy', 'twilio')
+
+
+def import_times(statement, python=None):
+    """
+    Run `statement` in a fresh interpreter with ``-X importtime``
+
+    Parameters:
+        statement (str): python code to run, e.g. ``import pyacorn``
+        python (str): python executable, defaults to the current one
+
+    Returns:
+        times (dict): the self and cumulative import time in microseconds of every module
+        imported, keyed by module name
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    env = dict(os.environ)
+    # make the package importable from the directory it lives in
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+    result = subprocess.run([python or sys.executable, '-X', 'importtime', '-c', statement],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env,
+                            universal_newlines=True)
+    if result.returncode != 0:
+        raise RuntimeError('{!r} failed:\n{}'.format(statement, result.stderr))
+    times = dict()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+        except (ValueError, IndexError):
+            # the header line
+            continue
+    return times
+
+
+def check_import_time(cases=CASES, heavy_modules=HEAVY_MODULES, python=None, verbose=True):
+    """
+    Check that each import statement stays within its time budget and imports none of the
+    `heavy_modules`. The time of each statement is the import time it adds on top of starting
+    the interpreter.
+
+    Parameters:
+        cases (list): ``(statement, budget in milliseconds)`` pairs
+        heavy_modules (list): top level modules that the statements must not import
+        python (str): python executable, defaults to the current one
+        verbose (bool): print a line for each statement
+
+    Returns:
+        failures (list): a message for each statement that failed the check
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    baseline = import_times('pass', python)
+    failures = list()
+    for statement, budget in cases:
+        times = import_times(statement, python)
+        added = [name for name in times if name not in baseline]
+        milliseconds = sum(times[name][0] for name in added) / 1000
+        heavy = sorted(set(name.split('.')[0] for name in added) & set(heavy_modules))
+        if verbose:
+            print('{:<55} {:8.1f} ms {:4} modules{}'.format(
+                statement, milliseconds, len(added),
+                ' imports ' + ', '.join(heavy) if heavy else ''))
+        if heavy:
+            failures.append('{!r} imports {}'.format(statement, ', '.join(heavy)))
+        if milliseconds > budget:
+            failures.append('{!r} took {:.1f} ms, more than the {} ms budget'.format(
+                statement, milliseconds, budget))
+    return failures
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Check the import time of {}'.format(_PACKAGE))
+    parser.add_argument('--budget', type=float, default=None,
+                        help='milliseconds each statement may take, overriding the defaults')
+    parser.add_argument('--python', default=None, help='python executable to check')
+    args = parser.parse_args(argv)
+    cases = CASES
+    if args.budget is not None:
+        cases = [(statement, args.budget) for statement, _ in CASES]
+    failures = check_import_time(cases, python=args.python)
+    for failure in failures:
+        print('FAILED: ' + failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,3 +2,4 @@
 Function for converting data into LaTeX format
 '''
 from .latex import *
+from .export import *
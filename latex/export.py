@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Batch export of LaTeX tables that only re-renders the tables whose data or options changed.
+"""
+import hashlib
+import json
+import os
+
+from .latex import render_latex_table
+
+__all__ = ['export_latex_tables', 'table_hash']
+# bump when render_latex_table changes its output so cached tables are rendered again
+_RENDER_VERSION = 1
+
+
+def table_hash(df, options):
+    '''Hash of the contents of a dataframe and the options it is rendered with
+
+    Parameters:
+    df (pandas.DataFrame): the table
+    options (dict): keyword arguments for render_latex_table
+
+    Returns:
+    hash (str): hex digest that changes when the rendered table would
+
+    '''
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([_RENDER_VERSION, options], sort_keys=True, default=repr).encode())
+    # the column names and dtypes, which the row hashes below leave out
+    digest.update(repr([('{}'.format(col), str(dtype))
+                        for col, dtype in df.dtypes.items()]).encode())
+    try:
+        rows = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # unhashable cells such as lists, hash their text instead
+        rows = pd.util.hash_pandas_object(df.astype(str), index=False)
+    digest.update(rows.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _render_table(df, flname, options):
+    render_latex_table(df, flname, **options)
+
+
+def _write_if_changed(flname, text):
+    if os.path.isfile(flname):
+        with open(flname, 'r') as fh:
+            if fh.read() == text:
+                return
+    with open(flname, 'w') as fh:
+        fh.write(text)
+
+
+def export_latex_tables(tables, outdir, include_file='tables.tex', manifest='.latex_tables.json',
+                        n_workers=None, force=False, **options):
+    '''Write a batch of dataframes to one `.tex` file per table plus an include file that
+    `\\input`s them all. A manifest in `outdir` keeps a hash of each table's contents and render
+    options, and tables whose hash has not changed since the last export are not rendered or
+    written again, so a report build only pays for the tables that changed.
+
+    Parameters:
+    tables (dict): table name to dataframe, or to a `(dataframe, options)` tuple where options
+        is a dict of render_latex_table keyword arguments for that table. Each table is written
+        to `outdir`/name.tex
+    outdir (str): directory to write the tables to, created if it does not exist
+    include_file (str): name of the file in `outdir` that inputs every table in order, by its
+        path joined to `outdir`. `None` to not write one
+    manifest (str): name of the manifest file in `outdir`
+    n_workers (int): Number of processes to render the changed tables on. The default of
+        `None` (or 1) renders them one after another.
+    force (bool): render every table even if it has not changed
+    **options: render_latex_table keyword arguments used for every table, e.g. float_prec
+
+    Returns:
+    rendered (list): names of the tables that were rendered
+
+    Examples:
+    >>> export_latex_tables({'summary': summary_df,
+    ...                      'appendix': (appendix_df, {'longtable': True})},
+    ...                     'report/tables', float_prec=2, n_workers=4)
+
+    '''
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    manifest_path = os.path.join(outdir, manifest)
+    cached = dict()
+    if os.path.isfile(manifest_path) and not force:
+        with open(manifest_path, 'r') as fh:
+            cached = json.load(fh)
+
+    hashes = dict()
+    jobs = list()
+    for name, table in tables.items():
+        table_options = dict(options)
+        if isinstance(table, tuple):
+            table, extra = table
+            table_options.update(extra)
+        flname = os.path.join(outdir, name + '.tex')
+        hashes[name] = table_hash(table, table_options)
+        if cached.get(name) != hashes[name] or not os.path.isfile(flname):
+            jobs.append((name, table, flname, table_options))
+
+    # only the tables that were written keep their new hash if a render fails
+    written = {name: value for name, value in cached.items() if name in hashes}
+    for name, _, _, _ in jobs:
+        written.pop(name, None)
+    try:
+        if n_workers is None or n_workers <= 1 or len(jobs) <= 1:
+            for name, table, flname, table_options in jobs:
+                _render_table(table, flname, table_options)
+                written[name] = hashes[name]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(jobs))) as executor:
+                futures = [(name, executor.submit(_render_table, table, flname, table_options))
+                           for name, table, flname, table_options in jobs]
+                for name, future in futures:
+                    future.result()
+                    written[name] = hashes[name]
+    finally:
+        _write_if_changed(manifest_path, json.dumps(written, indent=1, sort_keys=True) + '\n')
+
+    if include_file is not None:
+        _write_if_changed(os.path.join(outdir, include_file),
+                          ''.join('\\input{{{}}}\n'.format(
+                              os.path.join(outdir, name).replace(os.sep, '/'))
+                              for name in tables))
+    return [name for name, _, _, _ in jobs]
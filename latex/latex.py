@@ -3,6 +3,7 @@
 """
 LaTeX functions for converting data to LaTeX formats.
 """
+__all__ = ['latex_table', 'render_latex_table']
 
 
 def latex_table(df, table_package='tabu', table_width=1, cell_align='c', float_prec=False,
@@ -23,108 +24,154 @@ def latex_table(df, table_package='tabu', table_width=1, cell_align='c', float_p
         output more.
 
     '''
-    # SETUP TABLE
-    print('%' * 17)
-    print('\\begin{table}[htb] % Table')
-    print('\\centering')
-    # SETUP TABULAR
-    ncol = len(df.columns)
-
-    # SETUP the begin tabu or begin tabular line
+    import sys
+
+    render_latex_table(df, sys.stdout, table_package=table_package, table_width=table_width,
+                       cell_align=cell_align, float_prec=float_prec, replace_dict=replace_dict)
+
+
+def _escape(text, replace_items):
+    for key, value in replace_items:
+        text = text.replace(key, value)
+    return text
+
+
+def _format_column(series, float_prec, replace_items):
+    '''Format every cell of a column the same way latex_table does, in one pass over the column'''
+    import numpy as np
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind not in 'mM':
+        values = series.to_numpy()
+        if dtype == np.float64 and float_prec:
+            fmt = ' {{:0.{}f}}'.format(float_prec).format
+            return [fmt(value) for value in values.tolist()]
+        if dtype != object:
+            # numpy scalars, which are never str and only float for float64
+            return [' {0}'.format(value) for value in values]
+    else:
+        # extension arrays (dates, categories, strings, ...) give the same scalars as indexing
+        values = series.array
+        values = [values[idx] for idx in range(len(values))]
+    fmt = ' {{:0.{}f}}'.format(float_prec).format if float_prec else None
+    cells = list()
+    for value in values:
+        if fmt is not None and isinstance(value, float):
+            cells.append(fmt(value))
+        elif isinstance(value, str):
+            cells.append(_escape(' {}'.format(value), replace_items))
+        else:
+            cells.append(' {0}'.format(value))
+    return cells
+
+
+def _begin_line(ncol, table_package, table_width, cell_align, longtable):
+    package = table_package.lower()
     line_array = list([' ' * 4])
-    if table_package.lower() == 'tabu':
-        line_array.append('\\begin{tabu}')
+    if package == 'tabu':
+        line_array.append('\\begin{longtabu}' if longtable else '\\begin{tabu}')
         line_array.append(' to {width}\\textwidth'.format(width=table_width))
         line_array.append(' { |[1pt]')
-    elif table_package.lower() == 'tabular':
-        line_array.append('\\begin{tabular}{')
+    elif package == 'tabular':
+        line_array.append('\\begin{longtable}{' if longtable else '\\begin{tabular}{')
         col_width = table_width / ncol
     else:
         raise ValueError('unsupported table package :', table_package)
-    # iterate through the columns
     for x in range(0, ncol):
         if cell_align == 'r':
-            line_array.append(' r |'.format(col_width))
+            line_array.append(' r |')
         elif cell_align == 'l':
-            line_array.append(' l |'.format(col_width))
+            line_array.append(' l |')
         elif cell_align == 'c' or cell_align == 'm':
-            if table_package.lower() == 'tabu':
+            if package == 'tabu':
                 line_array.append(' X[c] |')
+            elif cell_align == 'c':
+                line_array.append(' c |')
             else:
-                if cell_align == 'c':
-                    line_array.append(' c |')
-                else:
-                    line_array.append(' m{{{0:.2f}cm}} |'.format(col_width))
+                line_array.append(' m{{{0:.2f}cm}} |'.format(col_width))
     if table_package == 'tabu':
         line_array.append('[1pt] ')
     line_array.append('}')
-    print(''.join(line_array))
+    return ''.join(line_array)
+
 
-    # PRINT COLUMN HEADERS
-    line_array = list([' ' * 8])
+def render_latex_table(df, stream=None, table_package='tabu', table_width=1, cell_align='c',
+                       float_prec=False, replace_dict={'_': ' ', '-': ' '}, longtable=False,
+                       chunk_size=10000):
+    '''Write a dataframe as a LaTeX table to a stream, with the same output as latex_table. Each
+    column is formatted in one pass instead of cell by cell, and the rows are written
+    `chunk_size` at a time, so tables with tens of thousands of rows take seconds.
+
+    Parameters:
+    df (pandas.DataFrame): Pass it the slice you want.. uses column names for header row
+    stream (file): text stream or path of the file to write to. If `None` the table is returned
+        as a string
+    table_package (str): The table package used. Can be either `tabu' or `tabular'
+    table_width (number): Tabue uses a fraction of textwidth. tabular uses width in cm.
+    cell_align (str): can be either right ('r'), middle ('m'), left ('l') or centered ('c')
+    float_prec(int): If you pass it a int it will evaluate each cell and if it is a float
+        it will set the float precision in print out
+    replace_dict (dict): A dictionary of string characters to replace so that LaTeX likes the
+        output more.
+    longtable (bool): use a `longtabu' or `longtable' environment that can break across pages
+        and repeats the header row on each page, instead of a table float
+    chunk_size (int): number of rows formatted and written at a time
+
+    Returns:
+    table (str): the LaTeX table if `stream` is `None`
+
+    '''
+    import io
+
+    if stream is None:
+        stream = io.StringIO()
+        render_latex_table(df, stream, table_package, table_width, cell_align, float_prec,
+                           replace_dict, longtable, chunk_size)
+        return stream.getvalue()
+    if isinstance(stream, str):
+        with open(stream, 'w') as fh:
+            render_latex_table(df, fh, table_package, table_width, cell_align, float_prec,
+                               replace_dict, longtable, chunk_size)
+        return
+
+    replace_items = list(replace_dict.items())
+    begin = _begin_line(len(df.columns), table_package, table_width, cell_align, longtable)
     if table_package.lower() == 'tabu':
-        line_array.append('\\tabucline[1pt]{-}')
+        rule = ' ' * 8 + '\\tabucline[1pt]{-}'
+        end = '    \\end{longtabu}' if longtable else '    \\end{tabu}'
     else:
-        line_array.append('\\hline')
-    print(''.join(line_array))
-
-    line_array = list([' ' * 8])
-    for col in df.columns:
-        line_array.append('\\textbf{')
-        # Search column string and replace characters to make LaTeX happy
-        column_string = '{}'.format(col)
-        for key in replace_dict:
-            column_string = column_string.replace(key, replace_dict[key])
-        line_array.append(column_string)
-        line_array.append('} ')
-        line_array.append('&')
-    del line_array[-1]
-    line_array.append('\\\\')
-    print(''.join(line_array))
-    # PRINT ROWS
-    for idx in df.iterrows():
-        # PRINT ROWS
-        line_array = list([' ' * 8])
-        line_array.append('\\hline')
-        for col in df.columns:
-            value = df[col][idx[0]]
-            if float_prec:
-                if isinstance(value, (float)):
-                    line_array.append(' {:0.{}f}'.format(value, float_prec))
-                elif isinstance(value, (str)):
-                    # Search string and replace characters
-                    value_string = ' {}'.format(value)
-                    for key in replace_dict:
-                        value_string = value_string.replace(key, replace_dict[key])
-                    line_array.append(value_string)
-                else:
-                    line_array.append(' {0}'.format(value))
-            else:
-                if isinstance(value, (str)):
-                    # Search string and replace characters
-                    value_string = ' {}'.format(value)
-                    for key in replace_dict:
-                        value_string = value_string.replace(key, replace_dict[key])
-                    line_array.append(value_string)
-                else:
-                    line_array.append(' {0}'.format(value))
-            line_array.append(' &')
-        del line_array[-1]
-        line_array.append('\\\\')
-        print(''.join(line_array))
-
-    # PRINT END
-    line_array = list([' ' * 8])
-    if table_package.lower() == 'tabu':
-        line_array.append('\\tabucline[1pt]{-}')
-        print(''.join(line_array))
-        print('    \\end{tabu}')
+        rule = ' ' * 8 + '\\hline'
+        end = '    \\end{longtable}' if longtable else '    \\end{tabular}'
+    if len(df.columns):
+        header = ' ' * 8 + '&'.join('\\textbf{' + _escape('{}'.format(col), replace_items) + '} '
+                                    for col in df.columns) + '\\\\'
+    else:
+        header = '\\\\'
+
+    if longtable:
+        lines = ['%' * 17, begin,
+                 ' ' * 8 + '\\caption[SmallCapt]{LongCaption}',
+                 ' ' * 8 + '\\label{tab:tab_key}\\\\',
+                 rule, header, ' ' * 8 + '\\endfirsthead',
+                 rule, header, ' ' * 8 + '\\endhead',
+                 rule, ' ' * 8 + '\\endfoot']
+    else:
+        lines = ['%' * 17, '\\begin{table}[htb] % Table', '\\centering', begin, rule, header]
+    stream.write('\n'.join(lines) + '\n')
+
+    prefix = ' ' * 8 + '\\hline'
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        columns = [_format_column(chunk.iloc[:, icol], float_prec, replace_items)
+                   for icol in range(len(df.columns))]
+        if columns:
+            stream.write(''.join(prefix + ' &'.join(cells) + '\\\\\n' for cells in zip(*columns)))
+        else:
+            stream.write((' ' * 8 + '\\\\\n') * len(chunk))
+
+    if longtable:
+        lines = [end, '%' * 17]
     else:
-        line_array.append('\\hline')
-        print(''.join(line_array))
-        print('    \\end{tabular}')
-
-    print('\\caption[SmallCapt]{LongCaption}')
-    print('\\label{tab:tab_key}')
-    print('\\end{table}')
-    print('%' * 17)
+        lines = [rule, end, '\\caption[SmallCapt]{LongCaption}', '\\label{tab:tab_key}',
+                 '\\end{table}', '%' * 17]
+    stream.write('\n'.join(lines) + '\n')
@@ -1,6 +1,4 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 
 def arcToPoints(center, radius1, radius2, theta1, theta2, resolution=100):
     '''
@@ -19,6 +17,10 @@ def arcToPoints(center, radius1, radius2, theta1, theta2, resolution=100):
     return closedPolygon
 
 def arc_patch(center, radius1, radius2, theta1, theta2, ax=None, resolution=100, **kwargs):
+    # matplotlib is slow to import so only load it when a patch is drawn
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+
     # make sure ax is not empty
     if ax is None:
         ax = plt.gca()
@@ -1,7 +1,38 @@
 '''
 The :mod:`pyacorn.scriptnotifier` module is for notifying the user of script status
 or crash reports.
+
+Only the ScriptNotifier is imported with the module, the dispatcher, heartbeat, profiler and
+transports are imported the first time they are used.
 '''
 from __future__ import absolute_import, division, print_function
 
+from importlib import import_module as _import_module
+
 from .scriptnotifier import ScriptNotifier
+
+# public names and the submodule they are loaded from
+_ATTRIBUTES = {'AsyncDispatcher': '.dispatcher',
+               'TokenBucket': '.throttle',
+               'DuplicateFilter': '.throttle',
+               'Heartbeat': '.heartbeat',
+               'StackSampler': '.profiler',
+               'Transport': '.transports',
+               'SMTPTransport': '.transports',
+               'TwilioTransport': '.transports',
+               'FileTransport': '.transports',
+               'WebhookTransport': '.transports'}
+__all__ = ['ScriptNotifier'] + list(_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name not in _ATTRIBUTES:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    value = getattr(_import_module(_ATTRIBUTES[name], __name__), name)
+    # cache it so __getattr__ is only called once for each name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ATTRIBUTES))
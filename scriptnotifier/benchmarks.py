@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Benchmark of the ScriptNotifier alert latency against local stand-in servers. Run with
+``python -m pyacorn.scriptnotifier.benchmarks``, use ``--help`` for the options.
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import time
+
+from .scriptnotifier import ScriptNotifier
+from .standins import StubWebhookServer
+from .transports import WebhookTransport
+
+
+def bench_fanout(channels=(1, 2, 4, 8), delay=0.05, nalerts=10, verbose=True):
+    """
+    Measure how long :meth:`ScriptNotifier.status_alert` takes with 1 to N channels, each a
+    webhook on a stand-in server that takes `delay` seconds to answer. The concurrent delivery
+    of the notifier is compared with sending to the channels one after another.
+
+    Parameters:
+        channels (list): numbers of channels to time
+        delay (float): seconds each stand-in server takes to answer
+        nalerts (int): number of alerts to average over
+        verbose (bool): print a line for each number of channels
+
+    Returns:
+        results (list): a dict for each number of channels with the mean ``serial_ms`` and
+        ``concurrent_ms`` latency of an alert
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    results = list()
+    for nchannels in channels:
+        servers = [StubWebhookServer(delay=delay) for _ in range(nchannels)]
+        transports = [WebhookTransport(server.url, name='webhook{}'.format(idx))
+                      for idx, server in enumerate(servers)]
+        notifier = ScriptNotifier(print_error=False, transports=transports)
+        try:
+            # open the worker threads before timing
+            notifier.status_alert('warm up')
+            start = time.perf_counter()
+            for ialert in range(nalerts):
+                for transport in transports:
+                    transport.send('alert {}'.format(ialert), 'Update')
+            serial = (time.perf_counter() - start) / nalerts
+            start = time.perf_counter()
+            for ialert in range(nalerts):
+                notifier.status_alert('alert {}'.format(ialert))
+            concurrent = (time.perf_counter() - start) / nalerts
+        finally:
+            notifier.close()
+            for server in servers:
+                server.close()
+        results.append(dict(channels=nchannels, serial_ms=1000 * serial,
+                            concurrent_ms=1000 * concurrent))
+        if verbose:
+            print('{:3} channels: serial {:8.1f} ms  concurrent {:8.1f} ms  speedup {:5.2f}x'
+                  .format(nchannels, 1000 * serial, 1000 * concurrent, serial / concurrent))
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the ScriptNotifier alert latency')
+    parser.add_argument('--channels', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='numbers of channels to time')
+    parser.add_argument('--delay', type=float, default=0.05,
+                        help='seconds each stand-in server takes to answer')
+    parser.add_argument('--nalerts', type=int, default=10, help='number of alerts to average')
+    args = parser.parse_args(argv)
+    bench_fanout(args.channels, args.delay, args.nalerts)
+
+
+if __name__ == '__main__':
+    main()
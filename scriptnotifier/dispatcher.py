@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+'''dispatcher.py: Background delivery of ScriptNotifier messages'''
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+
+import atexit
+import queue
+import threading
+import time
+
+
+class AsyncDispatcher(object):
+    """
+    Deliver messages on a background thread so the calling script never waits on the network.
+    Sends are queued in a bounded in-memory queue and the worker thread calls them in order,
+    retrying failed sends with exponential backoff. If the queue is full the new message is
+    dropped rather than blocking the caller.
+
+    Queued messages are flushed when the interpreter exits, waiting at most `exit_timeout`
+    seconds.
+
+    Parameters:
+        maxsize (int): number of messages that can be waiting to be sent
+        retries (int): number of times to retry a failed send
+        backoff (float): seconds to wait before the first retry, doubled for every retry after
+        max_backoff (float): longest wait between retries in seconds
+        exit_timeout (float): seconds to wait for queued messages at exit. `None` waits until
+            they are all sent
+        on_error (function): called with the exception when a send fails after all retries
+
+    Attributes:
+        sent (int): number of messages delivered
+        dropped (int): number of messages dropped because the queue was full or closed
+        failed (int): number of messages that could not be sent after all retries
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, maxsize=100, retries=3, backoff=1.0, max_backoff=30.0, exit_timeout=30.0,
+                 on_error=None):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.exit_timeout = exit_timeout
+        self.on_error = on_error
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._pending = 0
+        self._done = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='ScriptNotifierDispatcher')
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self._close_at_exit)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Queue ``func(*args, **kwargs)`` to be called on the worker thread
+
+        Returns:
+            queued (bool): `False` if the message was dropped because the queue is full or closed
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        with self._done:
+            if self._closed:
+                self.dropped += 1
+                return False
+            self._pending += 1
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+        except queue.Full:
+            with self._done:
+                self._pending -= 1
+                self.dropped += 1
+                self._done.notify_all()
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._deliver(*item)
+            finally:
+                with self._done:
+                    self._pending -= 1
+                    self._done.notify_all()
+
+    def _deliver(self, func, args, kwargs):
+        for attempt in range(self.retries + 1):
+            try:
+                func(*args, **kwargs)
+            except Exception as exc:
+                if attempt == self.retries:
+                    self.failed += 1
+                    if self.on_error is not None:
+                        self.on_error(exc)
+                    return
+                time.sleep(min(self.backoff * 2 ** attempt, self.max_backoff))
+            else:
+                self.sent += 1
+                return
+
+    def flush(self, timeout=None):
+        """
+        Wait for the queued messages to be sent
+
+        Parameters:
+            timeout (float): longest time to wait in seconds, `None` waits until they are sent
+
+        Returns:
+            flushed (bool): `False` if messages were still waiting when the timeout ran out
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._done:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._done.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        """
+        Flush the queued messages and stop the worker thread. Messages submitted afterwards are
+        dropped.
+
+        Parameters:
+            timeout (float): longest time to wait in seconds, `None` waits until they are sent
+
+        Returns:
+            flushed (bool): `False` if messages were still waiting when the timeout ran out
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        if self._closed:
+            return True
+        flushed = self.flush(timeout)
+        with self._done:
+            self._closed = True
+        if flushed:
+            self._queue.put(None)
+            self._thread.join()
+        atexit.unregister(self._close_at_exit)
+        return flushed
+
+    def _close_at_exit(self):
+        self.close(self.exit_timeout)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+'''heartbeat.py: Background progress and resource monitor for long running scripts'''
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+
+import datetime
+import sys
+import threading
+import time
+
+
+def peak_rss_mb():
+    '''Peak resident memory of the process in MB, `None` where the resource module is missing'''
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes everywhere else
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def _duration(seconds):
+    return str(datetime.timedelta(seconds=int(seconds)))
+
+
+class Heartbeat(object):
+    """
+    Monitor a long running script from a background thread. Every `interval` seconds the thread
+    samples the elapsed time, the progress reported with :meth:`update`, the throughput and ETA,
+    the peak memory and the CPU usage. A summary is sent through the notifier every
+    `summary_interval` seconds, and a warning when no progress has been reported for
+    `stall_timeout` seconds or the peak memory goes over `memory_limit_mb`.
+
+    Usually started with :meth:`ScriptNotifier.start_heartbeat`.
+
+    Parameters:
+        notifier (ScriptNotifier): sends the summaries and warnings with ``status_alert``
+        total (int): number of items the script will process, used for the ETA
+        interval (float): seconds between samples
+        summary_interval (float): seconds between summaries, `None` to only send warnings
+        stall_timeout (float): warn if no progress is reported for this many seconds
+        memory_limit_mb (float): warn once the peak memory goes over this many MB
+
+    Attributes:
+        done (int): number of items processed
+        overhead (float): fraction of the elapsed time the sampling thread has used the CPU
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, notifier, total=None, interval=10.0, summary_interval=3600.0,
+                 stall_timeout=None, memory_limit_mb=None):
+        self.notifier = notifier
+        self.total = total
+        self.interval = interval
+        self.summary_interval = summary_interval
+        self.stall_timeout = stall_timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.done = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._sampler_cpu = 0.0
+        self._stalled = False
+        self._memory_warned = False
+
+    def start(self):
+        '''Start the sampling thread'''
+        if self._thread is not None:
+            return self
+        self._start = self._last_progress = time.monotonic()
+        self._cpu = (self._start, time.process_time())
+        self._cpu_percent = 0.0
+        self._thread = threading.Thread(target=self._run, name='ScriptNotifierHeartbeat')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def update(self, count=1):
+        '''Report that `count` more items have been processed'''
+        with self._lock:
+            self.done += count
+            self._last_progress = time.monotonic()
+
+    def set(self, done):
+        '''Report the total number of items processed so far'''
+        with self._lock:
+            self.done = done
+            self._last_progress = time.monotonic()
+
+    @property
+    def overhead(self):
+        if self._thread is None:
+            return 0.0
+        return self._sampler_cpu / max(time.monotonic() - self._start, 1e-9)
+
+    def sample(self):
+        """
+        Current state of the script
+
+        Returns:
+            sample (dict): ``elapsed`` seconds, ``done`` and ``total`` items, ``rate`` in items per
+            second, ``eta`` in seconds, ``peak_rss_mb`` and ``cpu_percent`` since the last sample.
+            Values that are not known are `None`
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        now = time.monotonic()
+        cpu = time.process_time()
+        if now - self._cpu[0] > 0:
+            self._cpu_percent = 100 * (cpu - self._cpu[1]) / (now - self._cpu[0])
+        self._cpu = (now, cpu)
+        elapsed = now - self._start
+        done = self.done
+        rate = done / elapsed if elapsed > 0 else None
+        eta = None
+        if self.total is not None and rate:
+            eta = max(self.total - done, 0) / rate
+        return dict(elapsed=elapsed, done=done, total=self.total, rate=rate, eta=eta,
+                    peak_rss_mb=peak_rss_mb(), cpu_percent=self._cpu_percent)
+
+    def summary(self, sample=None):
+        '''One line summary of a :meth:`sample`, taking a new one if none is given'''
+        if sample is None:
+            sample = self.sample()
+        parts = ['elapsed ' + _duration(sample['elapsed'])]
+        if sample['total']:
+            parts.append('{}/{} items ({:.1f}%)'.format(sample['done'], sample['total'],
+                                                        100 * sample['done'] / sample['total']))
+        else:
+            parts.append('{} items'.format(sample['done']))
+        if sample['rate'] is not None:
+            parts.append('{:.3g} items/s'.format(sample['rate']))
+        if sample['eta'] is not None:
+            parts.append('ETA ' + _duration(sample['eta']))
+        if sample['peak_rss_mb'] is not None:
+            parts.append('peak RSS {:.1f} MB'.format(sample['peak_rss_mb']))
+        parts.append('CPU {:.0f}%'.format(sample['cpu_percent']))
+        return ', '.join(parts)
+
+    def _run(self):
+        next_summary = None
+        if self.summary_interval is not None:
+            next_summary = self._start + self.summary_interval
+        while not self._stop.wait(self.interval):
+            cpu = time.thread_time()
+            sample = self.sample()
+            now = time.monotonic()
+            if self.stall_timeout is not None:
+                stalled = now - self._last_progress > self.stall_timeout
+                if stalled and not self._stalled:
+                    self.notifier.status_alert('no progress for {}: {}'.format(
+                        _duration(now - self._last_progress), self.summary(sample)), 'WARNING')
+                elif self._stalled and not stalled:
+                    self.notifier.status_alert('progress resumed: ' + self.summary(sample),
+                                               'HEARTBEAT')
+                self._stalled = stalled
+            if self.memory_limit_mb is not None and not self._memory_warned and \
+                    sample['peak_rss_mb'] is not None and \
+                    sample['peak_rss_mb'] > self.memory_limit_mb:
+                self._memory_warned = True
+                self.notifier.status_alert('memory over {} MB: {}'.format(
+                    self.memory_limit_mb, self.summary(sample)), 'WARNING')
+            if next_summary is not None and now >= next_summary:
+                next_summary += self.summary_interval
+                self.notifier.status_alert(self.summary(sample), 'HEARTBEAT')
+            self._sampler_cpu += time.thread_time() - cpu
+
+    def stop(self):
+        '''Stop the sampling thread'''
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
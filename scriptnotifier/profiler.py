@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+'''profiler.py: Low overhead sampling profiler for ScriptNotifier reports'''
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+
+import collections
+import datetime
+import os
+import sys
+import threading
+import time
+
+
+def _label(code):
+    return '{} ({}:{})'.format(code[2], os.path.basename(code[0]), code[1])
+
+
+class StackSampler(object):
+    """
+    Sampling profiler. A background thread records the call stack of one thread every `interval`
+    seconds, which costs far less than tracing every call the way ``cProfile`` does. Optionally
+    ``tracemalloc`` is started as well to find where memory is allocated.
+
+    Parameters:
+        interval (float): seconds between stack samples
+        thread (int): ident of the thread to sample, defaults to the one that starts the sampler
+        trace_memory (bool): trace memory allocations with ``tracemalloc``. This slows down
+            code that allocates many small objects
+        memory_frames (int): number of frames ``tracemalloc`` keeps for each allocation
+
+    Attributes:
+        samples (int): number of stacks recorded
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, interval=0.01, thread=None, trace_memory=True, memory_frames=1):
+        self.interval = interval
+        self.thread = thread
+        self.trace_memory = trace_memory
+        self.memory_frames = memory_frames
+        self.samples = 0
+        # every distinct stack, outermost function first, and the times it was sampled
+        self._stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_tracemalloc = False
+
+    def start(self):
+        '''Start sampling'''
+        if self._thread is not None:
+            return self
+        if self.thread is None:
+            self.thread = threading.get_ident()
+        if self.trace_memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.memory_frames)
+                self._started_tracemalloc = True
+        self._start = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='ScriptNotifierProfiler')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def _run(self):
+        codes = dict()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread)
+            if frame is None:
+                # the sampled thread has finished
+                return
+            stack = list()
+            while frame is not None:
+                code = frame.f_code
+                key = codes.get(code)
+                if key is None:
+                    key = codes[code] = (code.co_filename, code.co_firstlineno, code.co_name)
+                stack.append(key)
+                frame = frame.f_back
+            del frame
+            stack.reverse()
+            self._stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def stop(self):
+        '''Stop sampling and tracing memory'''
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        if self._started_tracemalloc:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def hot_functions(self, top=10):
+        """
+        The functions that appear in the most samples
+
+        Returns:
+            functions (list): ``(function, self fraction, total fraction)`` of the `top`
+            functions by total time. Self time counts the samples where the function was
+            running, total time also counts those where it was waiting on a function it called
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        own = collections.Counter()
+        total = collections.Counter()
+        for stack, count in list(self._stacks.items()):
+            own[stack[-1]] += count
+            for code in set(stack):
+                total[code] += count
+        nsamples = max(sum(own.values()), 1)
+        return [(_label(code), own[code] / nsamples, count / nsamples)
+                for code, count in total.most_common(top)]
+
+    def memory_sites(self, top=10):
+        """
+        The source lines holding the most memory that is still allocated
+
+        Returns:
+            sites (list): ``(line, MB, blocks)`` for the `top` lines, empty if memory is not
+            traced
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return list()
+        # leave out the profiler's own allocations
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)))
+        return [('{}:{}'.format(stat.traceback[0].filename, stat.traceback[0].lineno),
+                 stat.size / 1024 ** 2, stat.count)
+                for stat in snapshot.statistics('lineno')[:top]]
+
+    def report(self, top=10):
+        '''Text report of the `top` hot functions and memory allocation sites'''
+        lines = ['Profile: {} samples over {}'.format(
+            self.samples, datetime.timedelta(seconds=int(time.monotonic() - self._start)))]
+        lines.append('Hot functions (self% total%):')
+        for label, own, total in self.hot_functions(top):
+            lines.append('  {:6.1%} {:6.1%}  {}'.format(own, total, label))
+        sites = self.memory_sites(top)
+        if sites:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append('Top memory allocation sites ({:.1f} MB allocated, peak {:.1f} MB):'
+                         .format(current / 1024 ** 2, peak / 1024 ** 2))
+            for line, size, count in sites:
+                lines.append('  {:9.2f} MB {:9} blocks  {}'.format(size, count, line))
+        return '\n'.join(lines)
+
+    def dump(self, flname):
+        """
+        Write the full profile to disk. The stacks are written to `flname` in the folded format
+        read by flame graph tools (``flamegraph.pl``, speedscope), one stack per line with the
+        number of samples at the end. If memory is traced, a ``tracemalloc`` snapshot is written
+        to `flname` + ``.tracemalloc``, which can be read with ``tracemalloc.Snapshot.load``.
+
+        Parameters:
+            flname (str): path of the file to write
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        with open(flname, 'w') as fh:
+            for stack, count in sorted(self._stacks.items(), key=lambda item: -item[1]):
+                fh.write('{} {}\n'.format(';'.join(_label(code) for code in stack), count))
+        import tracemalloc
+
+        if tracemalloc.is_tracing():
+            tracemalloc.take_snapshot().dump(flname + '.tracemalloc')
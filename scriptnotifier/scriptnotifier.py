@@ -8,6 +8,11 @@ __author__ = 'Tyler Acorn'
 __date__ = '2017'
 __version__ = '1.000'
 
+import atexit
+import queue
+import threading
+import time
+
 
 class ScriptNotifier:
     """
@@ -23,6 +28,49 @@ class ScriptNotifier:
             from python
         TWILIO_Dict (dict): A dictionary with your TWILIO account information needed to send
             text messages to yourself using TWILIO
+        transports (list): more channels to send the alerts through, e.g. a
+            :class:`FileTransport` or :class:`WebhookTransport`. Each alert is delivered to the
+            email, text and these transports at the same time
+        channel_timeout (float): longest time in seconds to wait for a channel to deliver a
+            message before reporting it as failed, so one slow channel does not hold up the
+            script. A transport's own `timeout` takes precedence. Also used as the socket
+            timeout of the SMTP connection. Messages to a channel that is still busy with one
+            that timed out are skipped rather than waiting behind it
+        background (bool): send alerts from background threads, one per channel, so the script
+            never waits on the network. Messages wait in a queue of `queue_size` and failed sends
+            are retried `retries` times, waiting `retry_backoff` seconds before the first retry
+            and twice as long before each one after. Queued messages are flushed at exit and
+            before :meth:`crash_report` exits, waiting at most `flush_timeout` seconds
+        queue_size (int): number of messages each channel can have waiting in the background
+        retries (int): number of times to retry a failed send in the background
+        retry_backoff (float): seconds to wait before the first retry
+        flush_timeout (float): longest time in seconds to wait for queued messages at exit
+        noop_interval (float): the SMTP session is kept open and reused for every email. If it
+            has been idle for more than `noop_interval` seconds a NOOP is sent to check that the
+            server has not dropped it before it is used, and it is reconnected if it has
+        rate_limit (float): most emails and most texts sent per minute. Each channel has a token
+            bucket holding `burst` messages that refills at `rate_limit` per minute; messages
+            sent when it is empty are dropped. `None` sends everything
+        burst (int): number of messages a channel can send at once before `rate_limit` applies
+        coalesce (float): an email or text that is the same as one sent on that channel less
+            than `coalesce` seconds ago is not sent again
+        digest (float): collect the messages from :meth:`status_alert` and send them together as
+            one email and text every `digest` seconds. Messages with an ``ERROR`` status are
+            still sent right away, digests and errors are never rate limited
+        digest_size (int): send the digest once it holds this many messages. Setting either
+            `digest` or `digest_size` turns on digest mode
+        profile (bool): profile the script for the life of the notifier with a sampling
+            profiler and ``tracemalloc``. The hot functions and memory allocation sites are added
+            to the emails from :meth:`crash_report` and :meth:`finish_report`
+        profile_interval (float): seconds between the profiler's stack samples
+        profile_top (int): number of functions and allocation sites in the reports
+        profile_dump (str): path to write the full profile to when the reports are sent, see
+            :meth:`StackSampler.dump`
+
+    Attributes:
+        dropped (int): number of emails and texts dropped by the rate limit
+        coalesced (int): number of duplicate emails and texts that were not sent
+        profiler (StackSampler): the profiler when `profile` is on
 
     Examples:
         an example of the dictionaries needed and initializing the notifier class
@@ -64,6 +112,43 @@ class ScriptNotifier:
 
         >>> notifier.text_myself('finished 5th model', status='UPDATE')
 
+        send the alerts from a background thread so a slow mail server never stalls the script
+
+        >>> notifier = gs.ScriptNotifier(email=True, SMTP_Dict=smtp_dict, background=True)
+        >>> notifier.status_alert('finished first loop!')  # returns right away
+        >>> notifier.close()  # wait for queued alerts, also done at exit
+
+        alerts sent from a loop can be limited to a few a minute, or gathered into a digest
+        sent every 10 minutes or 100 updates. Crash reports are still sent right away
+
+        >>> notifier = gs.ScriptNotifier(email=True, SMTP_Dict=smtp_dict, rate_limit=2,
+        ...                              coalesce=60)
+        >>> notifier = gs.ScriptNotifier(email=True, SMTP_Dict=smtp_dict, digest=600,
+        ...                              digest_size=100)
+
+        also log every alert to a JSON lines file and post it to a local webhook, all channels
+        are sent to at once
+
+        >>> notifier = gs.ScriptNotifier(email=True, SMTP_Dict=smtp_dict,
+        ...                              transports=[FileTransport('alerts.jsonl'),
+        ...                                          WebhookTransport('http://localhost:8080')])
+
+        monitor a long script, sending a progress summary every hour and a warning if no
+        progress is reported for 30 minutes
+
+        >>> heartbeat = notifier.start_heartbeat(total=nreal, stall_timeout=1800)
+        >>> for ireal in range(nreal):
+        ...     run_realization(ireal)
+        ...     heartbeat.update()
+        >>> notifier.close()
+
+        find out where the time and memory went, the profile is added to the final email
+
+        >>> notifier = gs.ScriptNotifier(email=True, SMTP_Dict=smtp_dict, profile=True,
+        ...                              profile_dump='run.folded')
+        >>> run_simulation()
+        >>> notifier.finish_report('simulation finished')
+
     Note:
         GMAIL: in order to send emails with a gmail account you have to switch the
         security settings to allow access from less secure apps
@@ -79,13 +164,18 @@ class ScriptNotifier:
     """
 
     def __init__(self, print_error=True, email=False, text=False, SMTP_Dict=None,
-                 TWILIO_Dict=None):
+                 TWILIO_Dict=None, background=False, queue_size=100, retries=3,
+                 retry_backoff=1.0, flush_timeout=30.0, noop_interval=30.0,
+                 rate_limit=None, burst=5, coalesce=None, digest=None, digest_size=None,
+                 profile=False, profile_interval=0.01, profile_top=10, profile_dump=None,
+                 transports=None, channel_timeout=30.0):
         # Initialize whether you want to print to console `print_error`, email, or
         # send text messages
 
         self.print_error = print_error
         self.email = email
         self.text = text
+        self.channel_timeout = channel_timeout
 
         if self.email:
             # Check for required keys in the SMTP dictionary if sending an email
@@ -96,9 +186,14 @@ class ScriptNotifier:
             else:
                 raise KeyError('Required email server keys not found in SMTP_Dict\n', SMTP_Dict)
 
-            # test the connection to the email server
+            # connect to the email server to test the settings and keep the session for reuse
+            self.noop_interval = noop_interval
+            self.email_server = None
+            self._email_lock = threading.RLock()
             self.connect_email_server()
-            self.email_server.close()
+            self._email_used = time.monotonic()
+            # close the session at exit, after the background messages are flushed
+            atexit.register(self.close_email_server)
 
         if self.text:
             # Check for required keys in the TWILIO dictionary if sending a text
@@ -111,6 +206,254 @@ class ScriptNotifier:
             # test the connection to the TWILIO Server
             self.connect_twilio()
 
+        self.transports = list()
+        if self.email:
+            from .transports import SMTPTransport
+            self.transports.append(SMTPTransport(self))
+        if self.text:
+            from .transports import TwilioTransport
+            self.transports.append(TwilioTransport(self))
+        self.transports.extend(transports or [])
+        names = [transport.name for transport in self.transports]
+        if len(set(names)) != len(names):
+            raise ValueError('Each transport needs a unique name: {}'.format(names))
+        # a single worker thread for each channel so a slow one cannot hold up the others
+        self._lanes = dict()
+
+        self.dispatchers = None
+        if background:
+            from .dispatcher import AsyncDispatcher
+
+            self.dispatchers = dict()
+            for name in names:
+                self.dispatchers[name] = AsyncDispatcher(
+                    maxsize=queue_size, retries=retries, backoff=retry_backoff,
+                    exit_timeout=flush_timeout,
+                    on_error=lambda error, name=name: self._background_error(name, error))
+
+        self.dropped = 0
+        self.coalesced = 0
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self._buckets = dict()
+        self._duplicates = None
+        if coalesce:
+            from .throttle import DuplicateFilter
+
+            self._duplicates = DuplicateFilter(coalesce)
+        self.heartbeat = None
+        self.profiler = None
+        if profile:
+            from .profiler import StackSampler
+
+            self.profile_top = profile_top
+            self.profile_dump = profile_dump
+            self.profiler = StackSampler(interval=profile_interval).start()
+        self._digest = None
+        if digest is not None or digest_size is not None:
+            self.digest = digest
+            self.digest_size = digest_size
+            self._digest = list()
+            self._digest_lock = threading.Lock()
+            self._digest_timer = None
+            # registered after the dispatchers so the digest is queued before they are flushed
+            atexit.register(self.send_digest)
+
+    def _background_error(self, name, error):
+        from .utils import printerr as printerr
+        printerr('Error sending {} with ScriptNotifier Class: {}'.format(name, error),
+                 errtype='error')
+
+    def _lane(self, transport):
+        lane = self._lanes.get(transport.name)
+        if lane is None:
+            lane = self._lanes.setdefault(transport.name, _Lane(transport.name))
+        return lane
+
+    def _send(self, transports, message, status, details=None):
+        '''Deliver a message through all the `transports` at once'''
+        if self.dispatchers is not None:
+            for transport in transports:
+                self.dispatchers[transport.name].submit(transport.send, message, status, details)
+            return
+        start = time.monotonic()
+        sends = [(transport, self._lane(transport).submit(transport.send, message, status,
+                                                          details))
+                 for transport in transports]
+        for transport, send in sends:
+            if send is None:
+                from .utils import printerr as printerr
+                printerr('Skipped sending {} with ScriptNotifier Class, it is still busy with an '
+                         'earlier message'.format(transport.name), errtype='error')
+                continue
+            timeout = self.channel_timeout if transport.timeout is None else transport.timeout
+            if timeout is not None:
+                timeout = max(start + timeout - time.monotonic(), 0)
+            if not send.done.wait(timeout):
+                from .utils import printerr as printerr
+                printerr('Timed out sending {} with ScriptNotifier Class'.format(transport.name),
+                         errtype='error')
+            elif send.error is not None:
+                from .utils import printerr as printerr
+                printerr('Error sending {} with ScriptNotifier Class'.format(transport.name),
+                         errtype='error')
+
+    def _channel(self, name):
+        return [transport for transport in self.transports if transport.name == name]
+
+    def flush(self, timeout=None):
+        """
+        Wait for the messages queued in the background to be sent. Returns `False` if some were
+        still waiting after `timeout` seconds.
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        self.send_digest()
+        if self.dispatchers is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        flushed = True
+        for dispatcher in self.dispatchers.values():
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            flushed = dispatcher.flush(remaining) and flushed
+        return flushed
+
+    def close(self, timeout=None):
+        """
+        Send the messages queued in the background, stop the background threads and close the
+        transports, e.g. the email session. Returns `False` if some messages were still waiting
+        after `timeout` seconds.
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        self.stop_heartbeat()
+        if self.profiler is not None:
+            self.profiler.stop()
+        self.send_digest()
+        flushed = True
+        if self.dispatchers is not None:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for dispatcher in self.dispatchers.values():
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                flushed = dispatcher.close(remaining) and flushed
+        for lane in self._lanes.values():
+            lane.close()
+        self._lanes = dict()
+        for transport in self.transports:
+            transport.close()
+        return flushed
+
+    def start_heartbeat(self, total=None, interval=10.0, summary_interval=3600.0,
+                        stall_timeout=None, memory_limit_mb=None):
+        """
+        Monitor the script from a background thread. Summaries of the progress, throughput, ETA,
+        peak memory and CPU usage are sent with :meth:`status_alert` every `summary_interval`
+        seconds, along with warnings when progress stalls or memory runs high. Report progress
+        with ``update`` on the returned :class:`Heartbeat`.
+
+        Parameters:
+            total (int): number of items the script will process, used for the ETA
+            interval (float): seconds between samples of the process
+            summary_interval (float): seconds between summaries, `None` to only send warnings
+            stall_timeout (float): warn if no progress is reported for this many seconds
+            memory_limit_mb (float): warn once the peak memory goes over this many MB
+
+        Returns:
+            heartbeat (Heartbeat): the running monitor
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        from .heartbeat import Heartbeat
+
+        self.stop_heartbeat()
+        self.heartbeat = Heartbeat(self, total=total, interval=interval,
+                                   summary_interval=summary_interval, stall_timeout=stall_timeout,
+                                   memory_limit_mb=memory_limit_mb).start()
+        return self.heartbeat
+
+    def stop_heartbeat(self):
+        '''Stop the monitor started by :meth:`start_heartbeat`'''
+        if self.heartbeat is not None:
+            self.heartbeat.stop()
+
+    def _profile_report(self):
+        '''The profile to add to a report, writing the full profile to disk if asked to'''
+        if self.profiler is None:
+            return None
+        if self.profile_dump is not None:
+            try:
+                self.profiler.dump(self.profile_dump)
+            except (IOError, OSError):
+                from .utils import printerr as printerr
+                printerr('Unable to write the profile to ' + self.profile_dump, errtype='error')
+        return self.profiler.report(self.profile_top)
+
+    def _throttled(self, channel, message, status):
+        '''Check the duplicate filter and rate limit of a channel, `True` if the message is held'''
+        if _is_error(status):
+            return False
+        if self._duplicates is not None and \
+                self._duplicates.is_duplicate((channel, status, message)):
+            self.coalesced += 1
+            return True
+        bucket = self._buckets.get(channel)
+        if bucket is None and self.rate_limit is not None:
+            from .throttle import TokenBucket
+
+            bucket = self._buckets.setdefault(channel, TokenBucket(self.rate_limit / 60,
+                                                                   self.burst))
+        if bucket is not None and not bucket.consume():
+            self.dropped += 1
+            return True
+        return False
+
+    def _add_to_digest(self, message, status):
+        with self._digest_lock:
+            self._digest.append((time.strftime('%H:%M:%S'), status, message))
+            full = self.digest_size is not None and len(self._digest) >= self.digest_size
+            if not full and self.digest is not None and self._digest_timer is None:
+                self._digest_timer = threading.Timer(self.digest, self.send_digest)
+                self._digest_timer.daemon = True
+                self._digest_timer.start()
+        if full:
+            self.send_digest()
+
+    def send_digest(self):
+        """
+        Send the status updates collected in digest mode now. Repeats of the same update in a
+        row are sent as one line.
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        if self._digest is None:
+            return
+        with self._digest_lock:
+            if self._digest_timer is not None:
+                self._digest_timer.cancel()
+                self._digest_timer = None
+            entries, self._digest = self._digest, list()
+        if not entries:
+            return
+        lines = list()
+        repeats = 0
+        for idx, (stamp, status, message) in enumerate(entries):
+            if idx + 1 < len(entries) and entries[idx + 1][1:] == (status, message):
+                repeats += 1
+                continue
+            line = '{} {}: {}'.format(stamp, status, message)
+            if repeats:
+                line += ' (x{})'.format(repeats + 1)
+                self.coalesced += repeats
+                repeats = 0
+            lines.append(line)
+        self._send(self.transports, '\n'.join(lines), 'DIGEST of {} updates'.format(len(entries)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
     def connect_email_server(self):
         """
         setup up the email server
@@ -119,16 +462,20 @@ class ScriptNotifier:
         """
         import smtplib
 
+        # a socket timeout so a hung server cannot block a send forever
+        timeout = dict()
+        if self.channel_timeout is not None:
+            timeout['timeout'] = self.channel_timeout
         if self.email_dict['SSL'] is True:
             # Connect to a secure SMTP_SSL Server
             try:
                 if 'port' in self.email_dict:
                     # use supplied port
                     self.email_server = smtplib.SMTP_SSL(self.email_dict['smtpserver'],
-                                                         self.email_dict['port'])
+                                                         self.email_dict['port'], **timeout)
                 else:
                     # use default ports
-                    self.email_server = smtplib.SMTP_SSL(self.email_dict['smtpserver'])
+                    self.email_server = smtplib.SMTP_SSL(self.email_dict['smtpserver'], **timeout)
                 self.email_server.ehlo()
                 self.email_server.login(self.email_dict['login'], self.email_dict['password'])
             except:
@@ -139,14 +486,57 @@ class ScriptNotifier:
                 if 'port' in self.email_dict:
                     # use supplied port
                     self.email_server = smtplib.SMTP(self.email_dict['smtpserver'],
-                                                     self.email_dict['port'])
+                                                     self.email_dict['port'], **timeout)
                 else:
                     # use default ports
-                    self.email_server = smtplib.SMTP(self.email_dict['smtpserver'])
+                    self.email_server = smtplib.SMTP(self.email_dict['smtpserver'], **timeout)
                 self.email_server.ehlo()
             except:
                 raise Exception('Unable to connect to email server. Check SMTP_Dict')
 
+    def close_email_server(self):
+        """
+        Close the SMTP session if one is open. The next email opens a new one. Waits at most
+        `channel_timeout` seconds for an email that is being sent, after that the connection
+        is closed under it.
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        import smtplib
+
+        timeout = -1 if self.channel_timeout is None else self.channel_timeout
+        locked = self._email_lock.acquire(timeout=timeout)
+        try:
+            server, self.email_server = self.email_server, None
+            if server is None:
+                return
+            if not locked:
+                server.close()
+                return
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+        finally:
+            if locked:
+                self._email_lock.release()
+
+    def _email_session(self):
+        '''The open SMTP session, reconnecting if there is none or the server has dropped it'''
+        import smtplib
+
+        if self.email_server is not None and \
+                time.monotonic() - self._email_used > self.noop_interval:
+            try:
+                healthy = self.email_server.noop()[0] == 250
+            except (smtplib.SMTPException, OSError):
+                healthy = False
+            if not healthy:
+                self.close_email_server()
+        if self.email_server is None:
+            self.connect_email_server()
+        return self.email_server
+
     def connect_twilio(self):
         """
         connect to the twilio client with the accountSID and authToken
@@ -173,19 +563,48 @@ class ScriptNotifier:
         """
 
         import sys
+        # send the queued messages, then send the crash report directly as the script is exiting
+        self.stop_heartbeat()
+        self.send_digest()
+        if self.dispatchers is not None:
+            for dispatcher in self.dispatchers.values():
+                dispatcher.close(dispatcher.exit_timeout)
+            self.dispatchers = None
+        profile = self._profile_report()
         # Print Error message
         if self.print_error:
             print('\nERROR: the script has crashed!')
             print('Error Message:', errormsg, '\n')
-        # email Error message
-        if self.email:
-            self.email_myself(errormsg, 'ERROR')
-        # send text message
-        if self.text:
-            self.text_myself(errormsg, status='ERROR: ')
+            if profile:
+                print(profile, '\n')
+        # send the Error message through every channel at once
+        self._send(self.transports, errormsg, 'ERROR', profile)
         # exit process
         sys.exit(1)
 
+    def finish_report(self, message='the script has finished'):
+        """
+        Send a message that the script has finished, then :meth:`close` the notifier. The
+        summary from the heartbeat is added if one is running, and the emailed message also
+        gets the profile if `profile` is on.
+
+        Parameters:
+            message (str): the message you want sent to yourself.
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        if self.heartbeat is not None:
+            self.stop_heartbeat()
+            message = message + '\n' + self.heartbeat.summary()
+        profile = self._profile_report()
+        if self.print_error:
+            print('FINISHED: ' + message)
+            if profile:
+                print(profile)
+        # the final report skips the rate limit and duplicate filter
+        self._send(self.transports, message, 'FINISHED', profile)
+        self.close()
+
     def status_alert(self, message, status='Update'):
         """
         Send yourself an update of your script status. Will use whatever communication
@@ -201,10 +620,12 @@ class ScriptNotifier:
 
         if self.print_error:
             print(status + ': ' + message)
-        if self.email:
-            self.email_myself(message, status)
-        if self.text:
-            self.text_myself(message, status=(status + ':'))
+        if self._digest is not None and not _is_error(status):
+            if self.transports:
+                self._add_to_digest(message, status)
+            return
+        self._send([transport for transport in self.transports
+                    if not self._throttled(transport.name, message, status)], message, status)
 
     def email_myself(self, message, status):
         """
@@ -217,6 +638,14 @@ class ScriptNotifier:
 
         .. codeauthor:: Tyler Acorn - February 20, 2017
         """
+        if not self._throttled('email', message, status):
+            self._email(message, status)
+
+    def _email(self, message, status):
+        self._send(self._channel('email'), message, status)
+
+    def _send_email(self, message, status):
+        '''Send an email, raising an exception if it fails'''
         subject = 'ScriptNotifier: ' + str(status)
 
         email_string = 'From: %s\n'\
@@ -226,16 +655,22 @@ class ScriptNotifier:
                        '%s' % (self.email_dict['from_addr'], self.email_dict['to_addr'],
                                subject, message)
 
-        try:
-            self.connect_email_server()
-            self.email_server.sendmail(self.email_dict['from_addr'], self.email_dict['to_addr'],
-                                       email_string)
-            self.email_server.close()
+        import smtplib
 
-            print('ScriptNotifier email sent')
-        except:
-            from .utils import printerr as printerr
-            printerr('Error sending email with ScriptNotifier Class', errtype='error')
+        with self._email_lock:
+            for attempt in range(2):
+                try:
+                    self._email_session().sendmail(self.email_dict['from_addr'],
+                                                   self.email_dict['to_addr'], email_string)
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    # dropped since the last check, reconnect and try once more
+                    self.close_email_server()
+                    if attempt:
+                        raise
+            self._email_used = time.monotonic()
+
+        print('ScriptNotifier email sent')
 
     def text_myself(self, message, status=None):
         """
@@ -267,9 +702,17 @@ class ScriptNotifier:
         # myNumber = '+17809995555'
         # twilioNumber = '+15873334444'
 
+        if not self._throttled('text', message, status):
+            self._text(message, status)
+
+    def _text(self, message, status):
         # if status is supplied add to start of text message
         if status:
             message = status + message
+        self._send(self._channel('text'), message, None)
+
+    def _send_text(self, message):
+        '''Send a text message, raising an exception if it fails'''
         # check length of text message and trim if needed
         if len(message) > self.text_dict['length_limit']:
             message = message[:-self.text_dict['length_limit']]
@@ -280,3 +723,60 @@ class ScriptNotifier:
         # Send text message
         self.twilio_client.messages.create(body=message, from_=self.text_dict['twilioNumber'],
                                            to=self.text_dict['myNumber'])
+
+
+def _is_error(status):
+    '''Error messages skip the rate limit, duplicate filter and digest'''
+    return status is not None and 'ERROR' in str(status).upper()
+
+
+class _Send(object):
+    '''A send waiting on a _Lane, `done` is set once it has finished or failed with `error`'''
+    __slots__ = ('done', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class _Lane(object):
+    '''
+    A daemon thread that runs the sends of one channel. Unlike a thread pool nothing waits for it
+    at exit, so a hung channel cannot keep the script from finishing. Only one send is taken at
+    a time, a new one is refused while the last one has not finished so a hung channel does not
+    build up a backlog.
+    '''
+
+    def __init__(self, name):
+        # room for the one send and the stop signal
+        self._queue = queue.Queue(maxsize=2)
+        self._lock = threading.Lock()
+        self._last = None
+        thread = threading.Thread(target=self._run, name='ScriptNotifier-' + name)
+        thread.daemon = True
+        thread.start()
+
+    def submit(self, func, *args):
+        '''Queue a send, returns `None` if the last send of the channel has not finished'''
+        with self._lock:
+            if self._last is not None and not self._last.done.is_set():
+                return None
+            send = self._last = _Send()
+            self._queue.put_nowait((func, args, send))
+        return send
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            func, args, send = item
+            try:
+                func(*args)
+            except Exception as exc:
+                send.error = exc
+            send.done.set()
+
+    def close(self):
+        '''Stop the thread once the queued send is done'''
+        self._queue.put_nowait(None)
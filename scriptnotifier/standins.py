@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Local stand-in servers for trying out ScriptNotifier transports without sending real emails or
+calling real webhooks. Both servers run on a background thread on ``127.0.0.1`` and record what
+they receive. A `delay` slows every response down to mimic a distant server.
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+
+import json
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+
+class _Server(object):
+    '''Runs a socketserver on a free local port until closed'''
+
+    def _serve(self, server):
+        self._server = server
+        self.port = server.server_address[1]
+        thread = threading.Thread(target=server.serve_forever, name=type(self).__name__)
+        thread.daemon = True
+        thread.start()
+
+    def close(self):
+        '''Stop the server'''
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class StubSMTPServer(_Server):
+    """
+    Minimal SMTP server that accepts every message without authentication. Use it with
+    ``SMTP_Dict={..., 'smtpserver': '127.0.0.1', 'port': server.port, 'SSL': False}``.
+
+    Parameters:
+        delay (float): seconds to wait before greeting each new connection and answering each
+            message
+        fail_first (int): number of connections to refuse before accepting them
+        drop_after (int): close each connection after this many messages, as a server that
+            drops idle or long sessions would. `None` keeps them open
+
+    Attributes:
+        connections (int): number of connections made to the server
+        messages (list): the raw messages received
+        noops (int): number of NOOP commands received
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, delay=0.0, fail_first=0, drop_after=None):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.drop_after = drop_after
+        self.connections = 0
+        self.messages = list()
+        self.noops = 0
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                stub.connections += 1
+                if stub.fail_first > 0:
+                    stub.fail_first -= 1
+                    self.wfile.write(b'421 service not available\r\n')
+                    return
+                time.sleep(stub.delay)
+                self.wfile.write(b'220 stand-in SMTP server\r\n')
+                lines = None
+                nmessages = 0
+                for line in self.rfile:
+                    if lines is not None:
+                        if line == b'.\r\n':
+                            time.sleep(stub.delay)
+                            stub.messages.append(b''.join(lines))
+                            lines = None
+                            self.wfile.write(b'250 OK\r\n')
+                            nmessages += 1
+                            if stub.drop_after is not None and nmessages >= stub.drop_after:
+                                return
+                        else:
+                            lines.append(line)
+                        continue
+                    command = line[:4].upper()
+                    if command == b'DATA':
+                        lines = list()
+                        self.wfile.write(b'354 end data with <CR><LF>.<CR><LF>\r\n')
+                    elif command == b'QUIT':
+                        self.wfile.write(b'221 bye\r\n')
+                        return
+                    else:
+                        if command == b'NOOP':
+                            stub.noops += 1
+                        self.wfile.write(b'250 OK\r\n')
+
+        server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        self._serve(server)
+
+
+class StubWebhookServer(_Server):
+    """
+    HTTP server that records the JSON body of every POST. Use it with
+    ``WebhookTransport(server.url)``.
+
+    Parameters:
+        delay (float): seconds to wait before answering each request
+        status (int): HTTP status code to answer with
+
+    Attributes:
+        url (str): address of the server
+        messages (list): the decoded JSON bodies received
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, delay=0.0, status=200):
+        self.delay = delay
+        self.status = status
+        self.messages = list()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                time.sleep(stub.delay)
+                stub.messages.append(json.loads(body.decode('utf-8')))
+                self.send_response(stub.status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        class Server(socketserver.ThreadingMixIn, HTTPServer):
+            daemon_threads = True
+
+        self._serve(Server(('127.0.0.1', 0), Handler))
+        self.url = 'http://127.0.0.1:{}/'.format(self.port)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+'''throttle.py: Rate limiting and duplicate filtering of ScriptNotifier messages'''
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+
+import threading
+import time
+
+
+class TokenBucket(object):
+    """
+    Token bucket rate limiter. The bucket holds at most `burst` tokens and refills at `rate`
+    tokens per second; every message takes one token and is refused if the bucket is empty.
+
+    Parameters:
+        rate (float): tokens added per second
+        burst (int): size of the bucket, i.e. the number of messages that can be sent at once
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, rate, burst=5):
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate must be positive and burst at least 1')
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self):
+        '''Take a token, returning `False` if there is none left'''
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class DuplicateFilter(object):
+    """
+    Recognise a message that is the same as one seen less than `window` seconds ago
+
+    Parameters:
+        window (float): seconds a message is remembered for
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    # forget expired messages once this many are remembered
+    _PRUNE_SIZE = 256
+
+    def __init__(self, window):
+        self.window = window
+        self._seen = dict()
+        self._lock = threading.Lock()
+
+    def is_duplicate(self, key):
+        '''Check `key` and remember it, returning `True` if it was seen inside the window'''
+        with self._lock:
+            now = time.monotonic()
+            seen = self._seen.get(key)
+            if seen is not None and now - seen < self.window:
+                return True
+            if len(self._seen) >= self._PRUNE_SIZE:
+                self._seen = {k: t for k, t in self._seen.items() if now - t < self.window}
+            self._seen[key] = now
+            return False
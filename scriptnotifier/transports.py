@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+'''transports.py: The channels ScriptNotifier delivers messages through'''
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+
+import datetime
+import json
+import threading
+
+
+class Transport(object):
+    """
+    Base class for a channel that ScriptNotifier delivers messages through. Subclasses implement
+    :meth:`send`, which should raise an exception if the message could not be delivered, and
+    :meth:`close` if they hold a connection. Each transport needs a unique `name`.
+
+    Parameters:
+        name (str): name of the channel, used for its rate limit and in error messages
+        timeout (float): seconds ScriptNotifier waits for a send before giving up on it,
+            `None` uses the notifier's `channel_timeout`
+
+    Examples:
+        a transport that appends messages to a list
+
+        >>> class ListTransport(Transport):
+        ...     def __init__(self):
+        ...         super(ListTransport, self).__init__('list')
+        ...         self.messages = []
+        ...     def send(self, message, status, details=None):
+        ...         self.messages.append((status, message))
+        >>> notifier = ScriptNotifier(transports=[ListTransport()])
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    name = 'transport'
+
+    def __init__(self, name=None, timeout=None):
+        if name is not None:
+            self.name = name
+        self.timeout = timeout
+
+    def send(self, message, status, details=None):
+        """
+        Deliver a message
+
+        Parameters:
+            message (str): the message
+            status (str): status of the message, e.g. ``Update`` or ``ERROR``. May be `None`
+            details (str): longer report that goes with the message, e.g. a profile, that
+                channels with little room can leave out
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        raise NotImplementedError
+
+    def close(self):
+        '''Release any connection held by the transport'''
+        pass
+
+
+class SMTPTransport(Transport):
+    '''Email through the SMTP session of a ScriptNotifier, see ``SMTP_Dict``'''
+    name = 'email'
+
+    def __init__(self, notifier, name=None, timeout=None):
+        super(SMTPTransport, self).__init__(name, timeout)
+        self.notifier = notifier
+
+    def send(self, message, status, details=None):
+        if details:
+            message = message + '\n\n' + details
+        self.notifier._send_email(message, status)
+
+    def close(self):
+        self.notifier.close_email_server()
+
+
+class TwilioTransport(Transport):
+    '''Text messages through the TWILIO account of a ScriptNotifier, see ``TWILIO_Dict``'''
+    name = 'text'
+
+    def __init__(self, notifier, name=None, timeout=None):
+        super(TwilioTransport, self).__init__(name, timeout)
+        self.notifier = notifier
+
+    def send(self, message, status, details=None):
+        # texts are kept short, the details are left out
+        if status:
+            message = '{}: {}'.format(status, message)
+        self.notifier._send_text(message)
+
+
+def _record(message, status, details):
+    record = dict(time=datetime.datetime.now().isoformat(), status=status, message=message)
+    if details:
+        record['details'] = details
+    return record
+
+
+class FileTransport(Transport):
+    """
+    Append each message to a file as a line of JSON with the ``time``, ``status``, ``message``
+    and ``details`` (if any)
+
+    Parameters:
+        flname (str): path of the file
+        name (str): name of the channel
+        timeout (float): seconds to wait for a write
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    name = 'file'
+
+    def __init__(self, flname, name=None, timeout=None):
+        super(FileTransport, self).__init__(name, timeout)
+        self.flname = flname
+        self._lock = threading.Lock()
+
+    def send(self, message, status, details=None):
+        line = json.dumps(_record(message, status, details)) + '\n'
+        with self._lock:
+            with open(self.flname, 'a') as fh:
+                fh.write(line)
+
+
+class WebhookTransport(Transport):
+    """
+    POST each message to a URL as a JSON object with the ``time``, ``status``, ``message`` and
+    ``details`` (if any). Any response other than 2xx is an error.
+
+    Parameters:
+        url (str): address of the webhook, e.g. a chat integration or a local collector
+        name (str): name of the channel
+        timeout (float): seconds to wait for the server, also used as the socket timeout
+        headers (dict): extra HTTP headers, e.g. for authentication
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    name = 'webhook'
+
+    def __init__(self, url, name=None, timeout=10.0, headers=None):
+        super(WebhookTransport, self).__init__(name, timeout)
+        self.url = url
+        self.headers = {'Content-Type': 'application/json'}
+        self.headers.update(headers or {})
+
+    def send(self, message, status, details=None):
+        from urllib.request import Request, urlopen
+
+        data = json.dumps(_record(message, status, details)).encode('utf-8')
+        request = Request(self.url, data=data, headers=self.headers, method='POST')
+        with urlopen(request, timeout=self.timeout) as response:
+            if not 200 <= response.status < 300:
+                raise IOError('{} returned HTTP {}'.format(self.url, response.status))
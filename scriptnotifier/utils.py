@@ -23,14 +23,12 @@ def printerr(text, width=80, errtype=None):
 
     .. codeauthor:: Warren E. Black - 2015-11-01
     """
-    import pygeostat as gs
-
     if isinstance(errtype, str):
-        errtype.lower()
-    if errtype is 'error':
+        errtype = errtype.lower()
+    if errtype == 'error':
         text = 'ERROR: ' + text
         subsequent_indent = "       "
-    elif errtype is 'warning':
+    elif errtype == 'warning':
         text = 'WARNING: ' + text
         subsequent_indent = "         "
     else:
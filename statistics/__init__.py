@@ -3,4 +3,11 @@ The :mod:`pyacorn.statistics` module includes statistics functions.
 """
 from __future__ import absolute_import, division, print_function
 
-from .postsim  import postsim_multfiles
+from .postsim import postsim_multfiles, postsim_partial, postsim_merge
+from .accumulators import (MomentAccumulator, P2QuantileAccumulator, ExceedanceAccumulator,
+                           CoMomentAccumulator, PostsimAccumulator, merge_pairwise)
+from .checkpoint import save_checkpoint, load_checkpoint
+from .binary import write_postsim_binary, load_postsim_binary
+from .progress import PostsimObserver, ConsoleProgress, JSONLinesLog
+from .region import resolve_region
+from .compression import open_realization
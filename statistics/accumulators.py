@@ -0,0 +1,600 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Mergeable accumulators for the recursive statistics used by postsim
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import numpy as np
+
+
+PRECISIONS = ('float64', 'float32', 'compensated')
+
+
+class MomentAccumulator(object):
+    """
+    Running mean and sum of squared deviations (M2) for every block and variable. Realizations
+    are folded in one at a time with Welford's algorithm and two accumulators built from
+    different realizations can be combined with :meth:`merge`.
+
+    The statistics are stored as contiguous arrays of shape ``(nblocks, nvar)`` so all variables
+    are updated in one vectorized pass. :meth:`update` works in place on preallocated scratch
+    arrays so no model sized arrays are allocated per realization.
+
+    Nan values (e.g. trimmed with `var_min`) are skipped. `count` holds the number of valid
+    values for each block and variable, so each block's statistics use its own sample count.
+
+    The `precision` sets how the statistics are stored:
+
+    * ``float64``: float64 mean, M2 and scratch arrays and an int64 count, 41 bytes per value
+    * ``float32``: float32 mean, M2 and scratch arrays and an int32 count, 21 bytes per value.
+      Each update rounds the mean and M2 to float32, so the error grows with the number of
+      realizations and with the size of the mean relative to the spread (a relative error of
+      about 1e-4 in the variance at Nr = 1000 for values of 1000 +/- 1)
+    * ``compensated``: float32 storage plus a float32 Kahan carry for the mean and M2 that holds
+      the bits lost to rounding, 29 bytes per value. The relative error stays at the level of
+      rounding a single value to float32 (below about 2e-7) no matter how many realizations are
+      folded in
+
+    :func:`pyacorn.statistics.benchmarks.validate_precision` checks each precision against the
+    exact two-pass statistics.
+
+    Parameters:
+        nblocks (int): Number of blocks in each realization
+        nvar (int): Number of variables being processed
+        precision (str): one of ``float64``, ``float32`` or ``compensated``
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    __slots__ = ('count', 'mean', 'm2', 'carry', '_delta', '_scratch', '_invalid')
+
+    def __init__(self, nblocks, nvar, precision='float64'):
+        if precision not in PRECISIONS:
+            raise ValueError('precision must be one of {}'.format(', '.join(PRECISIONS)))
+        dtype = np.float64 if precision == 'float64' else np.float32
+        self.count = np.zeros((nblocks, nvar), dtype=np.int64 if dtype == np.float64 else
+                              np.int32)
+        self.mean = np.zeros((nblocks, nvar), dtype=dtype)
+        self.m2 = np.zeros((nblocks, nvar), dtype=dtype)
+        # the carries of the mean and M2 for the compensated precision
+        self.carry = np.zeros((2, nblocks, nvar), dtype=dtype) if precision == 'compensated' \
+            else None
+        self._init_scratch()
+
+    def _init_scratch(self):
+        self._delta = np.empty_like(self.mean)
+        self._scratch = np.empty_like(self.mean)
+        self._invalid = np.empty(self.mean.shape, dtype=bool)
+
+    @property
+    def precision(self):
+        if self.carry is not None:
+            return 'compensated'
+        return 'float64' if self.mean.dtype == np.float64 else 'float32'
+
+    def __getstate__(self):
+        # the scratch arrays are not sent to worker processes or saved in checkpoints
+        state = dict(count=self.count, mean=self.mean, m2=self.m2)
+        if self.carry is not None:
+            state['carry'] = self.carry
+        return state
+
+    def __setstate__(self, state):
+        self.count = np.ascontiguousarray(state['count'])
+        self.mean = np.ascontiguousarray(state['mean'])
+        self.m2 = np.ascontiguousarray(state['m2'])
+        self.carry = np.ascontiguousarray(state['carry']) if 'carry' in state else None
+        self._init_scratch()
+
+    def update(self, values):
+        """
+        Fold one realization into the running statistics
+
+        Parameters:
+            values (np.ndarray): Array of shape ``(nblocks, nvar)`` with the realization values
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        invalid = np.isnan(values, out=self._invalid)
+        self.count += 1
+        self.count -= invalid
+        # nan values get a zero delta so they leave the mean and M2 untouched
+        delta = np.subtract(values, self.mean, out=self._delta)
+        if self.carry is not None:
+            delta -= self.carry[0]
+        np.copyto(delta, 0.0, where=invalid)
+        scratch = np.maximum(self.count, 1, out=self._scratch)
+        np.divide(delta, scratch, out=scratch)
+        if self.mean.dtype != np.float64:
+            self._update_reduced(values, delta, scratch, invalid)
+            return
+        self.mean += scratch
+        np.subtract(values, self.mean, out=scratch)
+        np.copyto(scratch, 0.0, where=invalid)
+        scratch *= delta
+        self.m2 += scratch
+
+    def _update_reduced(self, values, delta, scratch, invalid):
+        '''
+        Update the float32 statistics given the delta and the mean increment ``delta / n``. M2 is
+        incremented by ``delta * (delta - delta / n)``, equal to the usual ``delta * (x - mean)``
+        but made from the rounded delta alone, so its rounding error does not leak into M2.
+        '''
+        np.subtract(delta, scratch, out=scratch)
+        scratch *= delta
+        self._add(self.m2, scratch, 1)
+        np.maximum(self.count, 1, out=scratch)
+        np.divide(delta, scratch, out=scratch)
+        self._add(self.mean, scratch, 0)
+        if self.carry is not None:
+            # the first value of a block is the whole mean, so keep the bits it lost to rounding
+            first = np.logical_not(invalid, out=invalid)
+            np.logical_and(first, np.equal(self.count, 1, out=scratch), out=first)
+            np.copyto(self.mean, values, where=first, casting='same_kind')
+            np.subtract(values, self.mean, out=self.carry[0], where=first, casting='same_kind')
+
+    def _add(self, total, increment, icarry):
+        '''Add `increment` to `total` in place, with Kahan summation when compensated'''
+        if self.carry is None:
+            total += increment
+            return
+        carry = self.carry[icarry]
+        increment += carry
+        np.copyto(carry, total)
+        total += increment
+        # the part of the increment that was rounded away, added back on the next update
+        carry -= total
+        carry += increment
+
+    def _totals(self):
+        '''The mean and M2 as float64 arrays, including the carries'''
+        mean = self.mean.astype(np.float64)
+        m2 = self.m2.astype(np.float64)
+        if self.carry is not None:
+            mean += self.carry[0]
+            m2 += self.carry[1]
+        return mean, m2
+
+    def merge(self, other):
+        """
+        Combine the statistics of another accumulator into this one using the pairwise update of
+        Chan et al. (1979). Returns ``self`` so merges can be chained.
+
+        Parameters:
+            other (MomentAccumulator): accumulator built from a different set of realizations
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        if other.mean.shape != self.mean.shape:
+            raise ValueError('Cannot merge accumulators with different shapes')
+        if other.precision != self.precision:
+            raise ValueError('Cannot merge accumulators with different precisions')
+        if self.precision != 'float64':
+            return self._merge_float64(other)
+        count = self.count + other.count
+        # weights of the other accumulator, zero where neither has a valid value
+        weight = np.divide(other.count, np.maximum(count, 1), out=self._scratch)
+        delta = np.subtract(other.mean, self.mean, out=self._delta)
+        self.mean += delta * weight
+        weight *= self.count
+        weight *= delta
+        weight *= delta
+        self.m2 += other.m2
+        self.m2 += weight
+        self.count = count
+        return self
+
+    def _merge_float64(self, other):
+        '''Merge reduced precision accumulators in float64 and round the result once'''
+        mean, m2 = self._totals()
+        other_mean, other_m2 = other._totals()
+        count = self.count + other.count
+        weight = other.count / np.maximum(count, 1)
+        delta = other_mean - mean
+        mean += delta * weight
+        m2 += other_m2 + delta * delta * weight * self.count
+        for istat, (stored, total) in enumerate([(self.mean, mean), (self.m2, m2)]):
+            np.copyto(stored, total, casting='same_kind')
+            if self.carry is not None:
+                np.subtract(total, stored, out=self.carry[istat], casting='same_kind')
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        """Population variance of each block and variable, nan where there are no values"""
+        _, m2 = self._totals()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > 0, m2 / self.count, np.nan)
+
+    @property
+    def means(self):
+        """Mean of each block and variable, nan where there are no values"""
+        mean, _ = self._totals()
+        return np.where(self.count > 0, mean, np.nan)
+
+
+def merge_pairwise(accumulators):
+    """
+    Merge a list of accumulators as a balanced binary tree so that the accumulated rounding error
+    grows with log2 of the number of accumulators rather than linearly.
+
+    Parameters:
+        accumulators (list): accumulators to combine
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    accumulators = list(accumulators)
+    if not accumulators:
+        raise ValueError('No accumulators to merge')
+    while len(accumulators) > 1:
+        merged = [accumulators[idx].merge(accumulators[idx + 1])
+                  for idx in range(0, len(accumulators) - 1, 2)]
+        if len(accumulators) % 2:
+            merged.append(accumulators[-1])
+        accumulators = merged
+    return accumulators[0]
+
+
+class P2QuantileAccumulator(object):
+    """
+    Streaming estimate of quantiles for every block and variable using the P-square algorithm of
+    Jain and Chlamtac (1985). Each quantile keeps five markers per block and variable, so memory
+    does not grow with the number of realizations. Nan values are skipped.
+
+    Parameters:
+        nblocks (int): Number of blocks in each realization
+        nvar (int): Number of variables being processed
+        quantiles (list): Quantiles to estimate as fractions, e.g. ``[0.1, 0.5, 0.9]``
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    __slots__ = ('quantiles', 'count', 'markers', 'positions', '_desired', '_increments')
+
+    def __init__(self, nblocks, nvar, quantiles):
+        self.quantiles = np.array(quantiles, dtype=np.float64)
+        if np.any((self.quantiles <= 0) | (self.quantiles >= 1)):
+            raise ValueError('quantiles must be between 0 and 1')
+        nq = len(self.quantiles)
+        self.count = np.zeros((nblocks, nvar), dtype=np.int64)
+        self.markers = np.full((nq, 5, nblocks, nvar), np.nan, dtype=np.float64)
+        self.positions = np.empty((nq, 5, nblocks, nvar), dtype=np.float64)
+        self.positions[:] = np.arange(1, 6, dtype=np.float64)[None, :, None, None]
+        self._set_increments()
+
+    def __getstate__(self):
+        return dict(quantiles=self.quantiles, count=self.count, markers=self.markers,
+                    positions=self.positions)
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, np.asarray(value))
+        self._set_increments()
+
+    def _set_increments(self):
+        '''Initial desired marker positions and their increments for each quantile'''
+        p = self.quantiles[:, None]
+        self._desired = np.hstack([np.ones_like(p), 1 + 2 * p, 1 + 4 * p, 3 + 2 * p,
+                                   np.full_like(p, 5)])
+        self._increments = np.hstack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)])
+
+    def update(self, values):
+        """
+        Fold one realization into the quantile estimates
+
+        Parameters:
+            values (np.ndarray): Array of shape ``(nblocks, nvar)`` with the realization values
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        valid = ~np.isnan(values)
+        # the first five values of each block are stored and sorted to become the markers
+        filling = valid & (self.count < 5)
+        if filling.any():
+            rows, cols = np.nonzero(filling)
+            self.markers[:, self.count[rows, cols], rows, cols] = values[rows, cols]
+            self.count[filling] += 1
+            full = filling & (self.count == 5)
+            if full.any():
+                self.markers[:, :, full] = np.sort(self.markers[:, :, full], axis=1)
+        active = valid & ~filling & (self.count >= 5)
+        if not active.any():
+            return
+        self.count[active] += 1
+        # desired marker positions only depend on the number of values seen by the block
+        extra = (self.count - 5).astype(np.float64)
+        for iq in range(len(self.quantiles)):
+            self._update_markers(iq, values, active, extra)
+
+    def _update_markers(self, iq, values, active, extra):
+        q = self.markers[iq]
+        n = self.positions[iq]
+        x = np.where(active, values, 0.0)
+        # find the cell the value falls in and adjust the extreme markers
+        np.copyto(q[0], x, where=active & (x < q[0]))
+        np.copyto(q[4], x, where=active & (x > q[4]))
+        cell = (x[None] >= q[1:4]).sum(axis=0)
+        for i in range(1, 5):
+            n[i] += active & (cell < i)
+        # adjust the heights of the three middle markers if they are off their desired position
+        for i in range(1, 4):
+            desired = self._desired[iq, i] + extra * self._increments[iq, i]
+            d = desired - n[i]
+            move = active & (((d >= 1) & (n[i + 1] - n[i] > 1)) |
+                             ((d <= -1) & (n[i - 1] - n[i] < -1)))
+            if not move.any():
+                continue
+            d = np.sign(d)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                parabolic = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                q_next = np.where(d > 0, q[i + 1], q[i - 1])
+                n_next = np.where(d > 0, n[i + 1], n[i - 1])
+                linear = q[i] + d * (q_next - q[i]) / (n_next - n[i])
+            use_parabolic = (q[i - 1] < parabolic) & (parabolic < q[i + 1])
+            np.copyto(q[i], np.where(use_parabolic, parabolic, linear), where=move)
+            n[i] += np.where(move, d, 0.0)
+
+    def merge(self, other):
+        raise NotImplementedError('P-square quantile estimates cannot be merged')
+
+    @property
+    def estimates(self):
+        """Quantile estimates of shape ``(nquantiles, nblocks, nvar)``"""
+        estimates = self.markers[:, 2].copy()
+        partial = (self.count > 0) & (self.count < 5)
+        if partial.any():
+            # fewer than five values, interpolate the stored values directly
+            for iq, p in enumerate(self.quantiles):
+                estimates[iq, partial] = np.nanquantile(self.markers[iq][:, partial], p, axis=0)
+        return estimates
+
+
+class ExceedanceAccumulator(object):
+    """
+    Count of realizations exceeding a list of cutoffs for every block and variable. Nan values are
+    skipped and do not count towards the number of realizations.
+
+    Parameters:
+        nblocks (int): Number of blocks in each realization
+        nvar (int): Number of variables being processed
+        cutoffs (list): cutoffs applied to every variable
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    __slots__ = ('cutoffs', 'count', 'exceed')
+
+    def __init__(self, nblocks, nvar, cutoffs):
+        self.cutoffs = np.array(cutoffs, dtype=np.float64)
+        self.count = np.zeros((nblocks, nvar), dtype=np.int64)
+        self.exceed = np.zeros((len(self.cutoffs), nblocks, nvar), dtype=np.int64)
+
+    def __getstate__(self):
+        return dict(cutoffs=self.cutoffs, count=self.count, exceed=self.exceed)
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, np.asarray(value))
+
+    def update(self, values):
+        """
+        Fold one realization into the exceedance counts
+
+        Parameters:
+            values (np.ndarray): Array of shape ``(nblocks, nvar)`` with the realization values
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        self.count += ~np.isnan(values)
+        for icut, cutoff in enumerate(self.cutoffs):
+            self.exceed[icut] += values > cutoff
+
+    def merge(self, other):
+        self.count += other.count
+        self.exceed += other.exceed
+        return self
+
+    @property
+    def probability(self):
+        """Probability of exceeding each cutoff, shape ``(ncutoffs, nblocks, nvar)``"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.exceed / self.count
+
+
+class CoMomentAccumulator(object):
+    """
+    Streaming covariance and correlation between every pair of variables for every block. Only
+    the upper triangle of the covariance matrix is stored, as arrays of shape ``(nblocks, npair)``
+    with the pairs in the order of ``np.triu_indices(nvar, 1)``. Each pair keeps its own count,
+    means and M2 so realizations where either variable is nan are skipped for that pair only.
+
+    Parameters:
+        nblocks (int): Number of blocks in each realization
+        nvar (int): Number of variables being processed, at least 2
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    __slots__ = ('first', 'second', 'count', 'mean_first', 'mean_second', 'm2_first',
+                 'm2_second', 'comoment')
+
+    def __init__(self, nblocks, nvar):
+        if nvar < 2:
+            raise ValueError('At least two variables are needed to calculate covariances')
+        self.first, self.second = np.triu_indices(nvar, 1)
+        shape = (nblocks, len(self.first))
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.mean_first = np.zeros(shape, dtype=np.float64)
+        self.mean_second = np.zeros(shape, dtype=np.float64)
+        self.m2_first = np.zeros(shape, dtype=np.float64)
+        self.m2_second = np.zeros(shape, dtype=np.float64)
+        self.comoment = np.zeros(shape, dtype=np.float64)
+
+    def __getstate__(self):
+        return dict((key, getattr(self, key)) for key in self.__slots__)
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, np.asarray(value))
+
+    def update(self, values):
+        """
+        Fold one realization into the co-moments of every pair of variables in one vectorized
+        pass
+
+        Parameters:
+            values (np.ndarray): Array of shape ``(nblocks, nvar)`` with the realization values
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        x = values[:, self.first]
+        y = values[:, self.second]
+        invalid = np.isnan(x) | np.isnan(y)
+        self.count += 1
+        self.count -= invalid
+        count = np.maximum(self.count, 1)
+        dx = x - self.mean_first
+        dx[invalid] = 0.0
+        dy = y - self.mean_second
+        dy[invalid] = 0.0
+        self.mean_first += dx / count
+        self.mean_second += dy / count
+        # the deviations from the updated means, zero for the skipped values
+        x -= self.mean_first
+        x[invalid] = 0.0
+        y -= self.mean_second
+        y[invalid] = 0.0
+        self.m2_first += dx * x
+        self.m2_second += dy * y
+        self.comoment += dx * y
+
+    def merge(self, other):
+        """
+        Combine the co-moments of another accumulator into this one. Returns ``self``.
+
+        Parameters:
+            other (CoMomentAccumulator): accumulator built from a different set of realizations
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        count = self.count + other.count
+        weight = other.count / np.maximum(count, 1)
+        dx = other.mean_first - self.mean_first
+        dy = other.mean_second - self.mean_second
+        self.mean_first += dx * weight
+        self.mean_second += dy * weight
+        weight *= self.count
+        self.m2_first += other.m2_first + dx * dx * weight
+        self.m2_second += other.m2_second + dy * dy * weight
+        self.comoment += other.comoment + dx * dy * weight
+        self.count = count
+        return self
+
+    def pairs(self, variables):
+        '''Names of the variable pairs in the order they are stored'''
+        return [(variables[ifirst], variables[isecond])
+                for ifirst, isecond in zip(self.first, self.second)]
+
+    @property
+    def covariance(self):
+        """Population covariance of each block and pair of variables"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > 0, self.comoment / self.count, np.nan)
+
+    @property
+    def correlation(self):
+        """Pearson correlation of each block and pair of variables"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.comoment / np.sqrt(self.m2_first * self.m2_second)
+
+
+class PostsimAccumulator(object):
+    """
+    All of the statistics postsim collects for a set of blocks: the mean and variance and, if
+    requested, streaming quantiles, probabilities of exceeding cutoffs and the covariance and
+    correlation between the variables.
+
+    Parameters:
+        nblocks (int): Number of blocks in each realization
+        nvar (int): Number of variables being processed
+        quantiles (list): Quantiles to estimate as fractions, e.g. ``[0.1, 0.5, 0.9]``
+        cutoffs (list): cutoffs to calculate the probability of exceedance for
+        covariance (bool): calculate the covariance and correlation between every pair of
+            variables
+        precision (str): precision of the mean and M2, see :class:`MomentAccumulator`
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    __slots__ = ('nreal', 'moments', 'quantiles', 'exceedance', 'comoments')
+
+    def __init__(self, nblocks, nvar, quantiles=None, cutoffs=None, covariance=False,
+                 precision='float64'):
+        self.nreal = 0
+        self.moments = MomentAccumulator(nblocks, nvar, precision)
+        self.quantiles = P2QuantileAccumulator(nblocks, nvar, quantiles) if quantiles else None
+        self.exceedance = ExceedanceAccumulator(nblocks, nvar, cutoffs) if cutoffs else None
+        self.comoments = CoMomentAccumulator(nblocks, nvar) if covariance else None
+
+    @property
+    def nblocks(self):
+        return self.moments.mean.shape[0]
+
+    def update(self, values):
+        '''Fold one realization of shape ``(nblocks, nvar)`` into all of the statistics'''
+        self.nreal += 1
+        self.moments.update(values)
+        if self.quantiles is not None:
+            self.quantiles.update(values)
+        if self.exceedance is not None:
+            self.exceedance.update(values)
+        if self.comoments is not None:
+            self.comoments.update(values)
+
+    def merge(self, other):
+        '''Combine the statistics of another accumulator into this one'''
+        self.nreal += other.nreal
+        self.moments.merge(other.moments)
+        if self.quantiles is not None:
+            self.quantiles.merge(other.quantiles)
+        if self.exceedance is not None:
+            self.exceedance.merge(other.exceedance)
+        if self.comoments is not None:
+            self.comoments.merge(other.comoments)
+        return self
+
+    def columns(self, variables):
+        '''Names of the output columns, grouped by variable and followed by the pairs'''
+        columns = list()
+        for var in variables:
+            columns.append(var + '_mean')
+            columns.append(var + '_variance')
+            columns.append(var + '_count')
+            if self.quantiles is not None:
+                columns.extend('{}_p{:g}'.format(var, 100 * p) for p in self.quantiles.quantiles)
+            if self.exceedance is not None:
+                columns.extend('{}_prob_gt_{:g}'.format(var, cutoff)
+                               for cutoff in self.exceedance.cutoffs)
+        if self.comoments is not None:
+            for first, second in self.comoments.pairs(variables):
+                columns.append('{}_{}_cov'.format(first, second))
+                columns.append('{}_{}_corr'.format(first, second))
+        return columns
+
+    def results(self):
+        '''Array of shape ``(nblocks, ncolumns)`` ordered the same as :meth:`columns`'''
+        stats = [self.moments.means[None], self.moments.variance[None],
+                 self.moments.count[None].astype(np.float64)]
+        if self.quantiles is not None:
+            stats.append(self.quantiles.estimates)
+        if self.exceedance is not None:
+            stats.append(self.exceedance.probability)
+        # (nstat, nblocks, nvar) -> (nblocks, nvar, nstat) so the columns group by variable
+        stats = np.concatenate(stats, axis=0)
+        results = stats.transpose(1, 2, 0).reshape(self.nblocks, -1)
+        if self.comoments is not None:
+            pairs = np.stack([self.comoments.covariance, self.comoments.correlation], axis=2)
+            results = np.hstack([results, pairs.reshape(self.nblocks, -1)])
+        return results
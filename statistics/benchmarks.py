@@ -0,0 +1,310 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Benchmarks for the postsim statistics. Run with ``python -m pyacorn.statistics.benchmarks``, use
+``--help`` for the options.
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import itertools
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .accumulators import MomentAccumulator
+from .progress import PostsimObserver
+
+
+def _legacy_update(postsim, data, variables, N):
+    '''The pandas column arithmetic postsim_multfiles used before the MomentAccumulator'''
+    for var in variables:
+        col_m = var + '_mean'
+        col_v = var + '_variance'
+        if N == 1:
+            postsim[col_m] = data[var]
+            postsim[col_v] = 0.0
+            continue
+        left_arg = ((N - 1) / N) * postsim[col_m]
+        right_arg = (1 / N) * data[var]
+        postsim[col_m] = left_arg + right_arg
+        left_arg = ((N - 1) / N) * postsim[col_v]
+        right_arg = data[var] - postsim[col_m]
+        postsim[col_v] = left_arg + (1 / (N - 1)) * right_arg * right_arg
+
+
+def _measure(func, nreal):
+    '''Call ``func(N)`` for N = 1..nreal and return the wall time and traced allocations'''
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_mem = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for N in range(1, nreal + 1):
+        func(N)
+    wall = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - start_mem
+    tracemalloc.stop()
+    return wall, peak
+
+
+def bench_accumulator(nblocks=1000000, nvar=4, nreal=20, seed=0, verbose=True):
+    """
+    Compare the wall time and peak allocations of folding realizations into the postsim
+    statistics with the legacy pandas column arithmetic and with :class:`MomentAccumulator`.
+
+    Parameters:
+        nblocks (int): number of blocks in each synthetic realization
+        nvar (int): number of variables in each synthetic realization
+        nreal (int): number of realizations to fold in
+        seed (int): seed for the synthetic realizations
+        verbose (bool): print a summary of the results
+
+    Returns:
+        results (dict): wall time (seconds) and peak allocation above the inputs (bytes) for
+        the ``pandas`` and ``accumulator`` engines
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    rng = np.random.RandomState(seed)
+    variables = ['var{}'.format(ivar) for ivar in range(nvar)]
+    values = rng.lognormal(size=(nblocks, nvar))
+    data = pd.DataFrame(values, columns=variables)
+    results = dict()
+
+    postsim = pd.DataFrame(index=np.arange(nblocks))
+    results['pandas'] = _measure(lambda N: _legacy_update(postsim, data, variables, N), nreal)
+
+    acc = MomentAccumulator(nblocks, nvar)
+    results['accumulator'] = _measure(lambda N: acc.update(values), nreal)
+
+    if verbose:
+        print('{} blocks x {} variables x {} realizations'.format(nblocks, nvar, nreal))
+        for engine, (wall, peak) in results.items():
+            print('    {:<12} {:8.3f} s {:10.1f} MB peak allocated'.format(
+                engine, wall, peak / 1024 ** 2))
+    return results
+
+
+def validate_precision(nblocks=2000, nvar=2, nreal=1000, offset=1000.0, seed=0, verbose=True):
+    """
+    Check the accuracy of each :class:`MomentAccumulator` precision against the exact two-pass
+    mean and variance of the same realizations. The values are normal with a standard deviation
+    of 1 around `offset`, so a large offset makes the running updates lose the most precision.
+
+    Parameters:
+        nblocks (int): number of blocks in each synthetic realization
+        nvar (int): number of variables in each synthetic realization
+        nreal (int): number of realizations to fold in
+        offset (float): mean of the synthetic values
+        seed (int): seed for the synthetic realizations
+        verbose (bool): print a summary of the results
+
+    Returns:
+        results (dict): for each precision, the largest relative error of the mean and the
+        variance and the bytes the accumulator uses for each block and variable
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    from .accumulators import PRECISIONS
+
+    rng = np.random.RandomState(seed)
+    values = offset + rng.standard_normal((nreal, nblocks, nvar))
+    mean = values.mean(axis=0)
+    variance = ((values - mean) ** 2).mean(axis=0)
+    results = dict()
+    for precision in PRECISIONS:
+        acc = MomentAccumulator(nblocks, nvar, precision)
+        for ireal in range(nreal):
+            acc.update(values[ireal])
+        nbytes = sum(array.nbytes for array in (acc.count, acc.mean, acc.m2, acc._delta,
+                                                acc._scratch, acc._invalid))
+        if acc.carry is not None:
+            nbytes += acc.carry.nbytes
+        results[precision] = dict(
+            mean_error=float(np.max(np.abs(acc.means - mean) / np.abs(mean))),
+            variance_error=float(np.max(np.abs(acc.variance - variance) / variance)),
+            bytes_per_value=nbytes / (nblocks * nvar))
+    if verbose:
+        print('{} blocks x {} variables x {} realizations around {:g}'.format(nblocks, nvar,
+                                                                          nreal, offset))
+        for precision, result in results.items():
+            print('    {:<12} mean {mean_error:9.2e} variance {variance_error:9.2e} '
+                  '{bytes_per_value:4.0f} bytes per value'.format(precision, **result))
+    return results
+
+
+def write_synthetic_realizations(outdir, nblocks, nvar, nreal, fltype='gslib', seed=0):
+    """
+    Write a set of synthetic lognormal realizations named ``real1.<ending>``, ``real2.<ending>``
+    etc. for benchmarking postsim.
+
+    Parameters:
+        outdir (str): directory to write the realizations to
+        nblocks (int): number of blocks in each realization
+        nvar (int): number of variables in each realization
+        nreal (int): number of realizations
+        fltype (str): either ``gslib``, ``csv``, ``gsb`` or ``hdf5``
+        seed (int): seed for the random values
+
+    Returns:
+        files (list): paths of the realization files
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    endings = dict(gslib='out', csv='csv', gsb='gsb', h5='h5', hdf5='h5')
+    if fltype.lower() not in endings:
+        raise ValueError('unsupported fltype: {}'.format(fltype))
+    fltype = fltype.lower()
+    rng = np.random.RandomState(seed)
+    variables = ['var{}'.format(ivar) for ivar in range(nvar)]
+    files = list()
+    for ireal in range(1, nreal + 1):
+        flname = os.path.join(outdir, 'real{}.{}'.format(ireal, endings[fltype]))
+        values = rng.lognormal(size=(nblocks, nvar))
+        if fltype == 'gslib':
+            with open(flname, 'w') as fh:
+                fh.write('realization {}\n{}\n'.format(ireal, nvar))
+                fh.write(''.join(var + '\n' for var in variables))
+                np.savetxt(fh, values, fmt='%.6f')
+        elif fltype == 'csv':
+            with open(flname, 'w') as fh:
+                fh.write(','.join(variables) + '\n')
+                np.savetxt(fh, values, fmt='%.6f', delimiter=',')
+        else:
+            from ..data import iotools
+
+            data = pd.DataFrame(values, columns=variables)
+            if fltype == 'gsb':
+                iotools.write_gsb(data, flname)
+            else:
+                iotools.write_h5(data, flname)
+        files.append(flname)
+    return files
+
+
+def _peak_rss_mb():
+    '''Peak resident set size of the current process in megabytes, if it can be measured'''
+    try:
+        import resource
+    except ImportError:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes and macOS bytes
+    return maxrss / 1024 ** 2 if platform.system() == 'Darwin' else maxrss / 1024
+
+
+class _WriteTimer(PostsimObserver):
+    '''Time from the last realization being folded in to the end of the run, the write stage'''
+
+    def realization(self, event):
+        self._folded = time.perf_counter()
+
+    def finish(self, summary):
+        self.write = time.perf_counter() - self._folded
+
+
+def _bench_case(nblocks, nvar, nreal, fltype, output_fltype, var_min, seed):
+    '''Time postsim_multfiles and each of its stages for one synthetic realization set'''
+    from .postsim import postsim_multfiles
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = write_synthetic_realizations(tmpdir, nblocks, nvar, nreal, fltype, seed)
+        timer = _WriteTimer()
+        start = time.perf_counter()
+        stages = postsim_multfiles(files, os.path.join(tmpdir, 'postsim'),
+                                   output_fltype=output_fltype, var_min=var_min,
+                                   observers=[timer])
+        total = time.perf_counter() - start
+    timings = dict(parse=stages['parse'], trim=stages['trim'], accumulate=stages['accumulate'],
+                   write=timer.write)
+    return dict(nblocks=nblocks, nvar=nvar, nreal=nreal, fltype=fltype,
+                output_fltype=output_fltype, var_min=var_min, seconds=timings, total=total,
+                blocks_realizations_per_second=nblocks * nreal / total,
+                peak_rss_mb=_peak_rss_mb())
+
+
+def bench_postsim(nblocks=(100000,), nvar=(2,), nreal=(20,), fltypes=('gslib',),
+                  output_fltype='npy', var_min=0.1, outfile=None, seed=0, verbose=True):
+    """
+    Benchmark postsim on synthetic realization sets for every combination of block count,
+    number of variables, number of realizations and file format. :func:`postsim_multfiles` is
+    timed as a whole, along with the parse, trim and accumulate stages it reports and the write
+    stage after the last realization. Each case runs in a fresh process so that the peak RSS is
+    measured for that case only.
+
+    Parameters:
+        nblocks (list): block counts to benchmark
+        nvar (list): numbers of variables to benchmark
+        nreal (list): numbers of realizations to benchmark
+        fltypes (list): realization file types, any of ``gslib``, ``csv``, ``gsb`` or ``hdf5``
+        output_fltype (str): file type the postsim results are written as
+        var_min (float): trimming limit applied to all variables. The default trims about 1%
+            of the lognormal values
+        outfile (str): JSON lines file to append a record for each case to
+        seed (int): seed for the synthetic realizations
+        verbose (bool): print a line for each case
+
+    Returns:
+        results (list): a dictionary of results for each case
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from . import postsim
+
+    environment = dict(postsim_version=postsim.__version__, numpy_version=np.__version__,
+                       python_version=platform.python_version(), machine=platform.machine(),
+                       timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'))
+    results = list()
+    for case in itertools.product(nblocks, nvar, nreal, fltypes):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(_bench_case, *case, output_fltype=output_fltype,
+                                     var_min=var_min, seed=seed).result()
+        result.update(environment)
+        results.append(result)
+        if verbose:
+            print('{nblocks:>10} blocks {nvar:>3} vars {nreal:>5} reals {fltype:>6}: '
+                  '{total:8.3f} s {blocks_realizations_per_second:12.0f} blocks*reals/s'.format(
+                      **result))
+        if outfile is not None:
+            with open(outfile, 'a') as fh:
+                fh.write(json.dumps(result) + '\n')
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark pyacorn postsim')
+    parser.add_argument('--nblocks', type=int, nargs='+', default=[100000])
+    parser.add_argument('--nvar', type=int, nargs='+', default=[2])
+    parser.add_argument('--nreal', type=int, nargs='+', default=[20])
+    parser.add_argument('--fltype', nargs='+', default=['gslib'])
+    parser.add_argument('--output-fltype', default='npy')
+    parser.add_argument('--var-min', type=float, default=0.1)
+    parser.add_argument('--outfile', default=None, help='JSON lines file to append results to')
+    parser.add_argument('--accumulator', action='store_true',
+                        help='run the accumulator microbenchmark instead')
+    parser.add_argument('--precision', action='store_true',
+                        help='check the accuracy of the accumulator precisions instead')
+    args = parser.parse_args(argv)
+    if args.accumulator:
+        bench_accumulator()
+    elif args.precision:
+        validate_precision()
+    else:
+        bench_postsim(args.nblocks, args.nvar, args.nreal, args.fltype, args.output_fltype,
+                      args.var_min, args.outfile)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Raw binary postsim output that can be memory mapped instead of parsed
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import struct
+
+import numpy as np
+
+_MAGIC = b'\x93NUMPY'
+# version 1.0 stores the header length in 2 bytes, 2.0 in 4 for tables with thousands of columns
+_VERSIONS = ((b'\x01\x00', '<H'), (b'\x02\x00', '<I'))
+# widest shape written in a placeholder header, so the final header always fits in its space
+_MAX_ROWS = 10 ** 15
+
+
+def _npy_header(dtype, nrows, length=None):
+    '''``.npy`` header for a 1-D array of `dtype`, padded to `length` bytes. Version 1.0 is used
+    unless the header is too long for it'''
+    header = "{{'descr': {!r}, 'fortran_order': False, 'shape': ({},), }}".format(
+        np.lib.format.dtype_to_descr(dtype), nrows)
+    for version, fmt in _VERSIONS:
+        prefix = len(_MAGIC) + len(version) + struct.calcsize(fmt)
+        size = length
+        if size is None:
+            # pad so the data starts on a 64 byte boundary like numpy does
+            size = -(-(prefix + len(header) + 1) // 64) * 64
+        if size - prefix < 256 ** struct.calcsize(fmt):
+            break
+    header = header.ljust(size - prefix - 1) + '\n'
+    if prefix + len(header) != size:
+        raise ValueError('npy header does not fit in the space reserved for it')
+    return _MAGIC + version + struct.pack(fmt, len(header)) + header.encode('latin1')
+
+
+class BinaryPostsimWriter(object):
+    """
+    Write postsim results as a raw little-endian float64 table with a small ``.npy`` header that
+    holds the column names as a structured dtype. Rows can be appended chunk by chunk without
+    knowing the number of blocks up front; the header is rewritten with the final block count on
+    :meth:`close`. The output can be read back with :func:`load_postsim_binary` or ``np.load``,
+    which needs a larger `max_header_size` for tables with more than a few hundred columns.
+    Tables too wide for a version 1.0 header are written with a version 2.0 header.
+
+    Parameters:
+        flname (str): path of the output file, normally ending in ``.npy``
+        columns (list): column names
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, flname, columns):
+        self.dtype = np.dtype([(str(col), '<f8') for col in columns])
+        self.nrows = 0
+        self.fh = open(flname, 'wb')
+        self._header_length = len(_npy_header(self.dtype, _MAX_ROWS))
+        self.fh.write(_npy_header(self.dtype, 0, self._header_length))
+
+    def write(self, rows):
+        '''Append an array of shape ``(nblocks, ncolumns)`` to the file'''
+        rows = np.ascontiguousarray(rows, dtype='<f8')
+        if rows.ndim != 2 or rows.shape[1] != len(self.dtype.names):
+            raise ValueError('rows must have one value for each column')
+        self.fh.write(rows.tobytes())
+        self.nrows += rows.shape[0]
+
+    def close(self):
+        if self.fh.closed:
+            return
+        self.fh.seek(0)
+        self.fh.write(_npy_header(self.dtype, self.nrows, self._header_length))
+        self.fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def write_postsim_binary(flname, values, columns):
+    """
+    Write a postsim table to a memory mappable binary file
+
+    Parameters:
+        flname (str): path of the output file, normally ending in ``.npy``
+        values (np.ndarray): array of shape ``(nblocks, ncolumns)``
+        columns (list): column names
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    with BinaryPostsimWriter(flname, columns) as writer:
+        writer.write(values)
+
+
+def load_postsim_binary(flname, mode='r'):
+    """
+    Memory map a binary postsim file without reading it. Columns are accessed by name and blocks
+    by slicing, and only the pages that are touched are read from disk.
+
+    Parameters:
+        flname (str): path of the binary postsim file
+        mode (str): ``r`` for read only or ``r+`` to modify the file in place
+
+    Returns:
+        postsim (np.memmap): structured array with one field per column
+
+    Examples:
+        >>> postsim = load_postsim_binary('postsim.npy')
+        >>> postsim['Cu_mean'][1000:2000]
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    # the header of a table with a few hundred columns is over numpy's default limit of 10000
+    # characters, allow a few hundred thousand columns
+    return np.load(flname, mmap_mode=mode, max_header_size=2 ** 24)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+On-disk checkpoints of the postsim accumulators so long runs can be resumed or appended to
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import glob
+import os
+
+import numpy as np
+
+from .accumulators import (MomentAccumulator, P2QuantileAccumulator, ExceedanceAccumulator,
+                           CoMomentAccumulator, PostsimAccumulator)
+
+CHECKPOINT_VERSION = 2
+_COMPONENTS = (('moments', MomentAccumulator), ('quantiles', P2QuantileAccumulator),
+               ('exceedance', ExceedanceAccumulator), ('comoments', CoMomentAccumulator))
+
+
+def save_checkpoint(flname, acc, variables, files, index=None):
+    """
+    Save the state of a postsim accumulator to a binary ``.npz`` checkpoint. The file is written
+    to a temporary file first and then moved into place so a crash while saving never leaves a
+    corrupt checkpoint behind.
+
+    Parameters:
+        flname (str): path of the checkpoint file
+        acc (PostsimAccumulator): accumulator to save
+        variables (list): variables the accumulator was built from
+        files (list): realization files already folded into the accumulator
+        index (np.ndarray): indices of the blocks of the region the accumulator covers, `None`
+            if it covers every block
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    arrays = dict(version=np.array(CHECKPOINT_VERSION),
+                  variables=np.array(variables, dtype=str),
+                  files=np.array(files, dtype=str),
+                  nreal=np.array(acc.nreal))
+    if index is not None:
+        arrays['index'] = np.asarray(index, dtype=np.int64)
+    for component, _ in _COMPONENTS:
+        sub_acc = getattr(acc, component)
+        if sub_acc is None:
+            continue
+        for key, value in sub_acc.__getstate__().items():
+            arrays['{}.{}'.format(component, key)] = np.asarray(value)
+    tmp_flname = flname + '.tmp'
+    with open(tmp_flname, 'wb') as fh:
+        np.savez(fh, **arrays)
+    os.replace(tmp_flname, flname)
+
+
+def load_checkpoint(flname, return_index=False):
+    """
+    Load a postsim checkpoint saved with :func:`save_checkpoint`
+
+    Parameters:
+        flname (str): path of the checkpoint file
+        return_index (bool): also return the block indices of the region
+
+    Returns:
+        acc (PostsimAccumulator): the saved accumulator
+        variables (list): variables the accumulator was built from
+        files (list): realization files already folded into the accumulator
+        index (np.ndarray): only with `return_index`, the indices of the blocks of the region,
+        `None` if the accumulator covers every block
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    with np.load(flname) as npz:
+        if int(npz['version']) != CHECKPOINT_VERSION:
+            raise ValueError('Unsupported checkpoint version {}'.format(int(npz['version'])))
+        variables = npz['variables'].tolist()
+        files = npz['files'].tolist()
+        index = npz['index'] if 'index' in npz.files else None
+        acc = PostsimAccumulator.__new__(PostsimAccumulator)
+        acc.nreal = int(npz['nreal'])
+        for component, cls in _COMPONENTS:
+            prefix = component + '.'
+            state = dict((key[len(prefix):], npz[key]) for key in npz.files
+                         if key.startswith(prefix))
+            if state:
+                sub_acc = cls.__new__(cls)
+                sub_acc.__setstate__(state)
+            else:
+                sub_acc = None
+            setattr(acc, component, sub_acc)
+    if return_index:
+        return acc, variables, files, index
+    return acc, variables, files
+
+
+def worker_checkpoint(flname, iworker):
+    '''Path of the checkpoint a worker of a parallel run saves its own realizations to'''
+    return '{}.worker{}'.format(flname, iworker)
+
+
+def worker_checkpoints(flname):
+    '''Paths of the worker checkpoints of `flname` left behind by a parallel run that died'''
+    return sorted(path for path in glob.glob(glob.escape(flname) + '.worker*')
+                  if not path.endswith('.tmp'))
+
+
+class Checkpointer(object):
+    """
+    Keep track of the realization files folded into an accumulator and save a checkpoint every
+    `every` files.
+
+    Parameters:
+        flname (str): path of the checkpoint file
+        every (int): number of realizations between checkpoints. `None` only saves when
+            :meth:`save` is called
+        files (list): realization files already in the accumulator, e.g. from a loaded
+            checkpoint
+        index (np.ndarray): indices of the blocks of the region, see :func:`save_checkpoint`
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, flname, every=None, files=None, index=None):
+        self.flname = flname
+        self.every = every
+        self.files = list(files) if files else list()
+        self.index = index
+        self._since_save = 0
+
+    def ingested(self, acc, variables, filename):
+        '''Record that `filename` was folded into `acc`, saving a checkpoint if one is due'''
+        self.files.append(os.path.abspath(filename))
+        self._since_save += 1
+        if self.every and self._since_save >= self.every:
+            self.save(acc, variables)
+
+    def save(self, acc, variables):
+        save_checkpoint(self.flname, acc, variables, self.files, self.index)
+        self._since_save = 0
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Command line postsim runner for splitting the realizations across the tasks of a cluster job
+array and merging the results. Run with ``python -m pyacorn.statistics.cli``, use ``--help`` for
+the options.
+
+Examples:
+    Each task of a slurm job array processes its share of 1000 realizations into a partial file
+
+    .. code-block:: bash
+
+        python -m pyacorn.statistics.cli partial real partial$SLURM_ARRAY_TASK_ID.npz \\
+            --nreal 1000 --nshards $SLURM_ARRAY_TASK_COUNT --fltype gslib
+
+    and a job that depends on the array merges them
+
+    .. code-block:: bash
+
+        python -m pyacorn.statistics.cli merge postsim.out partial*.npz --output-fltype gslib
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import os
+
+from .postsim import postsim_partial, postsim_merge
+from .progress import ConsoleProgress
+
+
+def shard_range(nreal, nshards, shard):
+    """
+    Realizations processed by one of `nshards` tasks, spread as evenly as possible
+
+    Parameters:
+        nreal (int): total number of realizations
+        nshards (int): number of tasks the realizations are split across
+        shard (int): index of the task, counting from 0
+
+    Returns:
+        first (int): first realization of the task, counting from 1
+        last (int): last realization of the task
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    if not 0 <= shard < nshards:
+        raise ValueError('shard must be between 0 and nshards - 1')
+    size, extra = divmod(nreal, nshards)
+    first = shard * size + min(shard, extra) + 1
+    last = first + size - 1 + (shard < extra)
+    return first, last
+
+
+def _shard_index(shard):
+    '''The task index passed on the command line or set by the scheduler, `None` if neither'''
+    if shard is not None:
+        return shard
+    # arrays can start at any index, e.g. --array=1-10, so count from the first task
+    for key, first_key in (('SLURM_ARRAY_TASK_ID', 'SLURM_ARRAY_TASK_MIN'),
+                           ('PBS_ARRAYID', None), ('SGE_TASK_ID', 'SGE_TASK_FIRST')):
+        if os.environ.get(key, '').isdigit():
+            return int(os.environ[key]) - int(os.environ.get(first_key, 0) or 0)
+    return None
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Postsim realizations across cluster jobs')
+    subparsers = parser.add_subparsers(dest='mode')
+    subparsers.required = True
+
+    partial = subparsers.add_parser('partial', help='process a range of realizations into a '
+                                    'partial statistics file')
+    partial.add_argument('file_base', help='file base name of the realizations')
+    partial.add_argument('partial_name', help='partial statistics file to write')
+    partial.add_argument('--first', type=int, default=None, help='first realization, from 1')
+    partial.add_argument('--last', type=int, default=None, help='last realization')
+    partial.add_argument('--nreal', type=int, default=None,
+                         help='total number of realizations split with --nshards')
+    partial.add_argument('--nshards', type=int, default=None,
+                         help='number of tasks the realizations are split across')
+    partial.add_argument('--shard', type=int, default=None,
+                         help='index of this task, from 0. Defaults to the job array task id')
+    partial.add_argument('--file-ending', default=None)
+    partial.add_argument('--fltype', default=None)
+    partial.add_argument('--zero-padding', type=int, default=0)
+    partial.add_argument('--variables', nargs='+', default=None)
+    partial.add_argument('--var-min', type=float, nargs='+', default=None)
+    partial.add_argument('--cutoffs', type=float, nargs='+', default=None)
+    partial.add_argument('--covariance', action='store_true')
+    partial.add_argument('--precision', default='float64',
+                         choices=['float64', 'float32', 'compensated'])
+    partial.add_argument('--prefetch', type=int, default=0)
+    partial.add_argument('--progress', type=int, default=None,
+                         help='print the progress every PROGRESS realizations')
+
+    merge = subparsers.add_parser('merge', help='merge partial statistics files into the '
+                                  'postsim output')
+    merge.add_argument('output_name', help='postsim file to write')
+    merge.add_argument('partial_files', nargs='+', help='partial statistics files to merge')
+    merge.add_argument('--output-fltype', default='gslib')
+
+    args = parser.parse_args(argv)
+    if args.mode == 'partial':
+        if args.nshards is not None:
+            if args.nreal is None:
+                parser.error('--nreal is needed with --nshards')
+            if not 1 <= args.nshards <= args.nreal:
+                # a task without realizations would have no partial file to write
+                parser.error('--nshards must be between 1 and --nreal ({}), got {}'.format(
+                    args.nreal, args.nshards))
+            shard = _shard_index(args.shard)
+            if shard is None:
+                parser.error('--shard is needed when not running in a job array')
+            first, last = shard_range(args.nreal, args.nshards, shard)
+        else:
+            first = args.first if args.first is not None else 1
+            last = args.last if args.last is not None else args.nreal
+        var_min = args.var_min
+        if var_min is not None and len(var_min) == 1:
+            var_min = var_min[0]
+        observers = [ConsoleProgress(args.progress)] if args.progress else None
+        postsim_partial(args.file_base, args.partial_name, first=first, last=last,
+                        file_ending=args.file_ending, fltype=args.fltype,
+                        zero_padding=args.zero_padding, variables=args.variables,
+                        var_min=var_min, cutoffs=args.cutoffs, covariance=args.covariance,
+                        prefetch=args.prefetch, observers=observers,
+                        precision=args.precision)
+    else:
+        nreal = postsim_merge(args.partial_files, args.output_name, args.output_fltype)
+        print('postsim: merged {} realizations from {} partial files into {}'.format(
+            nreal, len(args.partial_files), args.output_name))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,14 +8,30 @@ from __future__ import absolute_import, division, print_function
 __author__ = 'Tyler Acorn'
 __date__ = '2016'
 __version__ = '1.000'
+import functools
+import os
+import time
+
 import pandas as pd
 import numpy as np
 
-from ..data import DataFile
-from ..data import iotools as iotools
+from .accumulators import PostsimAccumulator, merge_pairwise
+from .readers import (ChunkedReader, DataFileReader, Prefetcher, RealizationReader,
+                      text_fltype)
+from .checkpoint import (Checkpointer, load_checkpoint, save_checkpoint, worker_checkpoint,
+                         worker_checkpoints)
+from .binary import BinaryPostsimWriter, write_postsim_binary
+from .progress import ProgressTracker, current_rss_mb
+from .region import resolve_region
+from .compression import split_compression
+
 
 def postsim_multfiles(file_base_or_list, output_name, Nr=None, file_ending=None, fltype=None,
-                      output_fltype=None, zero_padding=0, variables=None, var_min=None):
+                      output_fltype=None, zero_padding=0, variables=None, var_min=None,
+                      n_workers=None, max_memory_mb=None, quantiles=None, cutoffs=None,
+                      prefetch=0, checkpoint=None, checkpoint_every=None, resume=False,
+                      fast_reader=True, observers=None, covariance=False, region=None,
+                      griddef=None, precision='float64'):
     '''The multiple file postsim function uses recursive statistics for memory management and
     coolness factor. See http://people.revoledu.com/kardi/tutorial/RecursiveStatistic/
     This function will take multiple realizations and post process the results into mean and
@@ -28,205 +44,664 @@ def postsim_multfiles(file_base_or_list, output_name, Nr=None, file_ending=None,
         output_name (str): ath (or name) of file to write output to.
         Nr (int): Number of realizations. Needed if file base name is passed.
         file_ending (str): file ending (ex. `"out"`). Used if file base name is passed. Period is
-            not included.
+            not included. ``gslib`` and ``csv`` realizations compressed with gzip, bz2 or xz are
+            read without decompressing them to disk, e.g. with a file ending of ``"out.gz"``.
         fltype (str): Type of data file: either ``csv``, ``gslib``, ``hdf5``, or ``gsb``. Used if
             file base name is passed and `file_ending` is not used.
-        output_fltype (str): Type of output data file: either ``csv``, ``gslib``, ``hdf5``, or
-            ``gsb``.
+        output_fltype (str): Type of output data file: either ``csv``, ``gslib``, ``hdf5``,
+            ``gsb`` or ``npy``. ``npy`` writes raw little-endian float64 values with a small
+            header that can be memory mapped with :func:`load_postsim_binary`.
         zero_padding (int): Number of zeros to padd number in sequentially named files with. Default
             is 0.
         variables (str): List of variables to process.
         var_min (list) or (float): Minimum trimming limit to use. If one value is passed it will
             apply the trimming limit to all variables. Or a list of trimming limit for each variable
-            can be passed.
+            can be passed. Trimmed (and nan) values are skipped, so the statistics of each block
+            only use its valid values. The number of valid values is written out as
+            ``<var>_count`` and ``Nr`` is the number of realizations processed.
+        n_workers (int): Number of processes to split the realizations across. Each process
+            builds its own mean/variance accumulator and the results are merged pairwise at the
+            end. The default of `None` (or 1) processes the realizations serially.
+        max_memory_mb (float): Memory budget in megabytes. If passed the realizations are
+            streamed a fixed range of blocks at a time and the output is written chunk by chunk
+            so that peak memory does not grow with the size of the model. Only ``gslib`` and
+            ``csv`` realizations can be streamed and the output must be ``gslib``, ``csv`` or
+            ``npy``. The decompressors of compressed realizations count against the budget.
+            If they use all of it, one block is still processed at a time.
+        quantiles (list): Quantiles to estimate for each block as fractions, e.g.
+            ``[0.1, 0.5, 0.9]``. The quantiles are estimated in a single pass with the P-square
+            algorithm and written out as ``<var>_p10`` etc. Cannot be used with `n_workers`.
+        cutoffs (list): Cutoffs to calculate the probability of exceedance for. The
+            probabilities are written out as ``<var>_prob_gt_<cutoff>``.
+        prefetch (int): Number of realizations (or chunks of blocks with `max_memory_mb`) to
+            read ahead on background threads while the current one is being processed. Default
+            of 0 reads each realization when it is needed.
+        checkpoint (str): Path of a binary checkpoint file to save the accumulated statistics
+            and the list of realization files already processed to. The checkpoint is saved
+            at the end of the run and every `checkpoint_every` realizations. Cannot be used with
+            `max_memory_mb`.
+        checkpoint_every (int): Number of realizations between checkpoints. With `n_workers`
+            each worker saves the realizations it has processed to its own checkpoint next to
+            `checkpoint` every `checkpoint_every` realizations. They are merged into
+            `checkpoint` at the end of the run, or when resuming a run that died.
+        resume (bool): If `checkpoint` (or the checkpoints of its workers) exists, load it and
+            only fold in the realization files that are not already in it. This both resumes a
+            run that died and appends new realizations to a finished one. The `region` must be
+            the same as in the checkpoint.
+        fast_reader (bool): Read ``gslib`` and ``csv`` realizations with the bulk
+            :class:`RealizationReader`, which parses the header once and reads the body straight
+            into a numpy array. Set to `False` to read every file with :class:`DataFile`. Other
+            file types are always read with :class:`DataFile`.
+        observers (list): :class:`PostsimObserver` instances (or a single one) that receive an
+            event with the parse, trim and accumulate times, blocks processed, running ETA and
+            memory use after every realization. :class:`ConsoleProgress` prints the progress
+            and :class:`JSONLinesLog` writes the events to a file.
+        covariance (bool): Also calculate the covariance and correlation between every pair
+            of variables for each block across the realizations. They are written out as
+            ``<var1>_<var2>_cov`` and ``<var1>_<var2>_corr`` columns.
+        region: Only process the blocks in a region of interest, given as a list of block
+            indices, a boolean mask or an x/y/z bounding box, see :func:`resolve_region`. Only
+            the rows of those blocks are parsed and the output has one row per block in the
+            region, with the index of the block (from 0) in a ``block`` column. Cannot be
+            combined with `max_memory_mb`.
+        griddef: Grid definition used to resolve a bounding box `region`
+        precision (str): How the running mean and variance are stored. ``float64`` (default),
+            ``float32`` to halve their memory, or ``compensated`` for float32 storage with a
+            Kahan carry that keeps float64 like accuracy for any number of realizations. See
+            :class:`MomentAccumulator`.
+
+    Returns:
+        timings (dict): seconds spent waiting on realizations to be read (``io_wait``), reading
+        and parsing them (``parse``), trimming them (``trim``) and accumulating them
+        (``accumulate``). ``compute`` is the sum of ``trim`` and ``accumulate``. With
+        `n_workers` the times are summed over all of the workers.
+
+    Examples:
+        Print the progress and keep a log of every realization
+
+        >>> postsim_multfiles('real', 'postsim.out', Nr=500, fltype='gslib',
+        ...                   observers=[ConsoleProgress(every=10), JSONLinesLog('postsim.jsonl')])
 
     .. codeauthor:: Tyler Acorn - 2016-08-03
     '''
+    files, file_ending = _realization_files(file_base_or_list, Nr=Nr, file_ending=file_ending,
+                                            fltype=fltype, zero_padding=zero_padding)
+    output_fltype = _output_fltype(output_fltype, fltype, file_ending)
+    acc_kws = dict(quantiles=quantiles, cutoffs=cutoffs, covariance=covariance,
+                   precision=precision)
+    index = None
+    if region is not None:
+        if max_memory_mb is not None:
+            raise ValueError('region and max_memory_mb cannot be combined')
+        index = resolve_region(region, griddef)
+        if not index.size:
+            raise ValueError('The region does not contain any blocks')
+    acc = None
+    checkpointer = None
+    if checkpoint is not None:
+        if max_memory_mb is not None:
+            raise ValueError('checkpoint and max_memory_mb cannot be combined')
+        done_files = None
+        if resume and (os.path.isfile(checkpoint) or worker_checkpoints(checkpoint)):
+            acc, variables, files, done_files = _resume_checkpoint(checkpoint, files, variables,
+                                                                   acc_kws, index)
+        else:
+            # the worker checkpoints of an earlier run must not be mixed into this one
+            _remove_worker_checkpoints(checkpoint)
+        checkpointer = Checkpointer(checkpoint, every=checkpoint_every, files=done_files,
+                                    index=index)
+    if not files and acc is None:
+        raise ValueError('No realization files to process')
+    if max_memory_mb is not None:
+        if n_workers is not None and n_workers > 1:
+            raise ValueError('n_workers and max_memory_mb cannot be combined')
+        return _postsim_chunked(files, output_name, output_fltype, variables, var_min,
+                                max_memory_mb, acc_kws, prefetch, ProgressTracker(observers, None))
+    tracker = ProgressTracker(observers, len(files))
+    if n_workers is not None and n_workers > 1 and files:
+        if quantiles:
+            raise ValueError('quantiles cannot be estimated with n_workers as the P-square '
+                             'estimates cannot be merged')
+        postsim, columns, timings = _postsim_parallel(files, variables, var_min, n_workers,
+                                                      acc_kws, prefetch, fast_reader, acc,
+                                                      checkpointer, tracker, index)
+    else:
+        postsim, columns, timings = _postsim_serial(files, variables, var_min, acc_kws,
+                                                    prefetch, fast_reader, acc, checkpointer,
+                                                    tracker, index)
+    if index is not None:
+        postsim.insert(0, 'block', index)
+        columns.insert(0, 'block')
+    # Write out the results
+    _write_postsim(postsim, output_name, output_fltype, columns)
+    tracker.finish(timings)
+    return timings
+
+
+def postsim_partial(file_base_or_list, partial_name, first=1, last=None, file_ending=None,
+                    fltype=None, zero_padding=0, variables=None, var_min=None, cutoffs=None,
+                    covariance=False, prefetch=0, fast_reader=True, observers=None,
+                    precision='float64'):
+    """
+    Process realizations `first` to `last` into a partial statistics file holding the count,
+    mean and M2 of every block instead of the final postsim output. Partial files from separate
+    jobs, e.g. the tasks of a cluster job array, are combined with :func:`postsim_merge`. The
+    partial file uses the checkpoint format so it can also be passed to
+    :func:`postsim_multfiles` with ``resume=True``.
+
+    Parameters:
+        file_base_or_list (str or list): file base name of the realizations or a list of files
+        partial_name (str): path of the partial statistics file, normally ending in ``.npz``
+        first (int): first realization to process, counting from 1
+        last (int): last realization to process. Needed if a file base name is passed, for a
+            list of files it defaults to the end of the list
+        file_ending (str): see :func:`postsim_multfiles`
+        fltype (str): see :func:`postsim_multfiles`
+        zero_padding (int): see :func:`postsim_multfiles`
+        variables (list): see :func:`postsim_multfiles`
+        var_min (float or list): see :func:`postsim_multfiles`
+        cutoffs (list): see :func:`postsim_multfiles`
+        covariance (bool): see :func:`postsim_multfiles`
+        prefetch (int): see :func:`postsim_multfiles`
+        fast_reader (bool): see :func:`postsim_multfiles`
+        observers (list): see :func:`postsim_multfiles`
+        precision (str): see :func:`postsim_multfiles`
+
+    Returns:
+        timings (dict): see :func:`postsim_multfiles`
+
+    Examples:
+        Process realizations 101 to 200 in one task and merge the partial files at the end
+
+        >>> postsim_partial('real', 'partial2.npz', first=101, last=200, fltype='gslib')
+        >>> postsim_merge(glob.glob('partial*.npz'), 'postsim.out', output_fltype='gslib')
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    if first < 1:
+        raise ValueError('first must be at least 1')
+    files, _ = _realization_files(file_base_or_list, Nr=last, file_ending=file_ending,
+                                  fltype=fltype, zero_padding=zero_padding)
+    files = files[first - 1:last]
+    if not files:
+        raise ValueError('No realization files to process')
+    acc_kws = dict(quantiles=None, cutoffs=cutoffs, covariance=covariance, precision=precision)
+    tracker = ProgressTracker(observers, len(files))
+    variables, acc, timings = _accumulate_files(files, variables, var_min, acc_kws, prefetch,
+                                                fast_reader, tracker=tracker)
+    save_checkpoint(partial_name, acc, variables, [os.path.abspath(flname) for flname in files])
+    tracker.finish(timings)
+    return timings
+
+
+def postsim_merge(partial_files, output_name, output_fltype='gslib'):
+    """
+    Merge partial statistics files written by :func:`postsim_partial` (or postsim checkpoints)
+    into the final postsim output. The partial files must hold the same variables and
+    statistics and must not share any realizations.
+
+    Parameters:
+        partial_files (list): paths of the partial statistics files
+        output_name (str): name of the output file
+        output_fltype (str): either ``gslib``, ``csv``, ``gsb``, ``hdf5`` or ``npy``
+
+    Returns:
+        nreal (int): number of realizations in the merged output
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    if not partial_files:
+        raise ValueError('No partial files to merge')
+    accs = list()
+    variables = None
+    done = set()
+    for flname in partial_files:
+        acc, partial_variables, files = load_checkpoint(flname)
+        if variables is None:
+            variables = partial_variables
+        elif partial_variables != variables:
+            raise KeyError('{} does not contain the same variables as {}'.format(
+                flname, partial_files[0]))
+        if acc.quantiles is not None:
+            raise ValueError('{} has quantile estimates which cannot be merged'.format(flname))
+        if accs and (acc.columns(variables) != accs[0].columns(variables) or
+                     acc.nblocks != accs[0].nblocks):
+            raise ValueError('{} does not have the same statistics or number of blocks as '
+                             '{}'.format(flname, partial_files[0]))
+        if done.intersection(files):
+            raise ValueError('{} contains realizations that are already in another partial '
+                             'file'.format(flname))
+        done.update(files)
+        accs.append(acc)
+    acc = merge_pairwise(accs)
+    postsim, columns = _postsim_frame(acc, variables)
+    _write_postsim(postsim, output_name, output_fltype, columns)
+    return acc.nreal
+
+
+def _postsim_serial(files, variables, var_min, acc_kws, prefetch, fast_reader, acc,
+                    checkpointer, tracker, index):
+    '''Fold the realizations into a postsim dataframe one file at a time'''
+    variables, acc, timings = _accumulate_files(files, variables, var_min, acc_kws, prefetch,
+                                                fast_reader, acc=acc, checkpointer=checkpointer,
+                                                tracker=tracker, index=index)
+    if checkpointer is not None:
+        checkpointer.save(acc, variables)
+    postsim, columns = _postsim_frame(acc, variables)
+    return postsim, columns, timings
+
+
+def _postsim_parallel(files, variables, var_min, n_workers, acc_kws, prefetch, fast_reader,
+                      acc, checkpointer, tracker, index):
+    '''Split the realizations across a process pool and merge the per-worker accumulators'''
+    from concurrent.futures import ProcessPoolExecutor
+
+    n_workers = min(n_workers, len(files))
+    chunks = [chunk.tolist() for chunk in np.array_split(np.array(files, dtype=object),
+                                                          n_workers)]
+    # each worker checkpoints its own accumulator, they are merged into the main one at the end
+    worker_checkpointers = [None] * n_workers
+    if checkpointer is not None and checkpointer.every:
+        worker_checkpointers = [Checkpointer(worker_checkpoint(checkpointer.flname, iworker),
+                                             every=checkpointer.every, index=index)
+                                for iworker in range(n_workers)]
+    # workers send their events back through a queue that a thread passes to the observers
+    relay = _EventRelay(tracker) if tracker.observers else None
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(executor.map(_accumulate_files, chunks, [variables] * n_workers,
+                                        [var_min] * n_workers, [acc_kws] * n_workers,
+                                        [prefetch] * n_workers, [fast_reader] * n_workers,
+                                        [None] * n_workers, worker_checkpointers,
+                                        [relay.sender if relay else None] * n_workers,
+                                        [index] * n_workers))
+    finally:
+        if relay is not None:
+            relay.close()
+    variables = results[0][0]
+    for worker_variables, _, _ in results[1:]:
+        if worker_variables != variables:
+            raise KeyError('Realization files do not all contain the same variables')
+    worker_accs = [worker_acc for _, worker_acc, _ in results]
+    acc = merge_pairwise(worker_accs if acc is None else [acc] + worker_accs)
+    if checkpointer is not None:
+        checkpointer.files.extend(os.path.abspath(filename) for filename in files)
+        checkpointer.save(acc, variables)
+        _remove_worker_checkpoints(checkpointer.flname)
+    timings = dict.fromkeys(results[0][2], 0.0)
+    for _, _, worker_timings in results:
+        for key in timings:
+            timings[key] += worker_timings[key]
+    postsim, columns = _postsim_frame(acc, variables)
+    return postsim, columns, timings
+
+
+def _accumulate_files(files, variables, var_min, acc_kws, prefetch, fast_reader, acc=None,
+                      checkpointer=None, tracker=None, index=None):
+    '''Build a postsim accumulator from a list of realization files, or add them to `acc`'''
+    timings = dict(io_wait=0.0, parse=0.0, trim=0.0, accumulate=0.0)
+    reader = _realization_reader(files, variables, fast_reader, index)
+    prefetcher = Prefetcher(functools.partial(_timed_call, reader.read), files, depth=prefetch)
+    first = True
+    for filename, (values, parse) in prefetcher:
+        io_wait = prefetcher.io_wait - timings['io_wait']
+        start = time.perf_counter()
+        if first:
+            first = False
+            variables = reader.variables
+            tmins = _trim_limits(var_min, variables)
+            if tracker is not None:
+                tracker.start(variables)
+        if acc is None:
+            acc = PostsimAccumulator(len(values), len(variables), **acc_kws)
+        elif len(values) != acc.nblocks:
+            raise ValueError('{} does not have the same number of blocks as the previous '
+                             'realizations'.format(filename))
+        _trim_values(values, tmins)
+        trimmed = time.perf_counter()
+        acc.update(values)
+        accumulated = time.perf_counter()
+        timings['io_wait'] += io_wait
+        timings['parse'] += parse
+        timings['trim'] += trimmed - start
+        timings['accumulate'] += accumulated - trimmed
+        if tracker is not None:
+            tracker.realization(filename, parse, io_wait, trimmed - start,
+                                accumulated - trimmed, len(values))
+        if checkpointer is not None:
+            checkpointer.ingested(acc, variables, filename)
+    timings['compute'] = timings['trim'] + timings['accumulate']
+    return variables, acc, timings
+
+
+def _timed_call(func, *args):
+    '''Call `func` and return its result with the seconds it took'''
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+class _EventSender(object):
+    '''Stand in for the ProgressTracker in a worker process that forwards events to a queue'''
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    def start(self, variables):
+        self.queue.put(('start', (variables,)))
+
+    def realization(self, *args):
+        self.queue.put(('realization', args + (current_rss_mb(),)))
+
+
+class _EventRelay(object):
+    '''Pass the events that worker processes put on a queue to the ProgressTracker'''
+
+    def __init__(self, tracker):
+        import multiprocessing
+        import threading
+
+        self.tracker = tracker
+        self.manager = multiprocessing.Manager()
+        self.queue = self.manager.Queue()
+        self.sender = _EventSender(self.queue)
+        self.thread = threading.Thread(target=self._relay)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _relay(self):
+        started = False
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            kind, args = item
+            if kind == 'start':
+                # only the first worker to start announces the run
+                if not started:
+                    self.tracker.start(*args)
+                    started = True
+            else:
+                self.tracker.realization(*args)
 
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.manager.shutdown()
+
+
+def _resume_checkpoint(checkpoint, files, variables, acc_kws, index):
+    '''Load a checkpoint and those left by the workers of a parallel run that died, and drop the
+    realization files that are already in them'''
+    paths = [checkpoint] if os.path.isfile(checkpoint) else []
+    paths += worker_checkpoints(checkpoint)
+    acc = None
+    done_files = list()
+    for path in paths:
+        path_acc, saved_variables, path_files, saved_index = load_checkpoint(path,
+                                                                             return_index=True)
+        if acc is not None and set(done_files).issuperset(path_files):
+            # a worker checkpoint that was merged into the main one before the run died
+            continue
+        _check_checkpoint(path_acc, saved_variables, saved_index, variables, acc_kws, index)
+        variables = saved_variables
+        acc = path_acc if acc is None else acc.merge(path_acc)
+        done_files.extend(path_files)
+    if len(paths) > 1 or paths[0] != checkpoint:
+        # keep the merged workers in the main checkpoint before they are overwritten
+        save_checkpoint(checkpoint, acc, variables, done_files, index)
+        _remove_worker_checkpoints(checkpoint)
+    done = set(done_files)
+    files = [filename for filename in files if os.path.abspath(filename) not in done]
+    return acc, variables, files, done_files
+
+
+def _check_checkpoint(acc, saved_variables, saved_index, variables, acc_kws, index):
+    '''Check that the options of a run match the checkpoint it is resuming'''
+    if variables:
+        if isinstance(variables, str):
+            variables = [variables]
+        if list(variables) != saved_variables:
+            raise KeyError('Variables passed do not match the variables in the checkpoint')
+    saved = dict(quantiles=None if acc.quantiles is None else acc.quantiles.quantiles,
+                 cutoffs=None if acc.exceedance is None else acc.exceedance.cutoffs)
+    for key, saved_values in saved.items():
+        saved_values = [] if saved_values is None else saved_values.tolist()
+        if saved_values != [float(value) for value in acc_kws[key] or []]:
+            raise ValueError('{} passed do not match the checkpoint'.format(key))
+    if bool(acc_kws['covariance']) != (acc.comoments is not None):
+        raise ValueError('covariance passed does not match the checkpoint')
+    if acc_kws['precision'] != acc.moments.precision:
+        raise ValueError('precision passed does not match the checkpoint')
+    if (index is None) != (saved_index is None) or \
+            (index is not None and not np.array_equal(index, saved_index)):
+        raise ValueError('region passed does not match the checkpoint')
+
+
+def _remove_worker_checkpoints(checkpoint):
+    for path in worker_checkpoints(checkpoint):
+        os.remove(path)
+
+
+def _realization_reader(files, variables, fast_reader, index=None):
+    '''Use the bulk text reader if every file is gslib or csv, otherwise fall back on DataFile'''
+    if fast_reader and files and all(text_fltype(filename) for filename in files):
+        return RealizationReader(variables, index)
+    return DataFileReader(variables, index)
+
+
+def _postsim_chunked(files, output_name, output_fltype, variables, var_min, max_memory_mb,
+                     acc_kws, prefetch, tracker):
+    '''Stream a range of blocks at a time from every realization and write each chunk out'''
+    from contextlib import ExitStack
+
+    with ExitStack() as stack:
+        # plain files are reopened for each chunk, compressed ones are kept open up to a limit
+        max_open = _max_open_files()
+        readers = list()
+        for filename in files:
+            keep_open = max_open > 0
+            reader = stack.enter_context(ChunkedReader(filename, variables, keep_open))
+            max_open -= reader.keep_open
+            readers.append(reader)
+        variables = readers[0].variables
+        tmins = _trim_limits(var_min, variables)
+        # the compressed files that stay open, and those reopened by the prefetch threads
+        reserved = sum(reader.memory for reader in readers if reader.keep_open)
+        reserved += max(prefetch, 1) * max([reader.memory for reader in readers
+                                            if not reader.keep_open] or [0])
+        chunk_size = _chunk_size(max_memory_mb, len(variables), len(readers[0].columns),
+                                 acc_kws, reserved)
+        writer = None
+        timings = dict(io_wait=0.0, parse=0.0, trim=0.0, accumulate=0.0)
+        tracker.start(variables)
+        while True:
+            acc = None
+            chunk = dict.fromkeys(timings, 0.0)
+            prefetcher = Prefetcher(
+                functools.partial(_timed_call, lambda reader: reader.read(chunk_size)), readers,
+                depth=prefetch)
+            for reader, (values, parse) in prefetcher:
+                start = time.perf_counter()
+                if acc is None:
+                    acc = PostsimAccumulator(len(values), len(variables), **acc_kws)
+                elif len(values) != acc.nblocks:
+                    raise ValueError('{} does not have the same number of blocks as {}'.format(
+                        reader.flname, readers[0].flname))
+                _trim_values(values, tmins)
+                trimmed = time.perf_counter()
+                acc.update(values)
+                chunk['parse'] += parse
+                chunk['trim'] += trimmed - start
+                chunk['accumulate'] += time.perf_counter() - trimmed
+            chunk['io_wait'] = prefetcher.io_wait
+            for key in timings:
+                timings[key] += chunk[key]
+            if acc.nblocks:
+                tracker.realization(None, blocks=acc.nblocks, **chunk)
+            if writer is None:
+                writer = _chunk_writer(output_name, output_fltype,
+                                       acc.columns(variables) + ['Nr'])
+                stack.callback(writer.close)
+            if acc.nblocks == 0:
+                break
+            writer.write(_postsim_rows(acc))
+    timings['compute'] = timings['trim'] + timings['accumulate']
+    tracker.finish(timings)
+    return timings
+
+
+def _max_open_files():
+    '''Number of compressed realizations to keep open at once, half the file handle limit'''
+    try:
+        import resource
+    except ImportError:
+        # windows, where the C runtime allows 512 open files by default
+        return 256
+    soft = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft == resource.RLIM_INFINITY:
+        return 4096
+    return soft // 2
+
+
+def _chunk_size(max_memory_mb, nvar, ncol, acc_kws, reserved=0):
+    '''Number of blocks to process at once so the working arrays and the `reserved` bytes held
+    by open files fit in `max_memory_mb`'''
+    # mean, m2, count, two temporaries and a mask per variable, the parsed row and its text
+    nstat = 6
+    if acc_kws.get('precision', 'float64') != 'float64':
+        # the moments take 21 or 29 bytes rather than 41, counted in units of 8 bytes
+        nstat -= 2 if acc_kws['precision'] == 'float32' else 1
+    if acc_kws.get('quantiles'):
+        # markers, positions and a few temporaries per quantile, plus the count
+        nstat += 16 * len(acc_kws['quantiles']) + 1
+    if acc_kws.get('cutoffs'):
+        nstat += len(acc_kws['cutoffs']) + 1
+    if acc_kws.get('covariance'):
+        # six arrays and about six temporaries for each of the nvar * (nvar - 1) / 2 pairs
+        nstat += 6 * (nvar - 1)
+    bytes_per_block = 8 * (nstat * nvar + 5 * ncol)
+    return max(1, int((max_memory_mb * 1024 ** 2 - reserved) // bytes_per_block))
+
+
+class _TextChunkWriter(object):
+    '''Write a gslib or csv postsim output file chunk by chunk'''
+
+    def __init__(self, output_name, output_fltype, columns):
+        self.delimiter = ',' if output_fltype == 'csv' else ' '
+        self.fh = open(output_name, 'w')
+        if output_fltype == 'gslib':
+            self.fh.write('postsim\n{}\n'.format(len(columns)))
+            self.fh.write(''.join(col + '\n' for col in columns))
+        else:
+            self.fh.write(','.join(columns) + '\n')
+
+    def write(self, rows):
+        np.savetxt(self.fh, rows, fmt='%.8g', delimiter=self.delimiter)
+
+    def close(self):
+        self.fh.close()
+
+
+def _chunk_writer(output_name, output_fltype, columns):
+    '''Open a postsim output file that can be written chunk by chunk'''
+    output_fltype = output_fltype.lower()
+    if output_fltype in ('gslib', 'csv'):
+        return _TextChunkWriter(output_name, output_fltype, columns)
+    elif output_fltype in ('npy', 'binary'):
+        return BinaryPostsimWriter(output_name, columns)
+    raise NotImplementedError('Only gslib, csv and npy output can be written chunk by chunk')
+
+
+def _postsim_rows(acc):
+    '''Output rows of an accumulator, including the Nr column'''
+    return np.column_stack([acc.results(), np.full(acc.nblocks, acc.nreal, dtype=np.float64)])
+
+
+def _postsim_frame(acc, variables):
+    '''Convert a postsim accumulator into the postsim dataframe'''
+    columns = acc.columns(variables)
+    postsim = pd.DataFrame(acc.results(), columns=columns)
+    postsim['Nr'] = acc.nreal
+    columns.append('Nr')
+    return postsim, columns
+
+
+def _realization_files(file_base_or_list, Nr=None, file_ending=None, fltype=None,
+                       zero_padding=0):
+    '''Return the list of realization files to process and the file ending used'''
     if isinstance(file_base_or_list, list):
-        N = 0
-        for filename in file_base_or_list:
-            N += 1
-            dt = DataFile(flname=filename)
-
-            # Create the post sim file in the first call
-            if N == 1:
-                # setup index length and variables
-                blk_count = len(dt.data)
-                if variables:
-                    if variables not in dt.data.columns.tolist():
-                        raise KeyError('Variables passed do not match columns in datafile')
-                else:
-                    variables = dt.data.columns.tolist()
-                columns = list()
-                for var in variables:
-                    columns.append(var + '_mean')
-                    columns.append(var + '_variance')
-                columns.append('Nr')
-                # create pandas file
-                postsim = pd.DataFrame(index=np.arange(blk_count), columns=columns)
-                # Set nan values
-                if var_min:
-                    if isinstance(var_min, list):
-                        if len(var_min) != len(variables):
-                            raise KeyError('length of var_min list does not equal number of'
-                                           ' variables being processed')
-                        else:
-                            trim_dict = dict(zip(variables, var_min))
-                            for var in variables:
-                                dt.data.setnan(variables=var, tmin=trim_dict[var])
-                    elif isinstance(var_min, (int, float)):
-                        dt.data.setnan(variables=variables, tmin=var_min)
-                    else:
-                        raise KeyError('var_min must be either a list or a number')
-                # Initialize the first loop
-                postsim.Nr = N
-                for var in variables:
-                    col_m = var + '_mean'
-                    col_v = var + '_variance'
-                    postsim[col_m] = dt.data[var]
-                    postsim[col_v] = 0
-                continue
-            # ----Continue with next files----
-            # Set nan values
-            if var_min:
-                if isinstance(var_min, list):
-                    if len(var_min) != len(variables):
-                        raise KeyError('length of var_min list does not equal number of'
-                                       ' variables being processed')
-                    else:
-                        trim_dict = dict(zip(variables, var_min))
-                        for var in variables:
-                            dt.data.setnan(variables=var, tmin=trim_dict[var])
-                elif isinstance(var_min, (int, float)):
-                    dt.data.setnan(variables=variables, tmin=var_min)
-                else:
-                    raise KeyError('var_min must be either a list or a number')
-            # calculate the stats
-            postsim.Nr = N
-            for var in variables:
-                col_m = var + '_mean'
-                col_v = var + '_variance'
-                # Calculate the arithmetic average
-                postsim.left_arg = ((N - 1) / N) * postsim[col_m]
-                postsim.right_arg = (1 / N) * dt.data[var]
-                postsim[col_m] = postsim.left_arg + postsim.right_arg
-                # Calculate the variance
-                postsim.left_arg = ((N - 1) / N) * postsim[col_v]
-                postsim.temp = dt.data[var]
-                postsim.right_arg = postsim.temp - postsim[col_m]
-                postsim[col_v] = (postsim.left_arg + (1 / (N - 1)) *
-                                  postsim.right_arg * postsim.right_arg)
+        return list(file_base_or_list), file_ending
     elif isinstance(file_base_or_list, str):
-        for N in range(1, Nr + 1):
-            # Create the post sim file in the first call
-            if N == 1:
-                if file_ending is None:
-                    if fltype.lower() == 'gslib':
-                        file_ending = 'out'
-                    elif fltype.lower() == 'csv':
-                        file_ending = 'csv'
-                    elif fltype.lower() == 'gsb':
-                        file_ending = 'gsb'
-                    elif fltype.lower() == 'h5' or fltype.lower() is 'hdf5':
-                        file_ending = 'h5'
-                    else:
-                        raise KeyError('Either file_ending or fltype is needed')
-                filename = '{base}{number}.{ending}'.format(base=file_base_or_list,
-                                                            number=str(N).zfill(zero_padding),
-                                                            ending=file_ending)
-                dt = DataFile(flname=filename)
-                # Figure out the index (variable names... and total number of blocks)
-                blk_count = len(dt.data)
-                if variables:
-                    if variables not in dt.data.columns.tolist():
-                        raise KeyError('Variables passed do not match columns in datafile')
-                else:
-                    variables = dt.data.columns.tolist()
-                columns = list()
-                for var in variables:
-                    columns.append(var + '_mean')
-                    columns.append(var + '_variance')
-                columns.append('Nr')
-                columns.append('left_arg')
-                columns.append('right_arg')
-                columns.append('temp')
-                # create pandas dataframe
-                postsim = pd.DataFrame(index=np.arange(blk_count), columns=columns)
-                # Set nan values
-                if var_min:
-                    if isinstance(var_min, list):
-                        if len(var_min) != len(variables):
-                            raise KeyError('length of var_min list does not equal number of'
-                                           ' variables being processed')
-                        else:
-                            trim_dict = dict(zip(variables, var_min))
-                            for var in variables:
-                                dt.data.setnan(variables=var, tmin=trim_dict[var])
-                    elif isinstance(var_min, (int, float)):
-                        dt.data.setnan(variables=variables, tmin=var_min)
-                    else:
-                        raise KeyError('var_min must be either a list or a number')
-                # Initialize the first loop
-                postsim.Nr = N
-                for var in variables:
-                    col_m = var + '_mean'
-                    col_v = var + '_variance'
-                    postsim[col_m] = dt.data[var]
-                    postsim[col_v] = 0
-                continue
-            # ----Continue with next files----
-            # open the next file
-            filename = '{base}{number}.{ending}'.format(base=file_base_or_list,
-                                                        number=str(N).zfill(zero_padding),
-                                                        ending=file_ending)
-            dt = DataFile(flname=filename)
-            # Set nan values
-            if var_min:
-                if isinstance(var_min, list):
-                    if len(var_min) != len(variables):
-                        raise KeyError('length of var_min list does not equal number of'
-                                       ' variables being processed')
-                    else:
-                        trim_dict = dict(zip(variables, var_min))
-                        for var in variables:
-                            dt.data.setnan(variables=var, tmin=trim_dict[var])
-                elif isinstance(var_min, (int, float)):
-                    dt.data.setnan(variables=variables, tmin=var_min)
-                else:
-                    raise KeyError('var_min must be either a list or a number')
-            # calculate the stats
-            postsim.Nr = N
-            for var in variables:
-                col_m = var + '_mean'
-                col_v = var + '_variance'
-                # Calculate the arithmetic average
-                postsim.left_arg = ((N - 1) / N) * postsim[col_m]
-                postsim.right_arg = (1 / N) * dt.data[var]
-                postsim[col_m] = postsim.left_arg + postsim.right_arg
-                # Calculate the variance
-                postsim.left_arg = ((N - 1) / N) * postsim[col_v]
-                postsim.temp = dt.data[var]
-                postsim.right_arg = postsim.temp - postsim[col_m]
-                postsim[col_v] = (postsim.left_arg + (1 / (N - 1)) *
-                                  postsim.right_arg * postsim.right_arg)
+        if Nr is None:
+            raise KeyError('Nr is needed if a file base name is passed')
+        if file_ending is None:
+            if fltype is None:
+                raise KeyError('Either file_ending or fltype is needed')
+            if fltype.lower() == 'gslib':
+                file_ending = 'out'
+            elif fltype.lower() == 'csv':
+                file_ending = 'csv'
+            elif fltype.lower() == 'gsb':
+                file_ending = 'gsb'
+            elif fltype.lower() == 'h5' or fltype.lower() == 'hdf5':
+                file_ending = 'h5'
+            else:
+                raise KeyError('Either file_ending or fltype is needed')
+        files = ['{base}{number}.{ending}'.format(base=file_base_or_list,
+                                                  number=str(N).zfill(zero_padding),
+                                                  ending=file_ending)
+                 for N in range(1, Nr + 1)]
+        return files, file_ending
     else:
-
         raise TypeError('file_base_or_list must be either a list or a string')
-    # Write out the results
-    columns.remove('left_arg')
-    columns.remove('right_arg')
-    columns.remove('temp')
+
+
+def _trim_limits(var_min, variables):
+    '''Return an array with the trimming limit of each variable, or `None` if not trimming'''
+    if var_min:
+        if isinstance(var_min, list):
+            if len(var_min) != len(variables):
+                raise KeyError('length of var_min list does not equal number of'
+                               ' variables being processed')
+            return np.array(var_min, dtype=np.float64)
+        elif isinstance(var_min, (int, float)):
+            return np.full(len(variables), var_min, dtype=np.float64)
+        else:
+            raise KeyError('var_min must be either a list or a number')
+    return None
+
+
+def _trim_values(values, tmins):
+    '''Set values below the trimming limit of their variable to nan in place'''
+    if tmins is not None:
+        values[values < tmins] = np.nan
+
+
+def _output_fltype(output_fltype, fltype, file_ending):
+    '''Figure out the output file type if one was not passed'''
     if output_fltype is None:
+        if file_ending:
+            file_ending = split_compression(file_ending)[0]
         if fltype:
             output_fltype = fltype
-        elif file_ending == '.out':
+        elif file_ending == 'out':
             output_fltype = 'gslib'
         elif file_ending == 'csv' or file_ending == 'gsb' or file_ending == 'h5':
             output_fltype = file_ending
         else:
             raise KeyError('Unable to figure out what output_fltype needs to be. Please pass'
                            ' a value')
+    return output_fltype
+
+
+def _write_postsim(postsim, output_name, output_fltype, columns):
+    '''Write the postsim dataframe with the requested file type'''
+    if output_fltype.lower() == 'npy' or output_fltype.lower() == 'binary':
+        write_postsim_binary(output_name, postsim[columns].to_numpy(dtype=np.float64), columns)
+        return
+    # the data module (and its optional dependencies) is only needed for the DataFile formats
+    from ..data import iotools
 
     if output_fltype.lower() == 'gslib':
         iotools.write_gslib(postsim, output_name, variables=columns)
@@ -234,7 +709,7 @@ def postsim_multfiles(file_base_or_list, output_name, Nr=None, file_ending=None,
         iotools.write_csv(postsim, output_name, variables=columns)
     elif output_fltype.lower() == 'gsb':
         iotools.write_gsb(postsim, output_name, tvar='Nr', variables=columns)
-    elif output_fltype.lower() == 'h5' or fltype.lower() is 'hdf5':
+    elif output_fltype.lower() == 'h5' or output_fltype.lower() == 'hdf5':
         iotools.write_h5(postsim, output_name, variables=columns)
     else:
         raise NotImplementedError('output_fltype did not match any of the implemented filetypes')
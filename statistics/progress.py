@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Progress and timing observers for postsim runs
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import json
+import sys
+import time
+
+
+def current_rss_mb():
+    '''Current resident set size of this process in megabytes, or `None` if unavailable'''
+    try:
+        with open('/proc/self/statm') as fh:
+            pages = int(fh.read().split()[1])
+        import resource
+        return pages * resource.getpagesize() / 1024 ** 2
+    except (IOError, OSError, ImportError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / 1024 ** 2
+
+
+class PostsimObserver(object):
+    """
+    Base class for objects that receive events from :func:`postsim_multfiles`. Subclass it and
+    override any of the methods.
+
+    :meth:`realization` is passed a dictionary for every realization (or chunk of blocks in the
+    block-chunked mode) with the keys:
+
+    * ``filename``: realization file, `None` for a chunk of blocks
+    * ``index``: number of realizations (or chunks) processed so far
+    * ``total``: number of realizations to process, `None` if unknown
+    * ``parse``: seconds spent reading and parsing the file
+    * ``io_wait``: seconds postsim waited for the file, less than ``parse`` when prefetching
+    * ``trim``: seconds spent applying `var_min`
+    * ``accumulate``: seconds spent folding the values into the statistics
+    * ``blocks``: number of blocks processed
+    * ``elapsed``: seconds since the start of the run
+    * ``eta``: estimated seconds until the run finishes, `None` if unknown
+    * ``rss_mb``: resident memory of the process that processed the file
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def start(self, info):
+        '''Called once before the first realization with the number of files and variables'''
+        pass
+
+    def realization(self, event):
+        '''Called after every realization has been folded in'''
+        pass
+
+    def finish(self, summary):
+        '''Called once at the end of the run with the total timings'''
+        pass
+
+
+class ConsoleProgress(PostsimObserver):
+    """
+    Print the progress of a postsim run to the console
+
+    Parameters:
+        every (int): print a line every `every` realizations
+        stream (file): stream to print to, defaults to ``sys.stdout``
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, every=1, stream=None):
+        self.every = every
+        self.stream = stream
+
+    def _print(self, text):
+        print(text, file=self.stream or sys.stdout)
+
+    def start(self, info):
+        if info['total'] is None:
+            self._print('postsim: processing {} in chunks of blocks'.format(
+                ', '.join(info['variables'])))
+        else:
+            self._print('postsim: processing {} realizations of {}'.format(
+                info['total'], ', '.join(info['variables'])))
+
+    def realization(self, event):
+        if event['index'] % self.every != 0 and event['index'] != event['total']:
+            return
+        total = '/{}'.format(event['total']) if event['total'] is not None else ''
+        eta = ' ETA {:.0f} s'.format(event['eta']) if event['eta'] is not None else ''
+        rss = ' {:.0f} MB'.format(event['rss_mb']) if event['rss_mb'] is not None else ''
+        self._print('postsim: {}{} parse {:.2f} s wait {:.2f} s trim {:.2f} s accumulate {:.2f} s'
+                    ' elapsed {:.0f} s{}{}'.format(event['index'], total, event['parse'],
+                                                   event['io_wait'], event['trim'],
+                                                   event['accumulate'], event['elapsed'], eta,
+                                                   rss))
+
+    def finish(self, summary):
+        self._print('postsim: finished in {:.1f} s ({:.1f} s waiting on reads)'.format(
+            summary['elapsed'], summary['io_wait']))
+
+
+class JSONLinesLog(PostsimObserver):
+    """
+    Write every postsim event as a line of JSON so production runs can be profiled afterwards
+
+    Parameters:
+        flname (str): file to append the events to
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, flname):
+        self.flname = flname
+        self.fh = None
+
+    def _write(self, kind, record):
+        record = dict(record, event=kind, time=time.time())
+        self.fh.write(json.dumps(record) + '\n')
+        self.fh.flush()
+
+    def start(self, info):
+        self.fh = open(self.flname, 'a')
+        self._write('start', info)
+
+    def realization(self, event):
+        self._write('realization', event)
+
+    def finish(self, summary):
+        self._write('finish', summary)
+        self.fh.close()
+
+
+class ProgressTracker(object):
+    """
+    Turn the raw timings of each realization into events with the running ETA and send them to
+    the observers.
+
+    Parameters:
+        observers (list): :class:`PostsimObserver` instances
+        total (int): number of realizations (or chunks) to process, `None` if unknown
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, observers, total):
+        if observers is None:
+            observers = list()
+        elif not isinstance(observers, (list, tuple)):
+            observers = [observers]
+        self.observers = list(observers)
+        self.total = total
+        self.index = 0
+        self.start_time = None
+
+    def start(self, variables):
+        self.start_time = time.perf_counter()
+        for observer in self.observers:
+            observer.start(dict(total=self.total, variables=list(variables)))
+
+    def realization(self, filename, parse, io_wait, trim, accumulate, blocks, rss_mb=None):
+        if self.start_time is None:
+            raise RuntimeError('ProgressTracker.start must be called first')
+        self.index += 1
+        elapsed = time.perf_counter() - self.start_time
+        eta = None
+        if self.total is not None:
+            eta = elapsed / self.index * (self.total - self.index)
+        event = dict(filename=filename, index=self.index, total=self.total, parse=parse,
+                     io_wait=io_wait, trim=trim, accumulate=accumulate, blocks=blocks,
+                     elapsed=elapsed, eta=eta,
+                     rss_mb=current_rss_mb() if rss_mb is None else rss_mb)
+        for observer in self.observers:
+            observer.realization(event)
+
+    def finish(self, timings):
+        if self.start_time is None:
+            # nothing was processed, e.g. resuming from a checkpoint with no new files
+            self.start(list())
+        elapsed = time.perf_counter() - self.start_time
+        summary = dict(timings, elapsed=elapsed, processed=self.index)
+        for observer in self.observers:
+            observer.finish(summary)
@@ -0,0 +1,473 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Lightweight readers for streaming realization files into numpy arrays for postsim
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import itertools
+import threading
+import time
+
+import numpy as np
+
+from .compression import detect_compression, open_memory, open_realization, split_compression
+
+
+def text_fltype(flname):
+    '''Return ``gslib`` or ``csv`` if the file can be streamed as text, otherwise `None`'''
+    ending = split_compression(flname)[0].rsplit('.', 1)[-1].lower()
+    if ending == 'csv':
+        return 'csv'
+    elif ending in ('out', 'dat', 'gslib', 'txt'):
+        return 'gslib'
+    return None
+
+
+def read_header(fh, fltype):
+    """
+    Read the header of an open GSLIB or csv file, leaving the file positioned at the first row
+    of data.
+
+    Parameters:
+        fh (file): open text or binary file
+        fltype (str): either ``gslib`` or ``csv``
+
+    Returns:
+        columns (list): column names in the file
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    def readline():
+        line = fh.readline()
+        return line.decode() if isinstance(line, bytes) else line
+
+    if fltype == 'gslib':
+        readline()
+        ncol = int(readline().split()[0])
+        columns = [readline().strip() for _ in range(ncol)]
+    elif fltype == 'csv':
+        columns = [col.strip() for col in readline().split(',')]
+    else:
+        raise NotImplementedError('Only gslib and csv files can be streamed')
+    return columns
+
+
+def parse_rows(lines, ncol, fltype):
+    """
+    Parse lines of a GSLIB or csv body into a float64 array of shape ``(nrows, ncol)``
+
+    Parameters:
+        lines (list): lines of text from the body of the file
+        ncol (int): number of columns in the file
+        fltype (str): either ``gslib`` or ``csv``
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    text = ''.join(lines)
+    if fltype == 'csv':
+        text = text.replace(',', ' ')
+    values = np.array(text.split(), dtype=np.float64)
+    if values.size % ncol != 0:
+        raise ValueError('Number of values read is not a multiple of the number of columns')
+    return values.reshape(-1, ncol)
+
+
+def _parse_stream(fh, fltype, chunk_size=1024 ** 2):
+    '''Parse the rest of a binary GSLIB or csv stream `chunk_size` bytes at a time'''
+    arrays = list()
+    tail = b''
+    while True:
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            break
+        chunk = tail + chunk
+        # only parse whole lines, the partial last line is parsed with the next chunk
+        end = chunk.rfind(b'\n') + 1
+        tail = chunk[end:]
+        arrays.append(_parse_text(chunk[:end], fltype))
+    if tail.strip():
+        arrays.append(_parse_text(tail, fltype))
+    if not arrays:
+        return np.empty(0, dtype=np.float64)
+    return np.concatenate(arrays)
+
+
+def _parse_text(text, fltype):
+    if fltype == 'csv':
+        return _parse_all(np.fromstring, text.replace(b'\n', b','), dtype=np.float64, sep=',')
+    return _parse_all(np.fromstring, text, dtype=np.float64, sep=' ')
+
+
+def _parse_all(parse, *args, **kwargs):
+    '''Call ``np.fromfile`` or ``np.fromstring``, raising if they stop at a value they cannot
+    parse rather than returning the values before it'''
+    import warnings
+
+    with warnings.catch_warnings():
+        # numpy before 2.0 only warns and returns the values it has parsed
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return parse(*args, **kwargs)
+        except (ValueError, DeprecationWarning):
+            raise ValueError('Found a value that is not a number')
+
+
+class ChunkedReader(object):
+    """
+    Read a GSLIB or csv realization a fixed number of blocks at a time so that only a block range
+    of the file is ever held in memory.
+
+    Plain files are closed after each read and reopened at the byte offset the last read stopped
+    at, so any number of realizations can be read side by side without running out of file
+    handles. A compressed file cannot be seeked into without decompressing it from the start, so
+    it is kept open between reads unless `keep_open` is False, in which case each read
+    decompresses and skips the blocks that were already read. Compressed files are decompressed
+    as they are read rather than on a worker thread, so an open file only holds the decompressor
+    and a `buffer_size` read buffer.
+
+    Parameters:
+        flname (str): path to the realization file
+        variables (list): variables to return. `None` returns all columns
+        keep_open (bool): keep a compressed file open between reads
+        buffer_size (int): size of the read buffer over a compressed file
+
+    Attributes:
+        memory (int): approximate bytes the open file holds on to, see :func:`open_memory`
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, flname, variables=None, keep_open=True, buffer_size=64 * 1024):
+        self.flname = flname
+        self.fltype = text_fltype(flname)
+        self.compression = detect_compression(flname)
+        self.keep_open = keep_open and self.compression is not None
+        self.buffer_size = buffer_size
+        self.memory = open_memory(self.compression, buffer_size, threaded=False)
+        self.nread = 0
+        self._fh = None
+        self._offset = None
+        fh = self._open_file()
+        try:
+            self.columns = read_header(fh, self.fltype)
+            if self.compression is None:
+                self._offset = fh.tell()
+        except Exception:
+            fh.close()
+            raise
+        if self.keep_open:
+            self._fh = fh
+        else:
+            fh.close()
+        if isinstance(variables, str):
+            variables = [variables]
+        if variables:
+            if any(var not in self.columns for var in variables):
+                self.close()
+                raise KeyError('Variables passed do not match columns in datafile')
+            self.variables = list(variables)
+        else:
+            self.variables = list(self.columns)
+        self.col_idx = [self.columns.index(var) for var in self.variables]
+
+    def _open_file(self):
+        return open_realization(self.flname, 'rb', self.compression, self.buffer_size,
+                                threaded=False)
+
+    def _open(self):
+        '''Open the file positioned at the first block that has not been read'''
+        if self._fh is not None:
+            return self._fh
+        fh = self._open_file()
+        try:
+            if self._offset is not None:
+                fh.seek(self._offset)
+            else:
+                read_header(fh, self.fltype)
+                for _ in itertools.islice(fh, self.nread):
+                    pass
+        except Exception:
+            fh.close()
+            raise
+        return fh
+
+    def read(self, nrows):
+        '''Return the next `nrows` blocks as an array of shape ``(nrows, nvar)``'''
+        fh = self._open()
+        try:
+            lines = list(itertools.islice(fh, nrows))
+            if self._offset is not None:
+                self._offset = fh.tell()
+        finally:
+            if self.keep_open:
+                self._fh = fh
+            else:
+                fh.close()
+        self.nread += len(lines)
+        ncol = len(self.columns)
+        try:
+            values = _parse_text(b''.join(lines), self.fltype)
+        except ValueError as exc:
+            raise ValueError('{} could not be parsed: {}'.format(self.flname, exc))
+        if values.size % ncol != 0:
+            raise ValueError('Number of values read from {} is not a multiple of the number of '
+                             'columns'.format(self.flname))
+        return values.reshape(-1, ncol)[:, self.col_idx]
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _as_list(variables):
+    if isinstance(variables, str):
+        return [variables]
+    return list(variables) if variables else None
+
+
+class RealizationReader(object):
+    """
+    Bulk reader for a set of identically structured GSLIB or csv realizations. The header of the
+    first file is parsed and cached (column names, ncol and the number of blocks). Later files
+    only have their header compared against the cache before the body is parsed straight into a
+    float64 array with numpy, without building a DataFrame. Only the `variables` columns are
+    returned and every file must have the same number of blocks as the first.
+
+    If a region `index` is passed only the rows of those blocks are parsed, and reading stops
+    after the last one. The number of blocks in the files is then not checked beyond the region.
+
+    gzip, bz2 and xz/lzma compressed files are decompressed on a worker thread and parsed as they
+    stream in, see :func:`open_realization`.
+
+    The reader is safe to use from several threads at once, e.g. with :class:`Prefetcher`.
+
+    Parameters:
+        variables (list): variables to return. `None` returns all columns
+        index (np.ndarray): sorted indices of the blocks to return, see
+            :func:`resolve_region`. `None` returns all blocks
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, variables=None, index=None):
+        self.variables = _as_list(variables)
+        self.index = index
+        self.columns = None
+        self.nblocks = None if index is None else len(index)
+        self._header = None
+        self._col_idx = None
+        self._lock = threading.Lock()
+
+    def read(self, flname):
+        """
+        Read a realization file
+
+        Parameters:
+            flname (str): path to the realization file
+
+        Returns:
+            values (np.ndarray): array of shape ``(nblocks, nvar)``
+
+        .. codeauthor:: Tyler Acorn - 2026-10-17
+        """
+        fltype = text_fltype(flname)
+        if fltype is None:
+            raise NotImplementedError('Only gslib and csv files can be read with '
+                                      'RealizationReader')
+        compression = detect_compression(flname)
+        with open_realization(flname, 'rb', compression) as fh:
+            self._check_header(fh, fltype, flname)
+            ncol = len(self.columns)
+            if self.index is not None:
+                text = self._read_rows(fh, flname)
+            try:
+                if self.index is not None:
+                    values = _parse_text(text, fltype)
+                elif compression is not None:
+                    values = _parse_stream(fh, fltype)
+                elif fltype == 'gslib':
+                    # the whole file is parsed so a longer file is caught by the check below
+                    values = _parse_all(np.fromfile, fh, dtype=np.float64, sep=' ')
+                else:
+                    values = _parse_text(fh.read(), fltype)
+            except ValueError as exc:
+                raise ValueError('{} could not be parsed: {}'.format(flname, exc))
+        if values.size % ncol != 0:
+            raise ValueError('Number of values in {} is not a multiple of the number of '
+                             'columns'.format(flname))
+        nblocks = values.size // ncol
+        with self._lock:
+            if self.nblocks is None:
+                self.nblocks = nblocks
+        if nblocks != self.nblocks:
+            raise ValueError('{} has {} blocks but the first realization had {}'.format(
+                flname, nblocks, self.nblocks))
+        values = values.reshape(nblocks, ncol)
+        if self._col_idx is None:
+            return values
+        return values[:, self._col_idx]
+
+    def _read_rows(self, fh, flname):
+        '''The text of the rows of the blocks in the region, keeping just their lines'''
+        nrows = int(self.index[-1]) + 1
+        targets = iter(self.index.tolist())
+        target = next(targets)
+        lines = list()
+        nlines = 0
+        for nlines, line in enumerate(itertools.islice(fh, nrows), 1):
+            # the index is sorted and unique so the lines are matched in a single pass
+            if nlines - 1 == target:
+                lines.append(line)
+                target = next(targets, None)
+        if nlines < nrows:
+            raise ValueError('{} has {} blocks but the region goes up to block {}'.format(
+                flname, nlines, nrows - 1))
+        return b''.join(lines)
+
+    def _check_header(self, fh, fltype, flname):
+        '''Read the header of `fh`, parsing it if it is the first one or else checking it'''
+        if self._header is None:
+            with self._lock:
+                if self._header is None:
+                    self._parse_header(fh, fltype, flname)
+                    return
+        lines = [fh.readline() for _ in range(len(self._header))]
+        if fltype == 'gslib':
+            # the title line of a GSLIB file often holds the realization number so is not checked
+            lines[0] = self._header[0]
+        if lines != self._header:
+            raise ValueError('The header of {} does not match the first realization'.format(
+                flname))
+
+    def _parse_header(self, fh, fltype, flname):
+        '''Parse and cache the header of the first realization'''
+        if fltype == 'gslib':
+            title = fh.readline()
+            ncol_line = fh.readline()
+            if not ncol_line:
+                raise ValueError('{} does not have a GSLIB header'.format(flname))
+            ncol = int(ncol_line.split()[0])
+            header = [title, ncol_line] + [fh.readline() for _ in range(ncol)]
+            columns = [line.decode().strip() for line in header[2:]]
+        else:
+            header = [fh.readline()]
+            columns = [col.strip() for col in header[0].decode().split(',')]
+        if self.variables:
+            if any(var not in columns for var in self.variables):
+                raise KeyError('Variables passed do not match columns in datafile')
+            if self.variables != columns:
+                self._col_idx = [columns.index(var) for var in self.variables]
+        else:
+            self.variables = list(columns)
+        self.columns = columns
+        self._header = header
+
+
+class DataFileReader(object):
+    """
+    Read realizations with the generic :class:`DataFile` loader, for file types that the
+    :class:`RealizationReader` cannot parse (``gsb`` and ``hdf5``).
+
+    Parameters:
+        variables (list): variables to return. `None` returns all columns
+        index (np.ndarray): indices of the blocks to return. `None` returns all blocks
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, variables=None, index=None):
+        self.variables = _as_list(variables)
+        self.index = index
+
+    def read(self, flname):
+        '''Return the `variables` of a realization file as an array of shape ``(nblocks, nvar)``'''
+        from ..data import DataFile
+
+        dt = DataFile(flname=flname)
+        columns = dt.data.columns.tolist()
+        variables = self.variables
+        if variables:
+            if any(var not in columns for var in variables):
+                raise KeyError('Variables passed do not match columns in datafile')
+        else:
+            variables = columns
+            self.variables = columns
+        values = dt.data[variables].to_numpy(dtype=np.float64)
+        if self.index is not None:
+            if len(values) <= self.index[-1]:
+                raise ValueError('{} has {} blocks but the region goes up to block {}'.format(
+                    flname, len(values), self.index[-1]))
+            values = values[self.index]
+        return values
+
+
+class Prefetcher(object):
+    """
+    Load items on background threads while the caller works on the previous ones. At most
+    `depth` items are loaded ahead of the one being consumed so memory stays bounded. Threads are
+    used rather than processes so the loaded arrays never have to be pickled; parsing and disk or
+    network reads release the GIL for most of their time.
+
+    Parameters:
+        loader (function): called with each item, returning the loaded data
+        items (list): items to load, yielded in the same order
+        depth (int): number of items to load ahead. ``0`` loads each item when it is needed
+
+    Attributes:
+        io_wait (float): seconds the consumer spent waiting for loaded data
+
+    Examples:
+        >>> prefetcher = Prefetcher(DataFile, files, depth=4)
+        >>> for filename, dt in prefetcher:
+        ...     do_math(dt)
+        >>> print(prefetcher.io_wait)
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+
+    def __init__(self, loader, items, depth=2):
+        self.loader = loader
+        self.items = list(items)
+        self.depth = depth
+        self.io_wait = 0.0
+
+    def __iter__(self):
+        if not self.depth:
+            for item in self.items:
+                start = time.perf_counter()
+                result = self.loader(item)
+                self.io_wait += time.perf_counter() - start
+                yield item, result
+            return
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=self.depth) as executor:
+            pending = deque()
+            items = iter(self.items)
+            for item in itertools.islice(items, self.depth):
+                pending.append((item, executor.submit(self.loader, item)))
+            try:
+                while pending:
+                    item, future = pending.popleft()
+                    start = time.perf_counter()
+                    result = future.result()
+                    self.io_wait += time.perf_counter() - start
+                    # keep the queue full before handing the result back
+                    for next_item in itertools.islice(items, 1):
+                        pending.append((next_item, executor.submit(self.loader, next_item)))
+                    yield item, result
+            finally:
+                for _, future in pending:
+                    future.cancel()
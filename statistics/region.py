@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# public
+"""
+Resolve a region of interest into the indices of the blocks postsim should process
+"""
+from __future__ import absolute_import, division, print_function
+__author__ = 'Tyler Acorn'
+__date__ = '2026'
+__version__ = '1.000'
+import numpy as np
+
+_GRID_KEYS = ('nx', 'xmn', 'xsiz', 'ny', 'ymn', 'ysiz', 'nz', 'zmn', 'zsiz')
+
+
+def _grid_values(griddef):
+    '''The GSLIB grid definition as a dictionary, from a GridDef like object or 9 numbers'''
+    if all(hasattr(griddef, key) for key in _GRID_KEYS):
+        return dict((key, getattr(griddef, key)) for key in _GRID_KEYS)
+    values = list(np.asarray(griddef, dtype=np.float64).ravel())
+    if len(values) != len(_GRID_KEYS):
+        raise ValueError('griddef must have nx, xmn, xsiz, ny, ymn, ysiz, nz, zmn and zsiz')
+    grid = dict(zip(_GRID_KEYS, values))
+    for key in ('nx', 'ny', 'nz'):
+        grid[key] = int(grid[key])
+    return grid
+
+
+def _axis_range(limits, n, mn, siz):
+    '''Indices along one axis of the blocks whose centers fall within `limits`'''
+    if limits is None:
+        return np.arange(n)
+    low, high = limits
+    first = max(int(np.ceil((low - mn) / siz - 1e-9)), 0)
+    last = min(int(np.floor((high - mn) / siz + 1e-9)), n - 1)
+    return np.arange(first, last + 1)
+
+
+def resolve_region(region, griddef=None):
+    """
+    Resolve a region of interest once into a sorted array of block indices, counting from 0 in
+    the GSLIB order of the realization files (x fastest, then y, then z).
+
+    Parameters:
+        region: either a list of block indices, a boolean mask with one value per block, or a
+            bounding box as a dictionary with any of the keys ``x``, ``y`` and ``z`` mapped to
+            ``(min, max)`` coordinates. A block is in the bounding box if its center is.
+        griddef: grid definition, needed for a bounding box. Either an object with ``nx``,
+            ``xmn``, ``xsiz`` etc. attributes like a pygeostat ``GridDef``, or the 9 numbers
+            ``nx, xmn, xsiz, ny, ymn, ysiz, nz, zmn, zsiz`` of a GSLIB grid definition
+
+    Returns:
+        index (np.ndarray): sorted int64 array of the block indices in the region
+
+    Examples:
+        >>> resolve_region({'x': (1000, 1500), 'z': (200, 300)}, griddef)
+        >>> resolve_region(pit_shell_flags.astype(bool))
+
+    .. codeauthor:: Tyler Acorn - 2026-10-17
+    """
+    grid = _grid_values(griddef) if griddef is not None else None
+    nblocks = grid['nx'] * grid['ny'] * grid['nz'] if grid is not None else None
+    if isinstance(region, dict):
+        if grid is None:
+            raise ValueError('griddef is needed to resolve a bounding box')
+        if any(key not in ('x', 'y', 'z') for key in region):
+            raise KeyError('A bounding box can only have the keys x, y and z')
+        ix, iy, iz = [_axis_range(region.get(axis), grid['n' + axis], grid[axis + 'mn'],
+                                  grid[axis + 'siz']) for axis in 'xyz']
+        index = (ix[None, None, :] + grid['nx'] * iy[None, :, None] +
+                 grid['nx'] * grid['ny'] * iz[:, None, None])
+        return index.ravel().astype(np.int64)
+    region = np.asarray(region)
+    if region.dtype == bool:
+        if nblocks is not None and region.size != nblocks:
+            raise ValueError('The region mask has {} values but the grid has {} blocks'.format(
+                region.size, nblocks))
+        return np.flatnonzero(region).astype(np.int64)
+    if region.ndim != 1 or not np.issubdtype(region.dtype, np.integer):
+        raise TypeError('region must be a list of block indices, a boolean mask or a bounding '
+                        'box dictionary')
+    index = np.unique(region).astype(np.int64)
+    if index.size and index[0] < 0:
+        raise ValueError('Block indices in the region cannot be negative')
+    if nblocks is not None and index.size and index[-1] >= nblocks:
+        raise ValueError('Block index {} is outside of the grid'.format(index[-1]))
+    return index
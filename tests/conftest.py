@@ -0,0 +1,56 @@
+'''
+The repository is the pyacorn package itself, so register it under that name when it is not
+installed, then the tests can import it as ``pyacorn`` from any checkout directory.
+'''
+import gzip
+import importlib.util
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+try:
+    import pyacorn  # noqa: F401
+except ImportError:
+    _spec = importlib.util.spec_from_file_location('pyacorn', os.path.join(ROOT, '__init__.py'),
+                                                   submodule_search_locations=[ROOT])
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules['pyacorn'] = _module
+    _spec.loader.exec_module(_module)
+
+from pyacorn.scriptnotifier import Transport  # noqa: E402
+
+
+class Recorder(Transport):
+    '''Transport that keeps the ``(status, message, details)`` of every message it is sent'''
+    name = 'recorder'
+
+    def __init__(self, name=None):
+        super(Recorder, self).__init__(name)
+        self.messages = []
+
+    def send(self, message, status, details=None):
+        self.messages.append((status, message, details))
+
+
+def write_realizations(tmpdir, nreal, nblocks=40, compress_every=None, seed=0, values=None):
+    '''Write `nreal` GSLIB realizations of two lognormal variables, or of `values` with shape
+    ``(nreal, nblocks, 2)``, gzipping every `compress_every`-th one, and return their paths'''
+    if values is None:
+        values = np.random.default_rng(seed).lognormal(size=(nreal, nblocks, 2))
+    files = list()
+    for ireal, values in enumerate(values):
+        text = 'realization {}\n2\na\nb\n'.format(ireal)
+        text += ''.join('{:.17g} {:.17g}\n'.format(*row) for row in values)
+        flname = str(tmpdir / 'real{}.out'.format(ireal))
+        if compress_every and ireal % compress_every == 0:
+            flname += '.gz'
+            with gzip.open(flname, 'wt') as fh:
+                fh.write(text)
+        else:
+            with open(flname, 'w') as fh:
+                fh.write(text)
+        files.append(flname)
+    return files
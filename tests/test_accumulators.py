@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from pyacorn.statistics import MomentAccumulator, merge_pairwise
+
+NREAL = 1000
+# largest relative error allowed in the mean and the variance for values of 1000 +/- 1
+BOUNDS = {'float64': (1e-14, 1e-10), 'float32': (1e-5, 1e-3), 'compensated': (2e-7, 2e-7)}
+
+
+@pytest.fixture(scope='module')
+def values():
+    return 1000.0 + np.random.RandomState(0).standard_normal((NREAL, 200, 2))
+
+
+def relative_errors(acc, values):
+    mean = values.mean(axis=0)
+    variance = ((values - mean) ** 2).mean(axis=0)
+    return (np.max(np.abs(acc.means - mean) / np.abs(mean)),
+            np.max(np.abs(acc.variance - variance) / variance))
+
+
+def accumulate(values, precision):
+    acc = MomentAccumulator(values.shape[1], values.shape[2], precision)
+    for realization in values:
+        acc.update(realization)
+    return acc
+
+
+@pytest.mark.parametrize('precision', sorted(BOUNDS))
+def test_error_bounds(values, precision):
+    acc = accumulate(values, precision)
+    assert np.all(acc.count == NREAL)
+    mean_error, variance_error = relative_errors(acc, values)
+    assert mean_error < BOUNDS[precision][0]
+    assert variance_error < BOUNDS[precision][1]
+
+
+@pytest.mark.parametrize('precision', sorted(BOUNDS))
+def test_merge_error_bounds(values, precision):
+    half = NREAL // 2
+    acc = accumulate(values[:half], precision).merge(accumulate(values[half:], precision))
+    assert acc.mean.dtype == (np.float64 if precision == 'float64' else np.float32)
+    assert np.all(acc.count == NREAL)
+    mean_error, variance_error = relative_errors(acc, values)
+    assert mean_error < BOUNDS[precision][0]
+    assert variance_error < BOUNDS[precision][1]
+
+
+@pytest.mark.parametrize('precision', ['float32', 'compensated'])
+def test_merge_pairwise_reduced(values, precision):
+    accs = [accumulate(part, precision) for part in np.array_split(values, 7)]
+    mean_error, variance_error = relative_errors(merge_pairwise(accs), values)
+    assert mean_error < BOUNDS[precision][0]
+    assert variance_error < BOUNDS[precision][1]
+
+
+def test_merge_different_precisions():
+    with pytest.raises(ValueError, match='different precisions'):
+        MomentAccumulator(2, 1, 'float32').merge(MomentAccumulator(2, 1, 'compensated'))
@@ -0,0 +1,61 @@
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from pyacorn.statistics import load_postsim_binary, postsim_multfiles
+from pyacorn.statistics.checkpoint import load_checkpoint, worker_checkpoints
+
+from conftest import write_realizations
+
+
+def run(files, flname, **kwargs):
+    postsim_multfiles(files, str(flname), output_fltype='npy', var_min=0.5, **kwargs)
+    return np.array(load_postsim_binary(str(flname)).tolist())
+
+
+def test_resume_appends_new_realizations(tmp_path):
+    files = write_realizations(tmp_path, 12)
+    checkpoint = str(tmp_path / 'checkpoint.npz')
+    run(files[:5], tmp_path / 'first.npy', checkpoint=checkpoint, cutoffs=[1.0])
+    assert len(load_checkpoint(checkpoint)[2]) == 5
+    resumed = run(files, tmp_path / 'resumed.npy', checkpoint=checkpoint, resume=True,
+                  cutoffs=[1.0])
+    single = run(files, tmp_path / 'single.npy', cutoffs=[1.0])
+    np.testing.assert_allclose(resumed, single, rtol=1e-12)
+    assert len(load_checkpoint(checkpoint)[2]) == 12
+
+
+def test_resume_parallel_run_that_died(tmp_path):
+    files = write_realizations(tmp_path, 12)
+    single = run(files, tmp_path / 'single.npy')
+    # the second worker dies on its last realization, after checkpointing four of its six
+    shutil.copy(files[-1], str(tmp_path / 'good'))
+    with open(files[-1], 'a') as fh:
+        fh.write('oops oops\n')
+    checkpoint = str(tmp_path / 'checkpoint.npz')
+    with pytest.raises(ValueError, match='could not be parsed'):
+        run(files, tmp_path / 'died.npy', n_workers=2, checkpoint=checkpoint,
+            checkpoint_every=2)
+    assert not os.path.isfile(checkpoint)
+    assert [len(load_checkpoint(path)[2]) for path in worker_checkpoints(checkpoint)] == [6, 4]
+    shutil.copy(str(tmp_path / 'good'), files[-1])
+    resumed = run(files, tmp_path / 'resumed.npy', n_workers=2, checkpoint=checkpoint,
+                  checkpoint_every=2, resume=True)
+    np.testing.assert_allclose(resumed, single, rtol=1e-12)
+    assert worker_checkpoints(checkpoint) == []
+    assert len(load_checkpoint(checkpoint)[2]) == 12
+
+
+def test_resume_with_different_region(tmp_path):
+    files = write_realizations(tmp_path, 4)
+    checkpoint = str(tmp_path / 'checkpoint.npz')
+    run(files[:2], tmp_path / 'first.npy', checkpoint=checkpoint, region=[0, 1, 2])
+    index = load_checkpoint(checkpoint, return_index=True)[3]
+    np.testing.assert_array_equal(index, [0, 1, 2])
+    with pytest.raises(ValueError, match='region passed does not match the checkpoint'):
+        run(files, tmp_path / 'second.npy', checkpoint=checkpoint, resume=True,
+            region=[3, 4, 5])
+    with pytest.raises(ValueError, match='region passed does not match the checkpoint'):
+        run(files, tmp_path / 'second.npy', checkpoint=checkpoint, resume=True)
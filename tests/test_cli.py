@@ -0,0 +1,21 @@
+import pytest
+
+from pyacorn.statistics.cli import main, shard_range
+
+
+@pytest.mark.parametrize('nreal, nshards', [(10, 1), (10, 3), (10, 10), (1000, 7)])
+def test_shards_cover_every_realization_once(nreal, nshards):
+    ranges = [shard_range(nreal, nshards, shard) for shard in range(nshards)]
+    realizations = [ireal for first, last in ranges for ireal in range(first, last + 1)]
+    assert realizations == list(range(1, nreal + 1))
+    assert all(last >= first for first, last in ranges)
+
+
+@pytest.mark.parametrize('nshards', [0, 11])
+def test_nshards_outside_nreal_rejected(nshards, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main(['partial', 'real', 'partial.npz', '--nreal', '10', '--nshards', str(nshards),
+              '--shard', '0'])
+    assert excinfo.value.code == 2
+    assert '--nshards must be between 1 and --nreal (10), got {}'.format(nshards) in \
+        capsys.readouterr().err
@@ -0,0 +1,133 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from pyacorn.scriptnotifier import ScriptNotifier, Transport
+
+from conftest import ROOT, Recorder
+
+
+class Gate(Transport):
+    '''Hangs until it is opened'''
+    name = 'gate'
+
+    def __init__(self):
+        super(Gate, self).__init__()
+        self.opened = threading.Event()
+        self.messages = []
+
+    def send(self, message, status, details=None):
+        self.opened.wait()
+        self.messages.append(message)
+
+
+class Flaky(Recorder):
+    '''Fails the first `failures` sends and records the time of every attempt'''
+    name = 'flaky'
+
+    def __init__(self, failures):
+        super(Flaky, self).__init__()
+        self.failures = failures
+        self.attempts = []
+
+    def send(self, message, status, details=None):
+        self.attempts.append(time.monotonic())
+        if len(self.attempts) <= self.failures:
+            raise IOError('server not available')
+        super(Flaky, self).send(message, status, details)
+
+
+class Slow(Recorder):
+    name = 'slow'
+
+    def send(self, message, status, details=None):
+        time.sleep(0.05)
+        super(Slow, self).send(message, status, details)
+
+
+def test_full_queue_drops_new_messages():
+    gate = Gate()
+    notifier = ScriptNotifier(print_error=False, transports=[gate], background=True,
+                              queue_size=2)
+    dispatcher = notifier.dispatchers['gate']
+    # the first message holds the worker thread and the next two fill the queue
+    for imessage in range(5):
+        notifier.status_alert('message {}'.format(imessage))
+        if imessage == 0:
+            time.sleep(0.1)
+    assert dispatcher.dropped == 2
+    gate.opened.set()
+    assert notifier.close(timeout=5)
+    assert gate.messages == ['message 0', 'message 1', 'message 2']
+    assert dispatcher.sent == 3
+
+
+def test_retries_with_backoff_deliver():
+    flaky = Flaky(failures=2)
+    notifier = ScriptNotifier(print_error=False, transports=[flaky], background=True,
+                              retries=3, retry_backoff=0.1)
+    notifier.status_alert('hello')
+    assert notifier.flush(timeout=5)
+    dispatcher = notifier.dispatchers['flaky']
+    notifier.close()
+    assert flaky.messages == [('Update', 'hello', None)]
+    assert (dispatcher.sent, dispatcher.failed) == (1, 0)
+    waits = [second - first for first, second in zip(flaky.attempts, flaky.attempts[1:])]
+    # the wait doubles after each failure
+    assert waits[0] >= 0.1
+    assert waits[1] >= 0.2
+
+
+def test_send_fails_after_all_retries(capsys):
+    flaky = Flaky(failures=10)
+    notifier = ScriptNotifier(print_error=False, transports=[flaky], background=True,
+                              retries=2, retry_backoff=0.01)
+    notifier.status_alert('hello')
+    dispatcher = notifier.dispatchers['flaky']
+    notifier.close(timeout=5)
+    assert len(flaky.attempts) == 3
+    assert (dispatcher.sent, dispatcher.failed) == (0, 1)
+    assert 'Error sending flaky with ScriptNotifier Class: server not available' in \
+        capsys.readouterr().out
+
+
+def test_crash_report_flushes_the_queue():
+    slow = Slow()
+    notifier = ScriptNotifier(print_error=False, transports=[slow], background=True)
+    for imessage in range(5):
+        notifier.status_alert('message {}'.format(imessage))
+    with pytest.raises(SystemExit):
+        notifier.crash_report('boom')
+    assert slow.messages == [('Update', 'message {}'.format(imessage), None)
+                             for imessage in range(5)] + [('ERROR', 'boom', None)]
+
+
+def test_queue_flushed_at_exit(tmp_path):
+    flname = str(tmp_path / 'alerts.jsonl')
+    script = textwrap.dedent('''
+        import sys, time
+        sys.path.insert(0, {tests!r})
+        import conftest
+        from pyacorn.scriptnotifier import ScriptNotifier, FileTransport
+
+        class SlowFile(FileTransport):
+            def send(self, message, status, details=None):
+                time.sleep(0.05)
+                super(SlowFile, self).send(message, status, details)
+
+        notifier = ScriptNotifier(print_error=False, transports=[SlowFile({flname!r})],
+                                  background=True)
+        for imessage in range(5):
+            notifier.status_alert('message {{}}'.format(imessage))
+    ''').format(tests=os.path.join(ROOT, 'tests'), flname=flname)
+    subprocess.run([sys.executable, '-c', script], check=True, timeout=60)
+    with open(flname) as fh:
+        records = [json.loads(line) for line in fh]
+    assert [record['message'] for record in records] == ['message {}'.format(imessage)
+                                                         for imessage in range(5)]
@@ -0,0 +1,60 @@
+import pytest
+
+from pyacorn.scriptnotifier import ScriptNotifier
+from pyacorn.scriptnotifier.standins import StubSMTPServer
+
+
+@pytest.fixture
+def server():
+    server = StubSMTPServer()
+    yield server
+    server.close()
+
+
+def email_notifier(server, **kwargs):
+    smtp = {'from_addr': 'me@example.com', 'to_addr': 'me@example.com', 'login': 'me',
+            'password': 'secret', 'smtpserver': '127.0.0.1', 'port': server.port, 'SSL': False}
+    return ScriptNotifier(print_error=False, email=True, SMTP_Dict=smtp, channel_timeout=5,
+                          **kwargs)
+
+
+def test_one_connection_for_many_emails(server):
+    notifier = email_notifier(server)
+    for iemail in range(10):
+        notifier.email_myself('email {}'.format(iemail), 'Update')
+    notifier.close()
+    assert len(server.messages) == 10
+    assert server.connections == 1
+    assert server.noops == 0
+
+
+def test_idle_session_is_checked_with_noop(server):
+    notifier = email_notifier(server, noop_interval=0)
+    for iemail in range(3):
+        notifier.email_myself('email {}'.format(iemail), 'Update')
+    notifier.close()
+    assert len(server.messages) == 3
+    assert server.connections == 1
+    assert server.noops == 3
+
+
+def test_dropped_session_reconnects_once(server):
+    # the server hangs up after every message, so each later email finds the session dropped
+    server.drop_after = 1
+    notifier = email_notifier(server)
+    notifier.email_myself('first', 'Update')
+    assert server.connections == 1
+    notifier.email_myself('second', 'Update')
+    notifier.close()
+    assert [message.splitlines()[-1] for message in server.messages] == [b'first', b'second']
+    assert server.connections == 2
+
+
+def test_dropped_session_found_by_noop(server):
+    server.drop_after = 1
+    notifier = email_notifier(server, noop_interval=0)
+    notifier.email_myself('first', 'Update')
+    notifier.email_myself('second', 'Update')
+    notifier.close()
+    assert len(server.messages) == 2
+    assert server.connections == 2
@@ -0,0 +1,94 @@
+import json
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from pyacorn.latex import export_latex_tables, render_latex_table
+
+
+def tables():
+    return {'first': pd.DataFrame({'a': [1.0, 2.0], 'b': ['x_1', 'y_2']}),
+            'second': (pd.DataFrame({'c': [3, 4], 'd': [0.5, 0.25]}), {'cell_align': 'l'}),
+            'third': pd.DataFrame({'e': ['one', 'two'], 'f': [5.0, 6.0]})}
+
+
+def manifest(outdir):
+    with open(os.path.join(str(outdir), '.latex_tables.json')) as fh:
+        return json.load(fh)
+
+
+@pytest.fixture(params=[None, 2], ids=['serial', 'workers'])
+def n_workers(request):
+    return request.param
+
+
+def test_unchanged_tables_are_not_rendered(tmp_path, n_workers):
+    assert export_latex_tables(tables(), str(tmp_path), n_workers=n_workers,
+                               float_prec=2) == ['first', 'second', 'third']
+    assert sorted(manifest(tmp_path)) == ['first', 'second', 'third']
+    with open(str(tmp_path / 'second.tex')) as fh:
+        assert fh.read() == render_latex_table(tables()['second'][0], None, float_prec=2,
+                                               cell_align='l')
+    with open(str(tmp_path / 'tables.tex')) as fh:
+        assert fh.read() == ''.join('\\input{{{}}}\n'.format(
+            os.path.join(str(tmp_path), name).replace(os.sep, '/'))
+            for name in ['first', 'second', 'third'])
+    assert export_latex_tables(tables(), str(tmp_path), n_workers=n_workers,
+                               float_prec=2) == []
+    assert export_latex_tables(tables(), str(tmp_path), n_workers=n_workers, force=True,
+                               float_prec=2) == ['first', 'second', 'third']
+
+
+def test_changed_cell(tmp_path, n_workers):
+    export_latex_tables(tables(), str(tmp_path))
+    changed = tables()
+    changed['third'].loc[1, 'f'] = 6.5
+    assert export_latex_tables(changed, str(tmp_path), n_workers=n_workers) == ['third']
+    with open(str(tmp_path / 'third.tex')) as fh:
+        assert ' 6.5\\\\' in fh.read()
+
+
+def test_changed_option(tmp_path, n_workers):
+    export_latex_tables(tables(), str(tmp_path))
+    changed = tables()
+    changed['second'] = (changed['second'][0], {'cell_align': 'r'})
+    assert export_latex_tables(changed, str(tmp_path), n_workers=n_workers) == ['second']
+    # an option for every table changes them all
+    assert export_latex_tables(changed, str(tmp_path), n_workers=n_workers,
+                               table_package='tabular') == ['first', 'second', 'third']
+
+
+def test_reordered_columns(tmp_path, n_workers):
+    export_latex_tables(tables(), str(tmp_path))
+    changed = tables()
+    changed['first'] = changed['first'][['b', 'a']]
+    assert export_latex_tables(changed, str(tmp_path), n_workers=n_workers) == ['first']
+
+
+def test_deleted_table_file(tmp_path, n_workers):
+    export_latex_tables(tables(), str(tmp_path))
+    os.remove(str(tmp_path / 'first.tex'))
+    assert export_latex_tables(tables(), str(tmp_path), n_workers=n_workers) == ['first']
+    assert os.path.isfile(str(tmp_path / 'first.tex'))
+
+
+def test_failed_render_is_not_cached(tmp_path):
+    export_latex_tables(tables(), str(tmp_path))
+    before = manifest(tmp_path)
+    changed = tables()
+    changed['first'].loc[0, 'a'] = 1.5
+    changed['second'] = (changed['second'][0], {'table_package': 'booktabs'})
+    with pytest.raises(ValueError, match='unsupported table package'):
+        export_latex_tables(changed, str(tmp_path), n_workers=2)
+    cached = manifest(tmp_path)
+    # the table rendered before the failure keeps its new hash
+    assert 'second' not in cached
+    assert cached['first'] != before['first']
+    assert cached['third'] == before['third']
+    del changed['second']
+    assert export_latex_tables(changed, str(tmp_path), n_workers=2) == []
+    changed['second'] = tables()['second']
+    assert export_latex_tables(changed, str(tmp_path), n_workers=2) == ['second']
+
@@ -0,0 +1,93 @@
+import time
+
+from pyacorn.scriptnotifier import ScriptNotifier
+
+from conftest import Recorder
+
+
+def wait_for(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def spin(seconds, heartbeat=None):
+    '''Iterations of a CPU bound loop in `seconds` of wall time'''
+    end = time.monotonic() + seconds
+    iterations = 0
+    while time.monotonic() < end:
+        total = 0
+        for value in range(10000):
+            total += value * value
+        iterations += 1
+        if heartbeat is not None:
+            heartbeat.update()
+    return iterations
+
+
+def test_overhead_on_cpu_bound_loop():
+    notifier = ScriptNotifier(print_error=False, transports=[Recorder()])
+    # the loop without a heartbeat, before and after, to allow for the machine speeding up
+    before = spin(1.0)
+    heartbeat = notifier.start_heartbeat(total=10 ** 9, interval=0.01, summary_interval=0.2)
+    wall, cpu = time.monotonic(), time.process_time()
+    iterations = spin(1.0, heartbeat)
+    wall, cpu = time.monotonic() - wall, time.process_time() - cpu
+    overhead = heartbeat.overhead
+    notifier.stop_heartbeat()
+    notifier.close()
+    after = spin(1.0)
+    assert heartbeat.done == iterations
+    assert iterations > 0.9 * min(before, after)
+    # the loop keeps one core busy, the sampling thread should add little to it
+    assert cpu < 1.1 * wall
+    assert overhead < 0.01
+
+
+def test_stall_warning_and_resume():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder])
+    heartbeat = notifier.start_heartbeat(interval=0.02, summary_interval=None,
+                                         stall_timeout=0.1)
+    try:
+        assert wait_for(lambda: recorder.messages)
+        time.sleep(0.2)
+        # one warning for the whole stall
+        assert len(recorder.messages) == 1
+        status, message, _ = recorder.messages[0]
+        assert status == 'WARNING'
+        assert message.startswith('no progress for')
+        heartbeat.update()
+        assert wait_for(lambda: len(recorder.messages) > 1)
+        assert recorder.messages[1][0] == 'HEARTBEAT'
+        assert recorder.messages[1][1].startswith('progress resumed: ')
+    finally:
+        notifier.stop_heartbeat()
+        notifier.close()
+
+
+def test_memory_warning_sent_once():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder])
+    notifier.start_heartbeat(interval=0.02, summary_interval=None, memory_limit_mb=1)
+    try:
+        assert wait_for(lambda: recorder.messages)
+        time.sleep(0.2)
+        assert len(recorder.messages) == 1
+        status, message, _ = recorder.messages[0]
+        assert status == 'WARNING'
+        assert message.startswith('memory over 1 MB: ')
+    finally:
+        notifier.stop_heartbeat()
+        notifier.close()
+
+
+def test_no_memory_warning_under_the_limit():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder])
+    notifier.start_heartbeat(interval=0.02, summary_interval=None, memory_limit_mb=10 ** 6)
+    time.sleep(0.2)
+    notifier.stop_heartbeat()
+    notifier.close()
+    assert recorder.messages == []
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from pyacorn import importtime
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def pythonpath(tmp_path, monkeypatch):
+    '''Make fresh interpreters import this checkout as pyacorn'''
+    os.symlink(ROOT, str(tmp_path / 'pyacorn'))
+    monkeypatch.setenv('PYTHONPATH', str(tmp_path))
+
+
+def imported_modules(statement):
+    '''Modules in sys.modules after running `statement` in a fresh interpreter'''
+    script = statement + '\nimport sys\nprint("\\n".join(sys.modules))'
+    result = subprocess.run([sys.executable, '-c', script], stdout=subprocess.PIPE,
+                            universal_newlines=True, check=True)
+    return set(result.stdout.split())
+
+
+def test_no_heavy_imports(pythonpath):
+    # the time budgets are left to the command line check as they depend on the machine
+    cases = [(statement, float('inf')) for statement, _ in importtime.CASES]
+    assert importtime.check_import_time(cases, verbose=False) == []
+
+
+def test_script_notifier_imports_only_what_it_needs(pythonpath):
+    modules = imported_modules('from pyacorn import ScriptNotifier')
+    assert 'pyacorn.scriptnotifier.scriptnotifier' in modules
+    for module in ['dispatcher', 'throttle', 'heartbeat', 'profiler', 'transports']:
+        assert 'pyacorn.scriptnotifier.' + module not in modules
+    modules = imported_modules('from pyacorn.scriptnotifier import Transport')
+    assert 'pyacorn.scriptnotifier.transports' in modules
+    assert 'pyacorn.scriptnotifier.heartbeat' not in modules
@@ -0,0 +1,72 @@
+import io
+import os
+
+import numpy as np
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from pyacorn.latex import latex_table, render_latex_table
+
+from conftest import ROOT
+
+GOLDEN = os.path.join(ROOT, 'tests', 'data', 'latex')
+# the golden tables are the output of latex_table before it was rewritten, except tabu with
+# 'r' or 'l' cells where that version failed on an undefined column width
+CASES = {'tabu_c': dict(table_package='tabu', cell_align='c'),
+         'tabu_m': dict(table_package='tabu', cell_align='m', table_width=0.8),
+         'tabu_r': dict(table_package='tabu', cell_align='r'),
+         'tabu_l': dict(table_package='tabu', cell_align='l'),
+         'tabular_c': dict(table_package='tabular', cell_align='c'),
+         'tabular_m': dict(table_package='tabular', cell_align='m', table_width=12),
+         'tabular_r': dict(table_package='tabular', cell_align='r'),
+         'tabular_l': dict(table_package='tabular', cell_align='l'),
+         'tabu_prec': dict(table_package='tabu', float_prec=2),
+         'tabular_prec': dict(table_package='tabular', float_prec=3),
+         'tabu_replace': dict(table_package='tabu', replace_dict={'_': '\\_', '%': '\\%'}),
+         'tabular_replace': dict(table_package='tabular', float_prec=1, replace_dict={})}
+
+
+def frame():
+    return pd.DataFrame({'float_value': [1.0, 2.5, -0.125, 1e-8],
+                         'count': np.array([1, 20, 300, 4000], dtype=np.int64),
+                         'well-name': ['A_1', 'B-2', 'C 3%', 'd_e-f'],
+                         'mixed': [1.23456, 'x_y', 7, None],
+                         'small': np.array([0.5, 0.25, 0.125, 0.0625], dtype=np.float32)})
+
+
+def golden(name):
+    with open(os.path.join(GOLDEN, name + '.tex')) as fh:
+        return fh.read()
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_latex_table_matches_golden(name, capsys):
+    latex_table(frame(), **CASES[name])
+    assert capsys.readouterr().out == golden(name)
+
+
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_render_latex_table_matches_golden(name, tmp_path):
+    expected = golden(name)
+    assert render_latex_table(frame(), None, **CASES[name]) == expected
+    # rows written a few at a time give the same table
+    stream = io.StringIO()
+    render_latex_table(frame(), stream, chunk_size=3, **CASES[name])
+    assert stream.getvalue() == expected
+    flname = str(tmp_path / 'table.tex')
+    render_latex_table(frame(), flname, **CASES[name])
+    with open(flname) as fh:
+        assert fh.read() == expected
+
+
+@pytest.mark.parametrize('table_package', ['tabu', 'tabular'])
+def test_longtable_matches_golden(table_package):
+    table = render_latex_table(frame(), None, table_package=table_package, float_prec=2,
+                               longtable=True, chunk_size=3)
+    assert table == golden('long' + table_package)
+
+
+def test_unsupported_package():
+    with pytest.raises(ValueError, match='unsupported table package'):
+        render_latex_table(frame(), None, table_package='booktabs')
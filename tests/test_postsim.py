@@ -0,0 +1,194 @@
+import numpy as np
+import pytest
+
+from pyacorn.statistics import load_postsim_binary, postsim, postsim_multfiles
+from pyacorn.statistics.binary import BinaryPostsimWriter
+from pyacorn.statistics.readers import ChunkedReader
+
+from conftest import write_realizations
+
+
+def load(flname):
+    return np.array(load_postsim_binary(flname).tolist())
+
+
+def test_chunked_reader_does_not_hold_plain_files_open(tmp_path):
+    flname, = write_realizations(tmp_path, 1)
+    with ChunkedReader(flname, keep_open=True) as reader:
+        assert reader._fh is None
+        first = reader.read(15)
+        rest = reader.read(100)
+    assert reader.nread == 40
+    np.testing.assert_array_equal(np.vstack([first, rest]),
+                                  np.loadtxt(flname, skiprows=4))
+
+
+@pytest.mark.parametrize('keep_open', [True, False])
+def test_chunked_reader_compressed(tmp_path, keep_open):
+    flname, = write_realizations(tmp_path, 1, compress_every=1)
+    with ChunkedReader(flname, ['b'], keep_open=keep_open) as reader:
+        chunks = [reader.read(7) for _ in range(7)]
+    np.testing.assert_array_equal(np.vstack(chunks)[:, 0], np.loadtxt(flname, skiprows=4)[:, 1])
+
+
+def test_chunked_more_files_than_open_limit(tmp_path, monkeypatch):
+    # only 3 of the compressed files stay open, the rest are reopened for each chunk
+    monkeypatch.setattr(postsim, '_max_open_files', lambda: 3)
+    files = write_realizations(tmp_path, 30, compress_every=3)
+    postsim_multfiles(files, str(tmp_path / 'full.npy'), output_fltype='npy')
+    postsim_multfiles(files, str(tmp_path / 'chunked.npy'), output_fltype='npy',
+                      max_memory_mb=0.001)
+    np.testing.assert_allclose(load(tmp_path / 'chunked.npy'), load(tmp_path / 'full.npy'),
+                               rtol=1e-12)
+
+
+def test_chunk_size_counts_open_decompressors(tmp_path):
+    flname, = write_realizations(tmp_path, 1, compress_every=1)
+    with ChunkedReader(flname) as reader:
+        assert 0 < reader.memory < 1024 ** 2
+        full = postsim._chunk_size(5, 2, 2, {})
+        reduced = postsim._chunk_size(5, 2, 2, {}, reserved=60 * reader.memory)
+    assert 0 < reduced < full
+    assert postsim._chunk_size(5, 2, 2, {}, reserved=10 * 1024 ** 2) == 1
+
+
+@pytest.mark.parametrize('ncolumns', [3, 3721])
+def test_binary_header_versions(tmp_path, ncolumns):
+    # 60 variables with their covariance give 3721 columns, too many for a version 1.0 header
+    columns = ['column{}'.format(icol) for icol in range(ncolumns)]
+    values = np.arange(4 * ncolumns, dtype=np.float64).reshape(4, ncolumns)
+    flname = str(tmp_path / 'postsim.npy')
+    with BinaryPostsimWriter(flname, columns) as writer:
+        writer.write(values[:1])
+        writer.write(values[1:])
+    with open(flname, 'rb') as fh:
+        version = np.lib.format.read_magic(fh)
+    assert version == ((1, 0) if ncolumns == 3 else (2, 0))
+    postsim_table = load_postsim_binary(flname)
+    assert list(postsim_table.dtype.names) == columns
+    np.testing.assert_array_equal(load(flname), values)
+
+
+def test_parallel_matches_serial(tmp_path):
+    files = write_realizations(tmp_path, 9)
+    kws = dict(output_fltype='npy', var_min=0.5, covariance=True, cutoffs=[1.0, 2.0])
+    postsim_multfiles(files, str(tmp_path / 'serial.npy'), **kws)
+    postsim_multfiles(files, str(tmp_path / 'parallel.npy'), n_workers=2, **kws)
+    serial = load_postsim_binary(str(tmp_path / 'serial.npy'))
+    parallel = load_postsim_binary(str(tmp_path / 'parallel.npy'))
+    assert serial.dtype.names == parallel.dtype.names
+    assert {'a_mean', 'a_variance', 'a_count', 'a_prob_gt_1', 'a_b_cov', 'a_b_corr', 'Nr'} <= \
+        set(serial.dtype.names)
+    np.testing.assert_allclose(np.array(parallel.tolist()), np.array(serial.tolist()),
+                               rtol=1e-12, atol=1e-12)
+
+
+# the serial, chunked and region paths must give the same statistics
+NREAL = 200
+PATHS = {'serial': dict(), 'chunked': dict(max_memory_mb=0.001),
+         'region': dict(region=[0, 3, 4, 17, 39])}
+
+
+def realizations(files):
+    '''Values of every realization, shape ``(nreal, nblocks, nvar)``'''
+    return np.stack([np.loadtxt(flname, skiprows=4) for flname in files])
+
+
+def run_path(tmp_path, files, path, **kwargs):
+    '''Postsim output of one path as a dict of columns, with the blocks it covers'''
+    flname = str(tmp_path / '{}.npy'.format(path))
+    postsim_multfiles(files, flname, output_fltype='npy', **dict(PATHS[path], **kwargs))
+    table = load_postsim_binary(flname)
+    output = {name: np.array(table[name]) for name in table.dtype.names}
+    blocks = output.pop('block').astype(int) if path == 'region' else np.arange(40)
+    return output, blocks
+
+
+@pytest.fixture(scope='module')
+def trimmed_realizations(tmp_path_factory):
+    '''Realizations with the trimming limits that leave block 3 of ``a`` with no valid values'''
+    values = np.random.default_rng(1).lognormal(size=(NREAL, 40, 2))
+    values[:, 3, 0] = 0.01
+    files = write_realizations(tmp_path_factory.mktemp('realizations'), NREAL,
+                               compress_every=4, values=values)
+    np.testing.assert_array_equal(realizations(files), values)
+    var_min = [0.05, 0.5]
+    trimmed = values.copy()
+    trimmed[trimmed < np.array(var_min)] = np.nan
+    return files, var_min, trimmed
+
+
+@pytest.mark.parametrize('path', sorted(PATHS))
+def test_nan_counts_known_answer(tmp_path, trimmed_realizations, path):
+    files, var_min, trimmed = trimmed_realizations
+    output, blocks = run_path(tmp_path, files, path, var_min=var_min)
+    trimmed = trimmed[:, blocks]
+    count = np.sum(~np.isnan(trimmed), axis=0)
+    assert count[list(blocks).index(3), 0] == 0
+    assert 0 < count.min(axis=0)[1] < count.max(axis=0)[1] < NREAL
+    with np.errstate(invalid='ignore'), pytest.warns(RuntimeWarning):
+        mean = np.nanmean(trimmed, axis=0)
+        variance = np.nanvar(trimmed, axis=0)
+    for ivar, var in enumerate('ab'):
+        np.testing.assert_array_equal(output[var + '_count'], count[:, ivar])
+        np.testing.assert_allclose(output[var + '_mean'], mean[:, ivar], rtol=1e-10)
+        np.testing.assert_allclose(output[var + '_variance'], variance[:, ivar], rtol=1e-10)
+    np.testing.assert_array_equal(output['Nr'], NREAL)
+
+
+@pytest.mark.parametrize('path', sorted(PATHS))
+def test_covariance_known_answer(tmp_path, trimmed_realizations, path):
+    files, var_min, trimmed = trimmed_realizations
+    output, blocks = run_path(tmp_path, files, path, var_min=var_min, covariance=True)
+    covariance = np.full(len(blocks), np.nan)
+    correlation = np.full(len(blocks), np.nan)
+    for irow, iblock in enumerate(blocks):
+        # realizations where either variable was trimmed are skipped for the pair
+        first, second = trimmed[:, iblock].T
+        valid = ~np.isnan(first) & ~np.isnan(second)
+        if valid.any():
+            covariance[irow] = np.cov(first[valid], second[valid], ddof=0)[0, 1]
+        if valid.sum() > 1:
+            correlation[irow] = np.corrcoef(first[valid], second[valid])[0, 1]
+    assert np.isnan(covariance[list(blocks).index(3)])
+    np.testing.assert_allclose(output['a_b_cov'], covariance, rtol=1e-8, atol=1e-12)
+    np.testing.assert_allclose(output['a_b_corr'], correlation, rtol=1e-8, atol=1e-12)
+
+
+@pytest.mark.parametrize('path', sorted(PATHS))
+def test_quantiles_and_exceedance_known_answer(tmp_path, trimmed_realizations, path):
+    files, var_min, trimmed = trimmed_realizations
+    quantiles = [0.1, 0.5, 0.9]
+    cutoffs = [1.0, 2.5]
+    output, blocks = run_path(tmp_path, files, path, var_min=var_min, quantiles=quantiles,
+                              cutoffs=cutoffs)
+    trimmed = trimmed[:, blocks]
+    count = np.sum(~np.isnan(trimmed), axis=0)
+    with np.errstate(invalid='ignore'), pytest.warns(RuntimeWarning):
+        expected = np.nanquantile(trimmed, quantiles, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        exceed = np.stack([np.sum(trimmed > cutoff, axis=0) / count for cutoff in cutoffs])
+    for ivar, var in enumerate('ab'):
+        for iq, name in enumerate(['p10', 'p50', 'p90']):
+            estimate = output['{}_{}'.format(var, name)]
+            np.testing.assert_array_equal(np.isnan(estimate), np.isnan(expected[iq, :, ivar]))
+            # the P-square estimates are only approximate, so compare the fraction of the
+            # values below them with the quantile
+            with np.errstate(invalid='ignore'):
+                rank = np.sum(trimmed[:, :, ivar] <= estimate, axis=0) / count[:, ivar]
+            assert np.nanmax(np.abs(rank - quantiles[iq])) < 0.075
+            np.testing.assert_allclose(estimate, expected[iq, :, ivar], rtol=0.5)
+        for icut, cutoff in enumerate(cutoffs):
+            np.testing.assert_allclose(output['{}_prob_gt_{:g}'.format(var, cutoff)],
+                                       exceed[icut, :, ivar], rtol=1e-12)
+
+
+def test_paths_give_the_same_columns(tmp_path, trimmed_realizations):
+    files, var_min, _ = trimmed_realizations
+    kws = dict(var_min=var_min, quantiles=[0.25, 0.75], cutoffs=[1.0], covariance=True)
+    serial, _ = run_path(tmp_path, files, 'serial', **kws)
+    for path in ['chunked', 'region']:
+        output, blocks = run_path(tmp_path, files, path, **kws)
+        assert list(output) == list(serial)
+        for name, column in output.items():
+            np.testing.assert_allclose(column, serial[name][blocks], rtol=1e-12, err_msg=name)
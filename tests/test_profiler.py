@@ -0,0 +1,121 @@
+import time
+import tracemalloc
+
+import pytest
+
+from pyacorn.scriptnotifier import ScriptNotifier, StackSampler
+
+from conftest import Recorder
+
+# enough functions to get past the frames of pytest, which are in every sample
+TOP = 200
+
+
+def busy_loop(seconds):
+    end = time.monotonic() + seconds
+    total = 0
+    while time.monotonic() < end:
+        for value in range(1000):
+            total += value * value
+    return total
+
+
+def allocate():
+    return [bytearray(1024) for _ in range(2000)]
+
+
+def test_report_and_dump(tmp_path):
+    sampler = StackSampler(interval=0.001).start()
+    try:
+        kept = allocate()
+        busy_loop(0.3)
+        report = sampler.report(TOP)
+    finally:
+        sampler.stop()
+    assert sampler.samples > 10
+    lines = report.splitlines()
+    assert lines[0].startswith('Profile: ')
+    assert lines[1] == 'Hot functions (self% total%):'
+    functions = sampler.hot_functions(TOP)
+    assert [total for _, _, total in functions] == sorted((total for _, _, total in functions),
+                                                          reverse=True)
+    assert any(label.startswith('busy_loop (test_profiler.py:') and own > 0.5
+               for label, own, total in functions)
+    assert any(line.endswith('busy_loop (test_profiler.py:{})'.format(
+        busy_loop.__code__.co_firstlineno)) for line in lines)
+    # the allocations still held show up as a memory site
+    assert 'Top memory allocation sites' in report
+    assert any('test_profiler.py:{}'.format(allocate.__code__.co_firstlineno + 1) in line
+               for line in lines)
+    del kept
+
+    flname = str(tmp_path / 'profile.folded')
+    sampler.dump(flname)
+    with open(flname) as fh:
+        stacks = [line.rsplit(' ', 1) for line in fh.read().splitlines()]
+    assert sum(int(count) for _, count in stacks) == sampler.samples
+    counts = [int(count) for _, count in stacks]
+    assert counts == sorted(counts, reverse=True)
+    assert any(stack.split(';')[-1].startswith('busy_loop ') for stack, _ in stacks)
+    # memory tracing stopped with the sampler, so there is no snapshot
+    assert not (tmp_path / 'profile.folded.tracemalloc').exists()
+
+
+def test_dump_memory_snapshot(tmp_path):
+    sampler = StackSampler(interval=0.001).start()
+    try:
+        busy_loop(0.05)
+        sampler.dump(str(tmp_path / 'profile.folded'))
+    finally:
+        sampler.stop()
+    snapshot = tracemalloc.Snapshot.load(str(tmp_path / 'profile.folded.tracemalloc'))
+    assert snapshot.traces
+
+
+def test_no_memory_sites_without_tracing():
+    sampler = StackSampler(interval=0.001, trace_memory=False).start()
+    busy_loop(0.05)
+    sampler.stop()
+    assert sampler.memory_sites() == []
+    assert 'Top memory allocation sites' not in sampler.report()
+
+
+def test_finish_report(capsys):
+    recorder = Recorder()
+    notifier = ScriptNotifier(transports=[recorder])
+    heartbeat = notifier.start_heartbeat(total=10, interval=0.01, summary_interval=None)
+    heartbeat.update(4)
+    notifier.finish_report('all done')
+    assert len(recorder.messages) == 1
+    status, message, details = recorder.messages[0]
+    assert status == 'FINISHED'
+    assert message.startswith('all done\nelapsed ')
+    assert '4/10 items' in message
+    assert details is None
+    assert capsys.readouterr().out == 'FINISHED: ' + message + '\n'
+    # the notifier is closed and the heartbeat stopped
+    assert notifier._lanes == dict()
+    assert not heartbeat._thread.is_alive()
+
+
+@pytest.mark.parametrize('report', ['finish', 'crash'])
+def test_profile_attached_to_reports(tmp_path, report):
+    recorder = Recorder()
+    flname = str(tmp_path / 'profile.folded')
+    notifier = ScriptNotifier(print_error=False, transports=[recorder], profile=True,
+                              profile_interval=0.001, profile_top=TOP, profile_dump=flname)
+    busy_loop(0.2)
+    if report == 'finish':
+        notifier.finish_report()
+        expected = ('FINISHED', 'the script has finished')
+    else:
+        with pytest.raises(SystemExit):
+            notifier.crash_report('boom')
+        notifier.close()
+        expected = ('ERROR', 'boom')
+    status, message, details = recorder.messages[-1]
+    assert (status, message) == expected
+    assert details.startswith('Profile: ')
+    assert 'busy_loop (test_profiler.py:' in details
+    with open(flname) as fh:
+        assert 'busy_loop (test_profiler.py:' in fh.read()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from pyacorn.statistics.readers import RealizationReader
+
+from conftest import write_realizations
+
+
+@pytest.mark.parametrize('compress_every', [None, 1])
+def test_region_rows(tmp_path, compress_every):
+    flname, = write_realizations(tmp_path, 1, nblocks=100, compress_every=compress_every)
+    index = np.array([0, 3, 4, 57, 99])
+    values = RealizationReader(['b'], index).read(flname)
+    np.testing.assert_array_equal(values[:, 0], np.loadtxt(flname, skiprows=4)[index, 1])
+
+
+def test_region_past_the_end(tmp_path):
+    flname, = write_realizations(tmp_path, 1, nblocks=10)
+    with pytest.raises(ValueError, match='has 10 blocks but the region goes up to block 12'):
+        RealizationReader(index=np.array([2, 12])).read(flname)
+
+
+def write_gslib(flname, nblocks, columns=('a', 'b'), body=None):
+    with open(flname, 'w') as fh:
+        fh.write('realization\n{}\n'.format(len(columns)))
+        fh.write(''.join(col + '\n' for col in columns))
+        fh.write(body if body is not None else
+                 ''.join('{} {}\n'.format(iblock, -iblock) for iblock in range(nblocks)))
+    return str(flname)
+
+
+@pytest.mark.parametrize('nblocks', [3, 1])
+@pytest.mark.parametrize('ending', ['out', 'csv'])
+def test_block_count_mismatch(tmp_path, nblocks, ending):
+    reader = RealizationReader()
+    if ending == 'csv':
+        def write(flname, count):
+            with open(flname, 'w') as fh:
+                fh.write('a,b\n' + ''.join('{},{}\n'.format(i, -i) for i in range(count)))
+            return str(flname)
+    else:
+        write = write_gslib
+    assert reader.read(write(tmp_path / ('first.' + ending), 2)).shape == (2, 2)
+    with pytest.raises(ValueError, match='has {} blocks but the first realization had 2'.format(
+            nblocks)):
+        reader.read(write(tmp_path / ('second.' + ending), nblocks))
+
+
+def test_header_mismatch(tmp_path):
+    reader = RealizationReader()
+    reader.read(write_gslib(tmp_path / 'first.out', 2))
+    with pytest.raises(ValueError, match='does not match the first realization'):
+        reader.read(write_gslib(tmp_path / 'second.out', 2, columns=('a', 'c')))
+
+
+@pytest.mark.parametrize('ending', ['out', 'out.gz'])
+def test_corrupt_value_raises(tmp_path, ending):
+    import gzip
+
+    body = '1 2\n3 oops\n5 6\n'
+    flname = str(tmp_path / ('real.' + ending))
+    with (gzip.open if ending.endswith('gz') else open)(flname, 'wt') as fh:
+        fh.write('realization\n2\na\nb\n' + body)
+    with pytest.raises(ValueError, match='could not be parsed'):
+        RealizationReader().read(flname)
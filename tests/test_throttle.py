@@ -0,0 +1,118 @@
+import time
+
+import pytest
+
+from pyacorn.scriptnotifier import DuplicateFilter, ScriptNotifier, TokenBucket
+
+from conftest import Recorder
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=20, burst=3)
+    assert [bucket.consume() for _ in range(4)] == [True, True, True, False]
+    # one token back every 1 / rate seconds
+    time.sleep(0.07)
+    assert bucket.consume()
+    assert not bucket.consume()
+    # never more than the burst, however long it has been idle
+    time.sleep(0.5)
+    assert [bucket.consume() for _ in range(4)] == [True, True, True, False]
+
+
+@pytest.mark.parametrize('rate, burst', [(0, 5), (-1, 5), (1, 0)])
+def test_token_bucket_limits(rate, burst):
+    with pytest.raises(ValueError, match='rate must be positive'):
+        TokenBucket(rate, burst)
+
+
+def test_duplicate_filter():
+    duplicates = DuplicateFilter(window=0.1)
+    assert not duplicates.is_duplicate('a')
+    assert duplicates.is_duplicate('a')
+    assert not duplicates.is_duplicate('b')
+    time.sleep(0.15)
+    assert not duplicates.is_duplicate('a')
+    assert duplicates.is_duplicate('a')
+
+
+def test_duplicate_filter_forgets_expired_messages():
+    duplicates = DuplicateFilter(window=0.05)
+    for key in range(DuplicateFilter._PRUNE_SIZE):
+        duplicates.is_duplicate(key)
+    time.sleep(0.1)
+    duplicates.is_duplicate('new')
+    assert list(duplicates._seen) == ['new']
+
+
+def test_rate_limit_drops_and_errors_bypass():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder], rate_limit=1, burst=2)
+    for imessage in range(4):
+        notifier.status_alert('message {}'.format(imessage))
+    notifier.status_alert('failed', 'ERROR')
+    notifier.close()
+    assert recorder.messages == [('Update', 'message 0', None), ('Update', 'message 1', None),
+                                 ('ERROR', 'failed', None)]
+    assert (notifier.dropped, notifier.coalesced) == (2, 0)
+
+
+def test_coalesce_repeated_messages():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder], coalesce=60)
+    for message in ['same', 'same', 'other', 'same']:
+        notifier.status_alert(message)
+    notifier.status_alert('same', 'ERROR')
+    notifier.close()
+    assert [message for _, message, _ in recorder.messages] == ['same', 'other', 'same']
+    assert (notifier.dropped, notifier.coalesced) == (0, 2)
+
+
+def test_digest_size():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder], digest_size=4)
+    for message in ['first', 'again', 'again', 'last']:
+        assert recorder.messages == []
+        notifier.status_alert(message)
+    notifier.close()
+    assert len(recorder.messages) == 1
+    status, message, _ = recorder.messages[0]
+    assert status == 'DIGEST of 4 updates'
+    # repeats in a row are one line
+    assert [line.split(' ', 1)[1] for line in message.splitlines()] == \
+        ['Update: first', 'Update: again (x2)', 'Update: last']
+    assert notifier.coalesced == 1
+
+
+def test_digest_errors_sent_right_away():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder], digest=60)
+    notifier.status_alert('collected')
+    notifier.status_alert('failed', 'ERROR')
+    assert recorder.messages == [('ERROR', 'failed', None)]
+    notifier.send_digest()
+    assert recorder.messages[1][0] == 'DIGEST of 1 updates'
+    assert recorder.messages[1][1].endswith('Update: collected')
+    notifier.close()
+
+
+def test_digest_interval():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder], digest=0.1)
+    notifier.status_alert('one')
+    notifier.status_alert('two')
+    end = time.monotonic() + 5
+    while not recorder.messages and time.monotonic() < end:
+        time.sleep(0.01)
+    notifier.close()
+    assert [status for status, _, _ in recorder.messages] == ['DIGEST of 2 updates']
+
+
+def test_digests_are_not_rate_limited():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[recorder], digest_size=1,
+                              rate_limit=1, burst=1)
+    for imessage in range(3):
+        notifier.status_alert('message {}'.format(imessage))
+    notifier.close()
+    assert len(recorder.messages) == 3
+    assert notifier.dropped == 0
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from pyacorn.scriptnotifier import ScriptNotifier, Transport
+
+from conftest import ROOT, Recorder
+
+
+class Sleeper(Transport):
+    name = 'sleeper'
+
+    def send(self, message, status, details=None):
+        time.sleep(30)
+
+
+def test_slow_channel_does_not_delay_others():
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[Sleeper(), recorder],
+                              channel_timeout=0.2)
+    start = time.monotonic()
+    notifier.status_alert('hello')
+    assert time.monotonic() - start < 1
+    assert recorder.messages == [('Update', 'hello', None)]
+    start = time.monotonic()
+    notifier.close()
+    assert time.monotonic() - start < 1
+
+
+class Gate(Transport):
+    '''Hangs until it is opened'''
+    name = 'gate'
+
+    def __init__(self):
+        super(Gate, self).__init__()
+        self.opened = threading.Event()
+        self.messages = []
+
+    def send(self, message, status, details=None):
+        self.opened.wait()
+        self.messages.append(message)
+
+
+def test_hung_channel_skips_later_alerts(capsys):
+    gate = Gate()
+    recorder = Recorder()
+    notifier = ScriptNotifier(print_error=False, transports=[gate, recorder],
+                              channel_timeout=0.3)
+    start = time.monotonic()
+    notifier.status_alert('first')
+    assert 0.25 < time.monotonic() - start < 1
+    for ialert in range(4):
+        # the gate is still busy with the first alert, so these do not wait on it
+        start = time.monotonic()
+        notifier.status_alert('alert {}'.format(ialert))
+        assert time.monotonic() - start < 0.1
+    assert [message for _, message, _ in recorder.messages] == \
+        ['first'] + ['alert {}'.format(ialert) for ialert in range(4)]
+    assert notifier._lanes['gate']._queue.qsize() == 0
+    assert capsys.readouterr().out.count('Skipped sending gate') == 4
+    # once the hung send finishes the channel takes messages again
+    gate.opened.set()
+    time.sleep(0.05)
+    notifier.status_alert('last')
+    notifier.close()
+    assert gate.messages == ['first', 'last']
+
+
+def test_unique_transport_names():
+    with pytest.raises(ValueError):
+        ScriptNotifier(print_error=False, transports=[Recorder(), Recorder()])
+
+
+def _run_script(body):
+    script = textwrap.dedent('''
+        import sys, time
+        sys.path.insert(0, {tests!r})
+        import conftest
+        from pyacorn.scriptnotifier import ScriptNotifier, Transport
+
+        class Sleeper(Transport):
+            name = 'sleeper'
+            def send(self, message, status, details=None):
+                time.sleep(30)
+
+        notifier = ScriptNotifier(print_error=False, transports=[Sleeper()], channel_timeout=0.5)
+        notifier.status_alert('hello')
+    ''').format(tests=os.path.join(ROOT, 'tests')) + textwrap.dedent(body)
+    start = time.monotonic()
+    subprocess.run([sys.executable, '-c', script], stdout=subprocess.PIPE,
+                   stderr=subprocess.PIPE, timeout=60)
+    return time.monotonic() - start
+
+
+def test_hung_channel_does_not_block_exit():
+    assert _run_script('') < 10
+    assert _run_script('notifier.close()') < 10
+    assert _run_script('notifier.crash_report("boom")') < 10